@@ -0,0 +1,215 @@
+"""
+Streaming caption parsing for local transcripts (WebVTT, SRT, downloaded HTML).
+
+All transcript consumers (search, snippets, source notes) read cues through this
+module so tag stripping, timecode parsing and `time_offset_seconds` handling
+happen one way. Files are read line by line from the handle; nothing holds the
+whole transcript in memory.
+"""
+
+from __future__ import annotations
+
+import html
+import re
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional, TextIO
+
+
+TIMED_SUFFIXES = {".vtt", ".srt"}
+CAPTION_SUFFIXES = TIMED_SUFFIXES | {".html"}
+HTML_CHUNK_CHARS = 240
+
+# HH:MM:SS(.|,)mmm, or the WebVTT short form MM:SS.mmm.
+_CUE_TIME = r"(?:(\d+):)?(\d{1,2}):(\d{2})(?:[.,](\d{1,3}))?"
+_CUE_TIME_RX = re.compile(rf"^{_CUE_TIME}$")
+# Timing line; VTT cue settings may follow the end time ("00:00:01.000 --> 00:00:02.000 align:start").
+_TIMING_RX = re.compile(rf"^{_CUE_TIME}\s*-->\s*(?:{_CUE_TIME}(?!\S))?")
+_TAG_RX = re.compile(r"<[^>]+>")
+_WS_RX = re.compile(r"\s+")
+
+
+class Cue(NamedTuple):
+    start: float  # seconds (0.0 for untimed HTML chunks)
+    end: float
+    text: str
+
+
+def _seconds(h: Optional[str], mm: str, ss: str, ms: Optional[str]) -> float:
+    out = int(h or 0) * 3600 + int(mm) * 60 + int(ss)
+    if ms:
+        return out + int(ms.ljust(3, "0")) / 1000.0
+    return float(out)
+
+
+def parse_cue_time(raw: str) -> Optional[float]:
+    m = _CUE_TIME_RX.match((raw or "").strip())
+    if not m:
+        return None
+    return _seconds(*m.groups())
+
+
+def parse_offset_seconds(v: str) -> float:
+    try:
+        return float((v or "").strip() or "0")
+    except Exception:
+        return 0.0
+
+
+def clean_cue_text(lines: Iterable[str]) -> str:
+    # yt-dlp WebVTT often contains inline timestamps and <c> spans; strip tags.
+    text = " ".join(lines)
+    if "<" in text:
+        text = _TAG_RX.sub("", text)
+    if "&" in text:
+        text = html.unescape(text)
+    return " ".join(text.split())
+
+
+def _timing(line: str) -> Optional[tuple[float, float]]:
+    if "-->" not in line:
+        return None
+    m = _TIMING_RX.match(line)
+    if not m:
+        return None
+    g = m.groups()
+    start = _seconds(*g[:4])
+    return start, (_seconds(*g[4:]) if g[5] is not None else start)
+
+
+def iter_timed_cues(f: TextIO) -> Iterator[Cue]:
+    """
+    Parse WebVTT or SRT cues from a text handle.
+
+    A timing line (`start --> end`) opens a cue; its text runs until a blank line or
+    the next timing line. Headers, NOTE blocks and SRT/VTT cue numbers/ids are skipped
+    because they are never preceded by a timing line. Empty cues are dropped.
+    """
+    cur: Optional[tuple[float, float]] = None
+    text_lines: List[str] = []
+
+    for raw in f:
+        line = raw.strip()
+        timing = _timing(line)
+        if timing is not None:
+            if cur is not None:
+                text = clean_cue_text(text_lines)
+                if text:
+                    yield Cue(cur[0], cur[1], text)
+            cur = timing
+            text_lines = []
+            continue
+        if cur is None:
+            continue
+        if not line:
+            text = clean_cue_text(text_lines)
+            if text:
+                yield Cue(cur[0], cur[1], text)
+            cur = None
+            text_lines = []
+            continue
+        text_lines.append(line)
+
+    if cur is not None:
+        text = clean_cue_text(text_lines)
+        if text:
+            yield Cue(cur[0], cur[1], text)
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.pieces: List[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag: str, attrs: object) -> None:
+        if tag in {"script", "style"}:
+            self._skip += 1
+        # Tags separate words, as if replaced by a space.
+        self.pieces.append(" ")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in {"script", "style"} and self._skip:
+            self._skip -= 1
+        self.pieces.append(" ")
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip:
+            self.pieces.append(data)
+
+
+def iter_html_cues(f: TextIO, *, chunk_chars: Optional[int] = HTML_CHUNK_CHARS) -> Iterator[Cue]:
+    """
+    Visible text of an HTML page (scripts/styles dropped, whitespace collapsed) as untimed cues.
+
+    With `chunk_chars`, text is emitted in chunks of at most that many characters;
+    with None, the whole page is a single cue.
+    """
+    parser = _TextExtractor()
+    buf = ""  # normalized text not yet emitted
+    at_space = True  # collapse whitespace across feed() boundaries and trim the leading run
+    whole: List[str] = []
+
+    def take() -> str:
+        nonlocal at_space
+        text = _WS_RX.sub(" ", "".join(parser.pieces))
+        parser.pieces.clear()
+        if at_space:
+            text = text.lstrip(" ")
+        if text:
+            at_space = text.endswith(" ")
+        return text
+
+    for line in f:
+        parser.feed(line)
+        text = take()
+        if not chunk_chars:
+            whole.append(text)
+            continue
+        buf += text
+        while len(buf) >= chunk_chars:
+            piece, buf = buf[:chunk_chars], buf[chunk_chars:]
+            if piece.strip():
+                yield Cue(0.0, 0.0, piece.strip())
+    parser.close()
+    tail = take()
+    if not chunk_chars:
+        text = ("".join(whole) + tail).strip()
+        if text:
+            yield Cue(0.0, 0.0, text)
+        return
+    buf = (buf + tail).rstrip()
+    while buf:
+        piece, buf = buf[:chunk_chars], buf[chunk_chars:]
+        if piece.strip():
+            yield Cue(0.0, 0.0, piece.strip())
+
+
+def iter_cues(
+    path: Path,
+    *,
+    offset_s: float = 0.0,
+    html_chunk_chars: Optional[int] = HTML_CHUNK_CHARS,
+) -> Iterator[Cue]:
+    """
+    Cues of a transcript file, dispatched on suffix (.vtt/.srt/.html; anything else yields nothing).
+
+    `offset_s` (from `time_offset_seconds` in transcripts/_index.csv) is added to timed
+    cues and clamped at 0; untimed HTML cues are left at 0.0.
+    """
+    suf = path.suffix.lower()
+    if suf not in CAPTION_SUFFIXES:
+        return
+    with path.open("r", encoding="utf-8", errors="replace") as f:
+        if suf == ".html":
+            yield from iter_html_cues(f, chunk_chars=html_chunk_chars)
+            return
+        if not offset_s:
+            yield from iter_timed_cues(f)
+            return
+        for cue in iter_timed_cues(f):
+            yield Cue(max(0.0, cue.start + offset_s), max(0.0, cue.end + offset_s), cue.text)
+
+
+def is_timed(path: Path) -> bool:
+    return path.suffix.lower() in TIMED_SUFFIXES
@@ -0,0 +1,62 @@
+"""
+Fingerprint of a build script's code: the script plus every `_core` module it imports,
+directly or through other `_core` modules.
+
+Incremental builders key their caches on this, so a fix in a shared helper (a parser,
+the cue store, ...) invalidates their outputs just like an edit to the script itself.
+Imports are read statically (ast), so the result does not depend on what else the
+current process happens to have imported.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+from pathlib import Path
+from typing import List, Set
+
+
+CORE_DIR = Path(__file__).resolve().parent
+
+
+def core_imports(path: Path) -> List[Path]:
+    """
+    `_core` module files imported anywhere in `path` (one level, sorted).
+    """
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    names: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(a.name for a in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            names.add(node.module)
+            names.update(f"{node.module}.{a.name}" for a in node.names)
+    out: Set[Path] = set()
+    for name in names:
+        parts = name.split(".")
+        if parts[0] != "_core" or len(parts) != 2:
+            continue
+        p = CORE_DIR / f"{parts[1]}.py"
+        if p.is_file():
+            out.add(p)
+    return sorted(out)
+
+
+def code_fingerprint(script: Path) -> str:
+    """
+    sha256 over `script` and its transitive `_core` imports (by module name and content).
+    """
+    seen: Set[Path] = set()
+    todo = [Path(script).resolve()]
+    while todo:
+        p = todo.pop()
+        if p in seen:
+            continue
+        seen.add(p)
+        todo.extend(core_imports(p))
+    h = hashlib.sha256()
+    for p in sorted(seen):
+        name = p.name if p.parent == CORE_DIR else "<script>"
+        h.update(f"{name}\0".encode("utf-8"))
+        h.update(hashlib.sha256(p.read_bytes()).digest())
+    return h.hexdigest()
@@ -0,0 +1,95 @@
+"""
+Process-wide cache of repo inputs (sources table, chapter texts, parsed forms).
+
+When several build steps run in one interpreter (see scripts/build_all.py) they
+share these entries instead of re-reading and re-parsing the same files. Every
+entry is keyed by the file's (mtime_ns, size), so a step that rewrites a file
+(e.g. add_bach_anchors on chapters) transparently invalidates it for later steps.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from _core.sources import load_sources_csv
+
+
+Signature = Tuple[int, int]
+
+_LOCK = threading.RLock()
+_TEXT: Dict[Path, Tuple[Signature, str]] = {}
+_SOURCES: Dict[Path, Tuple[Signature, Dict[str, Dict[str, str]]]] = {}
+_PARSED: Dict[Tuple[Path, str], Tuple[Signature, Any]] = {}
+
+
+def file_signature(path: Path) -> Optional[Signature]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def read_text(path: Path) -> str:
+    """
+    Read a UTF-8 text file (errors replaced), reusing the cached copy while it is unchanged on disk.
+    """
+    key = path.resolve()
+    sig = file_signature(key)
+    with _LOCK:
+        hit = _TEXT.get(key)
+        if hit and sig is not None and hit[0] == sig:
+            return hit[1]
+    text = key.read_text(encoding="utf-8", errors="replace")
+    if sig is not None:
+        with _LOCK:
+            _TEXT[key] = (sig, text)
+    return text
+
+
+def load_sources(path: Path) -> Dict[str, Dict[str, str]]:
+    """
+    Cached `load_sources_csv`. Callers must treat the returned table as read-only.
+    """
+    key = path.resolve()
+    sig = file_signature(key)
+    with _LOCK:
+        hit = _SOURCES.get(key)
+        if hit and sig is not None and hit[0] == sig:
+            return hit[1]
+    table = load_sources_csv(key)
+    if sig is not None:
+        with _LOCK:
+            _SOURCES[key] = (sig, table)
+    return table
+
+
+def parsed(path: Path, parser: Callable[[str], Any], *, name: str = "") -> Any:
+    """
+    Return `parser(read_text(path))`, cached per (path, parser name) while the file is unchanged.
+    """
+    key = path.resolve()
+    pkey = (key, name or f"{parser.__module__}.{parser.__qualname__}")
+    sig = file_signature(key)
+    with _LOCK:
+        hit = _PARSED.get(pkey)
+        if hit and sig is not None and hit[0] == sig:
+            return hit[1]
+    value = parser(read_text(key))
+    if sig is not None:
+        with _LOCK:
+            _PARSED[pkey] = (sig, value)
+    return value
+
+
+def chapter_paths(chapters_dir: Path) -> List[Path]:
+    return sorted(chapters_dir.glob("ch*.md"))
+
+
+def clear() -> None:
+    with _LOCK:
+        _TEXT.clear()
+        _SOURCES.clear()
+        _PARSED.clear()
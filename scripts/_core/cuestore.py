@@ -0,0 +1,178 @@
+"""
+Persistent, memory-mapped cue store for local transcripts (transcripts/_cues/).
+
+Each source gets one binary file holding its parsed cues:
+
+  header  magic, version, cue count, transcript mtime_ns + size, HTML chunking, blob size
+  starts  float64[count]  cue start seconds (no time_offset_seconds applied)
+  ends    float64[count]
+  offsets uint64[count+1] byte offsets of each cue's text in the blob
+  blob    UTF-8 cue texts, concatenated
+
+Files are written in native byte order (recorded in the header) and rebuilt
+from the transcript via `_core.captions` whenever its mtime or size changes,
+so repeated corpus queries cost one mmap per source instead of a text parse.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from _core.captions import HTML_CHUNK_CHARS, Cue, is_timed, iter_cues
+
+
+MAGIC = b"CUES"
+VERSION = 1
+_HEADER = struct.Struct("=4sBBxxIqqiQ")  # magic, version, byteorder, count, mtime_ns, size, html_chunk, blob_len
+_BYTEORDER = 1 if sys.byteorder == "little" else 2
+
+
+class CueTable:
+    """
+    Read-only view over a source's cues: array-backed start/end times plus a text blob.
+
+    Times are raw transcript times; `offset_s` (time_offset_seconds) is applied by
+    `cues()` and `start_at()` so a changed offset never forces a rebuild.
+    """
+
+    def __init__(self, buf: memoryview, *, offset_s: float = 0.0, closer: Optional[mmap.mmap] = None) -> None:
+        _magic, _ver, _bo, count, _mt, _sz, _chunk, blob_len = _HEADER.unpack_from(buf, 0)
+        pos = _HEADER.size
+        self.starts = buf[pos : pos + 8 * count].cast("d")
+        pos += 8 * count
+        self.ends = buf[pos : pos + 8 * count].cast("d")
+        pos += 8 * count
+        self.offsets = buf[pos : pos + 8 * (count + 1)].cast("Q")
+        pos += 8 * (count + 1)
+        self.blob = buf[pos : pos + blob_len]
+        self.offset_s = offset_s
+        self._count = count
+        self._mm = closer
+
+    def __len__(self) -> int:
+        return self._count
+
+    def text(self, i: int) -> str:
+        return str(self.blob[self.offsets[i] : self.offsets[i + 1]], "utf-8")
+
+    def start_at(self, i: int) -> float:
+        return max(0.0, self.starts[i] + self.offset_s) if self.offset_s else self.starts[i]
+
+    def cues(self) -> Iterator[Cue]:
+        off = self.offset_s
+        starts, ends, offsets, blob = self.starts, self.ends, self.offsets, self.blob
+        for i in range(self._count):
+            text = str(blob[offsets[i] : offsets[i + 1]], "utf-8")
+            if off:
+                yield Cue(max(0.0, starts[i] + off), max(0.0, ends[i] + off), text)
+            else:
+                yield Cue(starts[i], ends[i], text)
+
+    def __iter__(self) -> Iterator[Cue]:
+        return self.cues()
+
+    def close(self) -> None:
+        # Release exported views before closing the map.
+        for view in (self.starts, self.ends, self.offsets, self.blob):
+            view.release()
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def __enter__(self) -> "CueTable":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def encode_cues(cues: List[Cue], *, mtime_ns: int, size: int, html_chunk_chars: Optional[int]) -> bytes:
+    starts = array("d", [c.start for c in cues])
+    ends = array("d", [c.end for c in cues])
+    offsets = array("Q", [0])
+    parts: List[bytes] = []
+    total = 0
+    for c in cues:
+        b = c.text.encode("utf-8")
+        parts.append(b)
+        total += len(b)
+        offsets.append(total)
+    header = _HEADER.pack(MAGIC, VERSION, _BYTEORDER, len(cues), mtime_ns, size, int(html_chunk_chars or 0), total)
+    return b"".join([header, starts.tobytes(), ends.tobytes(), offsets.tobytes(), *parts])
+
+
+def cue_store_path(cache_dir: Path, source_id: str, *, html_chunk_chars: Optional[int] = HTML_CHUNK_CHARS) -> Path:
+    if html_chunk_chars == HTML_CHUNK_CHARS:
+        return cache_dir / f"{source_id}.cues"
+    return cache_dir / f"{source_id}.c{int(html_chunk_chars or 0)}.cues"
+
+
+def _is_current(path: Path, st: os.stat_result, html_chunk_chars: Optional[int]) -> bool:
+    try:
+        with path.open("rb") as f:
+            head = f.read(_HEADER.size)
+    except OSError:
+        return False
+    if len(head) != _HEADER.size:
+        return False
+    magic, ver, bo, _count, mtime_ns, size, chunk, _blob = _HEADER.unpack(head)
+    return (
+        magic == MAGIC
+        and ver == VERSION
+        and bo == _BYTEORDER
+        and mtime_ns == st.st_mtime_ns
+        and size == st.st_size
+        and chunk == int(html_chunk_chars or 0)
+    )
+
+
+def build_cue_store(
+    transcript: Path,
+    store: Path,
+    *,
+    html_chunk_chars: Optional[int] = HTML_CHUNK_CHARS,
+) -> bytes:
+    st = transcript.stat()
+    cues = list(iter_cues(transcript, html_chunk_chars=html_chunk_chars))
+    data = encode_cues(cues, mtime_ns=st.st_mtime_ns, size=st.st_size, html_chunk_chars=html_chunk_chars)
+    try:
+        store.parent.mkdir(parents=True, exist_ok=True)
+        tmp = store.with_name(f".{store.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, store)
+    except OSError:
+        # Read-only checkout or similar: callers still get the parsed table in memory.
+        pass
+    return data
+
+
+def open_cues(
+    source_id: str,
+    transcript: Path,
+    *,
+    cache_dir: Path,
+    offset_s: float = 0.0,
+    html_chunk_chars: Optional[int] = HTML_CHUNK_CHARS,
+) -> CueTable:
+    """
+    Open the cached cue table for `transcript`, (re)building it if the transcript changed.
+
+    As with `iter_cues`, `offset_s` only shifts timed (VTT/SRT) cues.
+    """
+    if not is_timed(transcript):
+        offset_s = 0.0
+    store = cue_store_path(cache_dir, source_id, html_chunk_chars=html_chunk_chars)
+    st = transcript.stat()
+    if not _is_current(store, st, html_chunk_chars):
+        data = build_cue_store(transcript, store, html_chunk_chars=html_chunk_chars)
+        if not _is_current(store, st, html_chunk_chars):
+            return CueTable(memoryview(data), offset_s=offset_s)
+    with store.open("rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return CueTable(memoryview(mm), offset_s=offset_s, closer=mm)
@@ -0,0 +1,42 @@
+"""
+The faster_whisper release the streaming audio path was written against.
+
+`_core/pcm.py` (`iter_pcm` decoding) calls faster_whisper.audio's private frame helpers,
+and `_core/vad.py` (`SpeechStream`) re-implements SileroVADModel's batching, LSTM state
+and context handling plus get_speech_timestamps' hysteresis. Neither is public API, so
+another release may break them or, worse, make `--stream` quietly disagree with the
+in-memory path. Both call `require_supported()` first and refuse to run on any other
+version. To move to a new release, re-check both modules against its sources, run
+tests/test_vad.py and tests/test_pcm.py, then update SUPPORTED_VERSION and the
+faster-whisper pin in pyproject.toml together.
+"""
+
+from __future__ import annotations
+
+
+SUPPORTED_VERSION = "1.2.1"
+AUDIO_HELPERS = ("_ignore_invalid_frames", "_group_frames", "_resample_frames")
+
+
+def installed_version() -> str:
+    from faster_whisper.version import __version__  # type: ignore
+
+    return str(__version__)
+
+
+def require_supported() -> None:
+    """
+    Raise RuntimeError unless the installed faster_whisper is SUPPORTED_VERSION.
+    """
+    found = installed_version()
+    if found != SUPPORTED_VERSION:
+        raise RuntimeError(
+            f"streaming decode/VAD mirrors faster_whisper {SUPPORTED_VERSION} internals, but {found} is installed; "
+            f"install faster-whisper=={SUPPORTED_VERSION} or run without --stream "
+            "(see scripts/_core/fwcompat.py to support a new release)"
+        )
+    from faster_whisper import audio as fw_audio  # type: ignore
+
+    missing = [name for name in AUDIO_HELPERS if not hasattr(fw_audio, name)]
+    if missing:
+        raise RuntimeError(f"faster_whisper.audio lacks {', '.join(missing)}; the streaming decoder cannot run")
@@ -0,0 +1,155 @@
+"""
+Per-host concurrency and rate limits for asyncio fetchers.
+
+Every request to a host goes through `HostScheduler.slot(host)`, which bounds in-flight
+requests (a semaphore) and their start rate (a token bucket). Hosts that answer 429 are
+slowed down multiplicatively via `throttle()` and recover additively via `relax()`, so a
+long corpus pull settles at whatever rate the host tolerates.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncContextManager, AsyncIterator, Dict, List, Optional
+from urllib.parse import urlparse
+
+
+@dataclass(frozen=True)
+class HostPolicy:
+    concurrency: int  # max in-flight requests
+    rate: float  # requests started per second
+    burst: float = 1.0
+    min_rate_fraction: float = 0.05  # floor for throttling, relative to `rate`
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float = 1.0) -> None:
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    async def acquire(self) -> None:
+        # Only ever touched from the event loop thread, so no lock is needed.
+        while True:
+            now = time.monotonic()
+            if now < self.paused_until:
+                await asyncio.sleep(self.paused_until - now)
+                continue
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return
+            await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+
+class HostLimiter:
+    def __init__(self, policy: HostPolicy) -> None:
+        self.policy = policy
+        self.bucket = TokenBucket(policy.rate, policy.burst)
+        self._sem = asyncio.Semaphore(max(1, policy.concurrency))
+        self.requests = 0
+        self.throttled = 0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._sem:
+            await self.bucket.acquire()
+            self.requests += 1
+            yield
+
+    def throttle(self, pause_s: float) -> None:
+        """
+        The host pushed back (HTTP 429): halve the rate and pause new requests for `pause_s`.
+        """
+        floor = self.policy.rate * self.policy.min_rate_fraction
+        self.bucket.rate = max(floor, self.bucket.rate / 2.0)
+        self.bucket.paused_until = max(self.bucket.paused_until, time.monotonic() + pause_s)
+        self.throttled += 1
+
+    def relax(self) -> None:
+        self.bucket.rate = min(self.policy.rate, self.bucket.rate + 0.1 * self.policy.rate)
+
+
+def host_of(url_or_host: str) -> str:
+    host = urlparse(url_or_host).hostname if "://" in url_or_host else url_or_host
+    host = (host or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class HostScheduler:
+    """
+    Limiters keyed by host. A host matching a policy key (exactly or as a subdomain, e.g.
+    cdn.media.ccc.de -> media.ccc.de) shares that key's limiter; every other host gets its
+    own limiter with the default policy.
+    """
+
+    def __init__(self, policies: Dict[str, HostPolicy], default: HostPolicy) -> None:
+        self.policies = policies
+        self.default = default
+        self.limiters: Dict[str, HostLimiter] = {}
+
+    def key(self, url_or_host: str) -> str:
+        host = host_of(url_or_host)
+        for k in self.policies:
+            if host == k or host.endswith("." + k):
+                return k
+        return host
+
+    def limiter(self, url_or_host: str) -> HostLimiter:
+        k = self.key(url_or_host)
+        lim = self.limiters.get(k)
+        if lim is None:
+            lim = self.limiters[k] = HostLimiter(self.policies.get(k, self.default))
+        return lim
+
+    def slot(self, url_or_host: str) -> AsyncContextManager[None]:
+        return self.limiter(url_or_host).slot()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            k: {"requests": lim.requests, "throttled": lim.throttled, "rate": round(lim.bucket.rate, 3)}
+            for k, lim in sorted(self.limiters.items())
+        }
+
+
+async def run_subprocess(
+    cmd: List[str],
+    timeout_s: float,
+    *,
+    pool: Optional[asyncio.Semaphore] = None,
+) -> subprocess.CompletedProcess[str]:
+    """
+    Run `cmd` without blocking the loop, at most `pool`-many at a time.
+    Like a timed-out `subprocess.run`, a timeout kills the process and reports returncode 124.
+    """
+
+    async def go() -> subprocess.CompletedProcess[str]:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            out, err = await asyncio.wait_for(proc.communicate(), timeout_s)
+            rc = proc.returncode or 0
+        except asyncio.TimeoutError:
+            proc.kill()
+            out, err = await proc.communicate()
+            text = (err or b"").decode("utf-8", errors="replace")
+            msg = f"timeout after {int(timeout_s)}s" + ("\n" + text if text else "")
+            return subprocess.CompletedProcess(cmd, 124, (out or b"").decode("utf-8", errors="replace"), msg)
+        return subprocess.CompletedProcess(
+            cmd, rc, out.decode("utf-8", errors="replace"), err.decode("utf-8", errors="replace")
+        )
+
+    if pool is None:
+        return await go()
+    async with pool:
+        return await go()
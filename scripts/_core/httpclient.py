@@ -0,0 +1,240 @@
+"""
+Small HTTP GET client shared by the importers and fetch_transcripts.
+
+- Keeps one keep-alive connection per (thread, scheme, host, port) instead of a new
+  TCP/TLS handshake per request.
+- Caches 200 responses that carry an ETag or Last-Modified on disk, keyed by URL, and
+  revalidates them with If-None-Match / If-Modified-Since; a 304 is served from the cache.
+- Sends Accept-Encoding and transparently decodes gzip/deflate (and brotli when the
+  optional `brotli` module is installed).
+
+Errors are raised as `urllib.error.HTTPError` / `OSError`, the same as `urlopen`, so
+callers' error handling does not change. When a proxy is configured in the environment,
+requests go through `urlopen` (which honors it) and only caching/decoding apply.
+"""
+
+from __future__ import annotations
+
+import email.message
+import hashlib
+import http.client
+import json
+import os
+import ssl
+import threading
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.error import HTTPError
+from urllib.parse import urljoin, urlsplit
+from urllib.request import Request, getproxies, urlopen
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # optional
+    brotli = None
+
+
+ROOT = Path(__file__).resolve().parents[2]
+HTTP_CACHE_DIR = Path(os.environ.get("THE_MIND_HTTP_CACHE") or (ROOT / ".cache" / "http"))
+ACCEPT_ENCODING = "gzip, deflate" + (", br" if brotli is not None else "")
+REDIRECT_CODES = {301, 302, 303, 307, 308}
+MAX_REDIRECTS = 5
+_CACHED_HEADERS = ("content-type", "etag", "last-modified")
+
+
+@dataclass
+class HttpResponse:
+    url: str  # final URL after redirects
+    status: int
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)  # lower-cased names
+    from_cache: bool = False  # True when the server answered 304
+
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+
+def decode_body(body: bytes, encoding: str) -> bytes:
+    enc = (encoding or "").strip().lower()
+    if not enc or enc == "identity":
+        return body
+    if enc in {"gzip", "x-gzip"}:
+        return zlib.decompress(body, 16 + zlib.MAX_WBITS)
+    if enc == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            # Some servers send raw deflate without the zlib header.
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    if enc == "br" and brotli is not None:
+        return brotli.decompress(body)
+    raise OSError(f"unsupported Content-Encoding: {encoding}")
+
+
+class ResponseCache:
+    """
+    On-disk cache: <dir>/<sha[:2]>/<sha>.json (validators, headers) + <sha>.body (decoded body).
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.dir = cache_dir
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        h = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = self.dir / h[:2] / h
+        return base.with_suffix(".json"), base.with_suffix(".body")
+
+    def get(self, url: str) -> Optional[Tuple[Dict[str, str], bytes]]:
+        meta_p, body_p = self._paths(url)
+        try:
+            meta = json.loads(meta_p.read_text(encoding="utf-8"))
+            body = body_p.read_bytes()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url or not isinstance(meta.get("headers"), dict):
+            return None
+        return meta["headers"], body
+
+    def put(self, url: str, headers: Dict[str, str], body: bytes) -> None:
+        meta_p, body_p = self._paths(url)
+        kept = {k: v for k, v in headers.items() if k in _CACHED_HEADERS}
+        try:
+            meta_p.parent.mkdir(parents=True, exist_ok=True)
+            for p, data in ((body_p, body), (meta_p, json.dumps({"url": url, "headers": kept}).encode("utf-8"))):
+                tmp = p.with_name(f".{p.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp.write_bytes(data)
+                os.replace(tmp, p)
+        except OSError:
+            pass  # the cache is an optimization only
+
+
+def _header_dict(msg: email.message.Message) -> Dict[str, str]:
+    return {k.lower(): v for k, v in msg.items()}
+
+
+class HttpClient:
+    def __init__(
+        self,
+        *,
+        user_agent: str,
+        timeout_s: float = 60,
+        cache_dir: Optional[Path] = HTTP_CACHE_DIR,
+    ) -> None:
+        self.user_agent = user_agent
+        self.timeout_s = timeout_s
+        self.cache = ResponseCache(cache_dir) if cache_dir is not None else None
+        self._local = threading.local()
+        self._ssl = ssl.create_default_context()
+
+    def _conn(self, scheme: str, host: str, port: Optional[int]) -> http.client.HTTPConnection:
+        pool: Dict[Tuple[str, str, Optional[int]], http.client.HTTPConnection] = self._local.__dict__.setdefault("pool", {})
+        key = (scheme, host, port)
+        conn = pool.get(key)
+        if conn is None:
+            if scheme == "https":
+                conn = http.client.HTTPSConnection(host, port, timeout=self.timeout_s, context=self._ssl)
+            else:
+                conn = http.client.HTTPConnection(host, port, timeout=self.timeout_s)
+            pool[key] = conn
+        return conn
+
+    def _drop(self, scheme: str, host: str, port: Optional[int]) -> None:
+        pool = self._local.__dict__.get("pool") or {}
+        conn = pool.pop((scheme, host, port), None)
+        if conn is not None:
+            conn.close()
+
+    def _send(self, url: str, headers: Dict[str, str]) -> Tuple[int, str, Dict[str, str], bytes]:
+        """
+        One request/response: (status, reason, headers, raw body).
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in {"http", "https"}:
+            raise OSError(f"unsupported URL scheme: {url}")
+        if getproxies().get(scheme):
+            req = Request(url, headers=headers)
+            try:
+                with urlopen(req, timeout=self.timeout_s) as resp:
+                    return resp.status, resp.reason, _header_dict(resp.headers), resp.read()
+            except HTTPError as exc:
+                if exc.code == 304:
+                    return 304, "Not Modified", _header_dict(exc.headers), b""
+                raise
+
+        host, port = parts.hostname or "", parts.port
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        for attempt in (1, 2):
+            conn = self._conn(scheme, host, port)
+            try:
+                conn.request("GET", path, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError, http.client.CannotSendRequest):
+                # A kept-alive connection the server already closed: reconnect once.
+                self._drop(scheme, host, port)
+                if attempt == 2:
+                    raise
+                continue
+            except Exception:
+                self._drop(scheme, host, port)
+                raise
+            if resp.will_close:
+                self._drop(scheme, host, port)
+            return resp.status, resp.reason, _header_dict(resp.msg), body
+        raise OSError(f"request failed: {url}")  # unreachable
+
+    def get(self, url: str, *, headers: Optional[Dict[str, str]] = None) -> HttpResponse:
+        """
+        GET `url`, following redirects; raises HTTPError for 4xx/5xx like `urlopen`.
+        """
+        cur = url
+        for _ in range(MAX_REDIRECTS + 1):
+            cached = self.cache.get(cur) if self.cache is not None else None
+            hdrs = {"User-Agent": self.user_agent, "Accept-Encoding": ACCEPT_ENCODING}
+            if cached is not None:
+                if cached[0].get("etag"):
+                    hdrs["If-None-Match"] = cached[0]["etag"]
+                if cached[0].get("last-modified"):
+                    hdrs["If-Modified-Since"] = cached[0]["last-modified"]
+            hdrs.update(headers or {})
+
+            status, reason, resp_headers, raw = self._send(cur, hdrs)
+            if status == 304 and cached is not None:
+                return HttpResponse(cur, 200, cached[1], dict(cached[0]), from_cache=True)
+            if status in REDIRECT_CODES and resp_headers.get("location"):
+                cur = urljoin(cur, resp_headers["location"])
+                continue
+            if status >= 400:
+                msg = email.message.Message()
+                for k, v in resp_headers.items():
+                    msg[k] = v
+                raise HTTPError(cur, status, reason, msg, None)
+
+            body = decode_body(raw, resp_headers.get("content-encoding", ""))
+            if self.cache is not None and status == 200 and (resp_headers.get("etag") or resp_headers.get("last-modified")):
+                self.cache.put(cur, resp_headers, body)
+            return HttpResponse(cur, status, body, resp_headers)
+        raise OSError(f"too many redirects: {url}")
+
+    def get_text(self, url: str) -> str:
+        return self.get(url).text()
+
+
+_CLIENTS: Dict[str, HttpClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def client_for(user_agent: str) -> HttpClient:
+    """
+    Process-wide client per User-Agent (so connections and the cache are shared).
+    """
+    with _CLIENTS_LOCK:
+        c = _CLIENTS.get(user_agent)
+        if c is None:
+            c = _CLIENTS[user_agent] = HttpClient(user_agent=user_agent)
+        return c
@@ -0,0 +1,254 @@
+"""
+Speaker interval index over local diarization output (transcripts/_speakers/*.speakers.json).
+
+Each source's `bach_segments` and per-label `segments` become sorted, merged interval
+sets (parallel start/end arrays searched with bisect). A compiled copy is kept under
+.cache/speakers_idx/ (`<source_id>.<dir hash>.speakers.idx`, never in the speakers
+directory itself, which is a build input) and reused while the JSON's mtime/size are
+unchanged; within a process every source is loaded at most once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from _core.corpus import file_signature
+
+
+ROOT = Path(__file__).resolve().parents[2]
+COMPILED_DIR = ROOT / ".cache" / "speakers_idx"
+SPEAKERS_SUFFIX = ".speakers.json"
+COMPILED_SUFFIX = ".speakers.idx"
+MAGIC = b"SPKI"
+VERSION = 1
+_HEADER = struct.Struct("=4sBBBxqqdI")  # magic, version, byteorder, multi, mtime_ns, size, duration_s, groups
+_GROUP = struct.Struct("=HI")  # label length, interval count
+_BYTEORDER = 1 if sys.byteorder == "little" else 2
+_BACH = ""  # group name of bach_segments in the compiled file
+
+
+class IntervalSet:
+    """
+    Disjoint closed intervals [start, end], sorted by start. Overlapping input is merged.
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, starts: Sequence[float] = (), ends: Sequence[float] = ()) -> None:
+        self.starts = array("d", starts)
+        self.ends = array("d", ends)
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Tuple[float, float]]) -> "IntervalSet":
+        starts: List[float] = []
+        ends: List[float] = []
+        for s, e in sorted(p for p in pairs if p[1] >= p[0]):
+            if ends and s <= ends[-1]:
+                ends[-1] = max(ends[-1], e)
+            else:
+                starts.append(s)
+                ends.append(e)
+        return cls(starts, ends)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __bool__(self) -> bool:
+        return bool(self.starts)
+
+    def pairs(self) -> List[Tuple[float, float]]:
+        return list(zip(self.starts, self.ends))
+
+    def contains(self, t: float) -> bool:
+        i = bisect_right(self.starts, t) - 1
+        return i >= 0 and t <= self.ends[i]
+
+    def contains_many(self, times: Sequence[float]) -> List[bool]:
+        """
+        `contains` for each time; sorted input is answered in one merge pass.
+        """
+        if any(b < a for a, b in zip(times, times[1:])):
+            return [self.contains(t) for t in times]
+        out: List[bool] = []
+        starts, ends, n = self.starts, self.ends, len(self.starts)
+        i = 0
+        for t in times:
+            while i < n and ends[i] < t:
+                i += 1
+            out.append(i < n and starts[i] <= t)
+        return out
+
+    def overlaps(self, lo: float, hi: float) -> bool:
+        i = bisect_left(self.ends, lo)
+        return i < len(self.starts) and self.starts[i] <= hi
+
+    def overlap_seconds(self, lo: float, hi: float) -> float:
+        total = 0.0
+        i = bisect_left(self.ends, lo)
+        while i < len(self.starts) and self.starts[i] <= hi:
+            total += min(hi, self.ends[i]) - max(lo, self.starts[i])
+            i += 1
+        return total
+
+    def overlap_seconds_many(self, ranges: Sequence[Tuple[float, float]]) -> List[float]:
+        return [self.overlap_seconds(lo, hi) for lo, hi in ranges]
+
+    def total(self) -> float:
+        return sum(e - s for s, e in zip(self.starts, self.ends))
+
+
+@dataclass
+class SpeakerIntervals:
+    source_id: str
+    bach: IntervalSet
+    labels: Dict[str, IntervalSet] = field(default_factory=dict)
+    multi_speaker: bool = False
+    duration_s: Optional[float] = None  # end of the last diarized segment
+
+    def label(self, name: str) -> IntervalSet:
+        return self.labels.get(name) or IntervalSet()
+
+
+def _float(v: object) -> Optional[float]:
+    if isinstance(v, bool):
+        return None
+    try:
+        return float(v)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+
+
+def _segment_pairs(segs: object, label: Optional[str] = None) -> List[Tuple[float, float]]:
+    out: List[Tuple[float, float]] = []
+    for s in segs if isinstance(segs, list) else []:
+        if not isinstance(s, dict):
+            continue
+        if label is not None and (s.get("label") or "") != label:
+            continue
+        start, end = _float(s.get("start_s", 0.0)), _float(s.get("end_s", 0.0))
+        if start is not None and end is not None:
+            out.append((start, end))
+    return out
+
+
+def parse_speakers(source_id: str, data: dict) -> SpeakerIntervals:
+    segs = data.get("segments") or []
+    labels = sorted({str(s.get("label") or "") for s in segs if isinstance(s, dict)} - {""}) if isinstance(segs, list) else []
+    ends = [e for _s, e in _segment_pairs(segs)]
+    return SpeakerIntervals(
+        source_id,
+        IntervalSet.from_pairs(_segment_pairs(data.get("bach_segments") or [])),
+        {name: IntervalSet.from_pairs(_segment_pairs(segs, name)) for name in labels},
+        bool(data.get("multi_speaker_heuristic")),
+        max(ends) if ends and max(ends) > 0 else None,
+    )
+
+
+def encode_speakers(sp: SpeakerIntervals, *, mtime_ns: int, size: int) -> bytes:
+    groups = [(_BACH, sp.bach)] + sorted(sp.labels.items())
+    parts = [
+        _HEADER.pack(
+            MAGIC, VERSION, _BYTEORDER, int(sp.multi_speaker), mtime_ns, size,
+            sp.duration_s if sp.duration_s is not None else -1.0, len(groups),
+        )
+    ]
+    for name, iv in groups:
+        raw = name.encode("utf-8")
+        parts += [_GROUP.pack(len(raw), len(iv)), raw, iv.starts.tobytes(), iv.ends.tobytes()]
+    return b"".join(parts)
+
+
+def decode_speakers(source_id: str, buf: bytes, sig: Tuple[int, int]) -> Optional[SpeakerIntervals]:
+    if len(buf) < _HEADER.size:
+        return None
+    magic, ver, bo, multi, mtime_ns, size, duration, n_groups = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or ver != VERSION or bo != _BYTEORDER or (mtime_ns, size) != sig:
+        return None
+    pos = _HEADER.size
+    groups: Dict[str, IntervalSet] = {}
+    for _ in range(n_groups):
+        name_len, count = _GROUP.unpack_from(buf, pos)
+        pos += _GROUP.size
+        name = buf[pos : pos + name_len].decode("utf-8")
+        pos += name_len
+        iv = IntervalSet()
+        iv.starts.frombytes(buf[pos : pos + 8 * count])
+        pos += 8 * count
+        iv.ends.frombytes(buf[pos : pos + 8 * count])
+        pos += 8 * count
+        groups[name] = iv
+    bach = groups.pop(_BACH, IntervalSet())
+    return SpeakerIntervals(source_id, bach, groups, bool(multi), duration if duration >= 0 else None)
+
+
+_LOCK = threading.RLock()
+_LOADED: Dict[Path, Tuple[Tuple[int, int], Optional[SpeakerIntervals]]] = {}
+
+
+def compiled_path(source_id: str, speakers_dir: Path, compiled_dir: Optional[Path] = None) -> Path:
+    dir_hash = hashlib.sha1(str(speakers_dir.resolve()).encode("utf-8")).hexdigest()[:10]
+    return (compiled_dir or COMPILED_DIR) / f"{source_id}.{dir_hash}{COMPILED_SUFFIX}"
+
+
+def load_speakers(source_id: str, speakers_dir: Path, *, compiled_dir: Optional[Path] = None) -> Optional[SpeakerIntervals]:
+    """
+    Interval index for one source, or None if it has no (readable) speaker file.
+    """
+    path = speakers_dir / f"{source_id}{SPEAKERS_SUFFIX}"
+    sig = file_signature(path)
+    if sig is None:
+        return None
+    with _LOCK:
+        hit = _LOADED.get(path)
+        if hit and hit[0] == sig:
+            return hit[1]
+
+    compiled = compiled_path(source_id, speakers_dir, compiled_dir)
+    try:
+        sp = decode_speakers(source_id, compiled.read_bytes(), sig)
+    except (OSError, struct.error, UnicodeDecodeError):
+        sp = None
+    if sp is None:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8", errors="replace"))
+        except (OSError, ValueError):
+            data = None
+        if isinstance(data, dict):
+            sp = parse_speakers(source_id, data)
+            try:
+                compiled.parent.mkdir(parents=True, exist_ok=True)
+                tmp = compiled.with_name(f".{compiled.name}.{os.getpid()}.tmp")
+                tmp.write_bytes(encode_speakers(sp, mtime_ns=sig[0], size=sig[1]))
+                os.replace(tmp, compiled)
+            except OSError:
+                pass
+    with _LOCK:
+        _LOADED[path] = (sig, sp)
+    return sp
+
+
+def load_all_speakers(speakers_dir: Path) -> Dict[str, SpeakerIntervals]:
+    if not speakers_dir.is_dir():
+        return {}
+    out: Dict[str, SpeakerIntervals] = {}
+    for p in sorted(speakers_dir.glob(f"*{SPEAKERS_SUFFIX}")):
+        sid = p.name[: -len(SPEAKERS_SUFFIX)]
+        sp = load_speakers(sid, speakers_dir)
+        if sp is not None:
+            out[sid] = sp
+    return out
+
+
+def bach_intervals(source_id: str, speakers_dir: Path) -> IntervalSet:
+    sp = load_speakers(source_id, speakers_dir)
+    return sp.bach if sp is not None else IntervalSet()
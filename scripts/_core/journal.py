@@ -0,0 +1,95 @@
+"""
+Append-only, fsync'd journal for keyed CSV indexes (e.g. transcripts/_index.csv).
+
+Long-running tools record one JSON line per finished row instead of rewriting the whole
+index each time. The journal is compacted into the index every `compact_every` records
+and on close; on the next start, `replay()` applies anything that was journaled but never
+compacted (e.g. after a crash or Ctrl-C), so runs stay resumable.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, Optional, TextIO
+
+
+Index = Dict[str, Dict[str, str]]
+
+
+class IndexJournal:
+    def __init__(
+        self,
+        path: Path,
+        index: Index,
+        write_index: Callable[[Index], None],
+        *,
+        compact_every: int = 25,
+    ) -> None:
+        self.path = path
+        self.index = index
+        self._write_index = write_index
+        self.compact_every = max(1, compact_every)
+        self._pending = 0
+        self._f: Optional[TextIO] = None
+
+    def replay(self) -> int:
+        """
+        Apply journaled rows to the in-memory index; returns how many were applied.
+        A torn last line (crash mid-write) is ignored.
+        """
+        if not self.path.exists():
+            return 0
+        n = 0
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue
+                sid = row.get("source_id", "") if isinstance(row, dict) else ""
+                if sid:
+                    self.index[sid] = row
+                    n += 1
+        self._pending = n
+        return n
+
+    def record(self, row: Dict[str, str]) -> None:
+        sid = row["source_id"]
+        if self._f is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._f = self.path.open("a", encoding="utf-8")
+        self._f.write(json.dumps(row, ensure_ascii=False, sort_keys=True) + "\n")
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self.index[sid] = row
+        self._pending += 1
+        if self._pending >= self.compact_every:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Write the full index, then drop the journal. Replaying after a crash between the
+        two steps re-applies rows the index already has, which is harmless.
+        """
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+        if not self._pending and not self.path.exists():
+            return
+        self._write_index(self.index)
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        self._pending = 0
+
+    def close(self) -> None:
+        self.compact()
+
+    def __enter__(self) -> "IndexJournal":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -0,0 +1,160 @@
+"""
+k-means for diarization chunk features (n chunks x d features, small k).
+
+- Distances use ‖x‖² − 2x·c + ‖c‖² with float32 matmuls over row blocks, so peak memory
+  is O(block_rows × k) rather than an n × k × d temporary.
+- k-means++ seeding, `n_init` restarts; the run with the lowest inertia wins.
+- Above `minibatch_threshold` rows (short chunks on long files), centroids are fitted
+  with mini-batch updates and the labels come from one final full assignment.
+- Deterministic for a given seed; clusters are numbered by first appearance in `x`
+  (row order), so label names do not depend on which restart won.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+BLOCK_ROWS = 8192
+
+
+@dataclass
+class KMeansResult:
+    labels: np.ndarray  # (n,) int32
+    centroids: np.ndarray  # (k, d) float32
+    inertia: float
+    n_iter: int
+
+
+def assign(x: np.ndarray, x_sq: np.ndarray, centroids: np.ndarray, *, block_rows: int = BLOCK_ROWS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Nearest centroid and squared distance to it for every row of `x`.
+    """
+    n = x.shape[0]
+    labels = np.empty(n, dtype=np.int32)
+    d2min = np.empty(n, dtype=np.float32)
+    c_sq = np.einsum("ij,ij->i", centroids, centroids)
+    for b0 in range(0, n, block_rows):
+        b1 = min(n, b0 + block_rows)
+        d2 = x[b0:b1] @ centroids.T
+        d2 *= -2.0
+        d2 += x_sq[b0:b1, None]
+        d2 += c_sq[None, :]
+        labels[b0:b1] = d2.argmin(axis=1)
+        d2min[b0:b1] = np.maximum(d2[np.arange(b1 - b0), labels[b0:b1]], 0.0)
+    return labels, d2min
+
+
+def kmeans_plus_plus(x: np.ndarray, x_sq: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    n = x.shape[0]
+    centroids = np.empty((k, x.shape[1]), dtype=np.float32)
+    centroids[0] = x[rng.integers(0, n)]
+    _, d2 = assign(x, x_sq, centroids[:1])
+    for j in range(1, k):
+        p = d2.astype(np.float64)
+        total = float(p.sum())
+        idx = int(rng.choice(n, p=p / total)) if total > 0 else int(rng.integers(0, n))
+        centroids[j] = x[idx]
+        _, d2j = assign(x, x_sq, centroids[j : j + 1])
+        np.minimum(d2, d2j, out=d2)
+    return centroids
+
+
+def _update(x: np.ndarray, labels: np.ndarray, centroids: np.ndarray, d2: np.ndarray) -> None:
+    for j in range(centroids.shape[0]):
+        members = x[labels == j]
+        if len(members):
+            centroids[j] = members.mean(axis=0, dtype=np.float64)
+        else:
+            # Re-seed an empty cluster at the point currently worst served.
+            far = int(d2.argmax())
+            centroids[j] = x[far]
+            d2[far] = 0.0
+
+
+def _lloyd(x: np.ndarray, x_sq: np.ndarray, centroids: np.ndarray, iters: int) -> Tuple[np.ndarray, np.ndarray, int]:
+    labels, d2 = assign(x, x_sq, centroids)
+    for it in range(1, iters + 1):
+        _update(x, labels, centroids, d2)
+        new_labels, d2 = assign(x, x_sq, centroids)
+        if np.array_equal(new_labels, labels):
+            return labels, d2, it
+        labels = new_labels
+    return labels, d2, iters
+
+
+def _minibatch(
+    x: np.ndarray,
+    x_sq: np.ndarray,
+    centroids: np.ndarray,
+    rng: np.random.Generator,
+    *,
+    batch_size: int,
+    iters: int,
+    tol: float = 1e-4,
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    k = centroids.shape[0]
+    counts = np.zeros(k, dtype=np.float64)
+    scale = float(np.mean(x_sq)) or 1.0
+    it = 0
+    for it in range(1, iters + 1):
+        idx = rng.choice(x.shape[0], size=batch_size, replace=False)
+        xb = x[idx]
+        lb, _ = assign(xb, x_sq[idx], centroids)
+        before = centroids.copy()
+        for j in range(k):
+            members = xb[lb == j]
+            if len(members) == 0:
+                continue
+            counts[j] += len(members)
+            eta = len(members) / counts[j]
+            centroids[j] = (1.0 - eta) * centroids[j] + eta * members.mean(axis=0)
+        if float(((centroids - before) ** 2).sum()) <= tol * scale:
+            break
+    labels, d2 = assign(x, x_sq, centroids)
+    return labels, d2, it
+
+
+def _relabel(labels: np.ndarray, centroids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    _, first = np.unique(labels, return_index=True)
+    used = np.unique(labels)[np.argsort(first)]
+    order = np.concatenate([used, np.setdiff1d(np.arange(centroids.shape[0]), used)])
+    remap = np.empty_like(order)
+    remap[order] = np.arange(len(order))
+    return remap[labels].astype(np.int32), centroids[order]
+
+
+def kmeans(
+    x: np.ndarray,
+    k: int,
+    *,
+    seed: int = 0,
+    n_init: int = 4,
+    iters: int = 30,
+    minibatch_threshold: int = 20000,
+    batch_size: int = 2048,
+) -> KMeansResult:
+    n = x.shape[0]
+    if n == 0:
+        raise ValueError("empty dataset")
+    k = max(1, min(k, n))
+    x = np.ascontiguousarray(x, dtype=np.float32)
+    x_sq = np.einsum("ij,ij->i", x, x)
+
+    best: Optional[KMeansResult] = None
+    for run in range(max(1, n_init)):
+        run_rng = np.random.default_rng([seed, run])
+        centroids = kmeans_plus_plus(x, x_sq, k, run_rng)
+        if n > minibatch_threshold:
+            labels, d2, n_iter = _minibatch(x, x_sq, centroids, run_rng, batch_size=min(batch_size, n), iters=iters * 10)
+        else:
+            labels, d2, n_iter = _lloyd(x, x_sq, centroids, iters)
+        inertia = float(d2.sum(dtype=np.float64))
+        if best is None or inertia < best.inertia:
+            best = KMeansResult(labels, centroids, inertia, n_iter)
+    assert best is not None
+    best.labels, best.centroids = _relabel(best.labels, best.centroids)
+    return best
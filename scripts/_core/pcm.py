@@ -0,0 +1,219 @@
+"""
+Decode-once cache of media audio as 16 kHz mono float32 arrays (transcripts/_pcm/*.npy).
+
+ASR and diarization both need the decoded samples of the same (often hour-long) files;
+decoding with PyAV dominates their runtime. The first caller decodes and saves a `.npy`;
+every later caller gets a read-only memory map, so slicing a few minutes out of a long
+file only pages in those samples.
+
+Entries are named `<media stem>.<name hash>.<signature hash>.npy`: a changed media file
+(mtime/size) gets a new entry and the stale one for the same name is removed. The key
+holds the file name, not its directory, so a fresh download decoded by ASR in
+transcripts/_tmp_audio and then moved (same name, mtime and size) into
+transcripts/_media hits the same entry when diarization opens it there.
+
+`iter_pcm` yields the same samples in fixed-size windows with bounded memory: reading
+the cache entry piecewise, or decoding incrementally and writing the entry as it goes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from _core.corpus import file_signature
+
+
+ROOT = Path(__file__).resolve().parents[2]
+PCM_DIR = ROOT / "transcripts" / "_pcm"
+SR = 16000
+
+
+HASH_LEN = 10
+
+
+def _hash(s: str) -> str:
+    return hashlib.sha1(s.encode("utf-8")).hexdigest()[:HASH_LEN]
+
+
+def _entry_prefix(media: Path, sampling_rate: int) -> str:
+    return f"{media.stem}.{_hash(f'{media.name}|{sampling_rate}')}."
+
+
+def pcm_path(media: Path, cache_dir: Path = PCM_DIR, *, sampling_rate: int = SR) -> Optional[Path]:
+    """
+    Cache entry for the media file's current version, or None if the file is missing.
+    """
+    sig = file_signature(media)
+    if sig is None:
+        return None
+    return cache_dir / f"{_entry_prefix(media, sampling_rate)}{_hash(f'{sig[0]}:{sig[1]}')}.npy"
+
+
+def _entries(prefix: str, cache_dir: Path) -> List[Path]:
+    # Exactly `<prefix><signature hash>.npy`: no glob, so names with "[", "*" or "?" are
+    # literal, and media "foo" never matches the entries of media "foo.bar".
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return []
+    size = len(prefix) + HASH_LEN + len(".npy")
+    return [cache_dir / n for n in sorted(names) if len(n) == size and n.startswith(prefix) and n.endswith(".npy")]
+
+
+def _drop_stale(path: Path, cache_dir: Path) -> None:
+    # Drop entries for older versions of the same media file.
+    for old in _entries(path.name[: -(HASH_LEN + len(".npy"))], cache_dir):
+        if old != path:
+            old.unlink(missing_ok=True)
+
+
+def drop_pcm(media: Path, cache_dir: Path = PCM_DIR, *, sampling_rate: int = SR) -> int:
+    """
+    Delete every cache entry of `media` (e.g. together with the audio itself); returns how many.
+    """
+    entries = _entries(_entry_prefix(media, sampling_rate), cache_dir)
+    for p in entries:
+        p.unlink(missing_ok=True)
+    return len(entries)
+
+
+def load_pcm(media: Path, cache_dir: Path = PCM_DIR, *, sampling_rate: int = SR) -> np.ndarray:
+    """
+    Mono float32 samples of `media` at `sampling_rate`, memory-mapped read-only.
+    Decodes (faster_whisper / PyAV) only on a cache miss.
+    """
+    path = pcm_path(media, cache_dir, sampling_rate=sampling_rate)
+    if path is None:
+        raise FileNotFoundError(str(media))
+    try:
+        return np.load(path, mmap_mode="r")
+    except (OSError, ValueError):
+        pass
+
+    from faster_whisper.audio import decode_audio  # type: ignore
+
+    audio = np.ascontiguousarray(decode_audio(str(media), sampling_rate=sampling_rate), dtype=np.float32)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with tmp.open("wb") as f:
+            np.save(f, audio)
+        os.replace(tmp, path)
+    except OSError:
+        return audio  # the cache is an optimization only
+    _drop_stale(path, cache_dir)
+    return np.load(path, mmap_mode="r")
+
+
+def _open_entry(path: Path) -> Tuple[BinaryIO, int]:
+    f = path.open("rb")
+    try:
+        version = np.lib.format.read_magic(f)
+        read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        shape, fortran_order, dtype = read_header(f)
+        if len(shape) != 1 or fortran_order or dtype != np.dtype("<f4"):
+            raise ValueError(f"unexpected PCM cache layout: {path}")
+    except BaseException:
+        f.close()
+        raise
+    return f, int(shape[0])
+
+
+def _read_windows(f: BinaryIO, n: int, window: int) -> Iterator[np.ndarray]:
+    with f:
+        while n > 0:
+            buf = np.empty(min(window, n), dtype=np.float32)
+            if f.readinto(memoryview(buf).cast("B")) != buf.nbytes:
+                raise ValueError(f"truncated PCM cache entry: {f.name}")
+            n -= len(buf)
+            yield buf
+
+
+def _decode_frames(media: Path, sampling_rate: int) -> Iterator[np.ndarray]:
+    # decode_audio() without collecting the whole file: the same PyAV frame pipeline
+    # and s16 -> float32 conversion, yielded group by group.
+    import gc
+
+    import av  # type: ignore
+    from faster_whisper import audio as fw_audio  # type: ignore
+
+    from _core.fwcompat import require_supported
+
+    require_supported()
+
+    resampler = av.audio.resampler.AudioResampler(format="s16", layout="mono", rate=sampling_rate)
+    try:
+        with av.open(str(media), mode="r", metadata_errors="ignore") as container:
+            frames = container.decode(audio=0)
+            frames = fw_audio._ignore_invalid_frames(frames)  # noqa: SLF001
+            frames = fw_audio._group_frames(frames, 500000)  # noqa: SLF001
+            for frame in fw_audio._resample_frames(frames, resampler):  # noqa: SLF001
+                yield frame.to_ndarray().reshape(-1).astype(np.float32) / 32768.0
+    finally:
+        del resampler
+        gc.collect()
+
+
+def iter_pcm(media: Path, cache_dir: Path = PCM_DIR, *, sampling_rate: int = SR, window: int) -> Iterator[np.ndarray]:
+    """
+    The samples `load_pcm` returns, as consecutive float32 windows of `window` samples
+    (the last one shorter). Only about one window is held in memory at a time; on a cache
+    miss the entry is written while decoding.
+    """
+    path = pcm_path(media, cache_dir, sampling_rate=sampling_rate)
+    if path is None:
+        raise FileNotFoundError(str(media))
+    try:
+        f, n = _open_entry(path)
+    except (OSError, ValueError):
+        pass
+    else:
+        yield from _read_windows(f, n, window)
+        return
+
+    tmp: Optional[Path] = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    out: Optional[BinaryIO] = None
+    header = {"descr": "<f4", "fortran_order": False, "shape": (0,)}
+    try:
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            out = tmp.open("wb")  # type: ignore[union-attr]
+            # numpy pads the header with room for any length, so it is rewritten in place at the end.
+            np.lib.format.write_array_header_1_0(out, header)
+        except OSError:
+            out = None  # the cache is an optimization only
+        n = 0
+        pending = np.empty(window, dtype=np.float32)
+        filled = 0
+        for samples in _decode_frames(media, sampling_rate):
+            if out is not None:
+                out.write(samples.tobytes())
+            n += len(samples)
+            while len(samples):
+                take = min(window - filled, len(samples))
+                pending[filled : filled + take] = samples[:take]
+                filled += take
+                samples = samples[take:]
+                if filled == window:
+                    yield pending.copy()
+                    filled = 0
+        if filled:
+            yield pending[:filled].copy()
+        if out is not None:
+            out.seek(0)
+            np.lib.format.write_array_header_1_0(out, {**header, "shape": (n,)})
+            out.close()
+            out = None
+            os.replace(tmp, path)  # type: ignore[arg-type]
+            tmp = None
+            _drop_stale(path, cache_dir)
+    finally:
+        if out is not None:
+            out.close()
+        if tmp is not None:
+            tmp.unlink(missing_ok=True)
@@ -0,0 +1,123 @@
+"""
+Bank of Bach voice reference profiles for diarization (transcripts/_speakers/_bach_bank.*).
+
+One profile per recording condition (e.g. "conference" halls, "podcast" mics). Each profile
+is the running mean of the chunk features of every confirmed-Bach segment added to it:
+the vectors live in `_bach_bank.npy` (profiles x features, float32), names, chunk counts
+and the contributing segments in `_bach_bank.json`. Adding a segment updates its profile
+incrementally; a segment already in the bank is not counted twice.
+
+Clusters are scored against the nearest profile (highest cosine similarity in the
+standardized feature space of the source being labeled).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+BANK_VERSION = 1
+
+
+@dataclass
+class Profile:
+    name: str
+    count: int = 0  # chunk features averaged into the vector
+    segments: List[Dict[str, object]] = field(default_factory=list)  # {source_id, start_s, end_s}
+
+
+class ReferenceBank:
+    def __init__(self, vectors: np.ndarray, profiles: List[Profile], *, feature: str, updated_at: str = "") -> None:
+        self.vectors = np.asarray(vectors, dtype=np.float32)
+        self.profiles = profiles
+        self.feature = feature
+        self.updated_at = updated_at
+
+    @classmethod
+    def empty(cls, dim: int, *, feature: str) -> "ReferenceBank":
+        return cls(np.zeros((0, dim), dtype=np.float32), [], feature=feature)
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    @property
+    def names(self) -> List[str]:
+        return [p.name for p in self.profiles]
+
+    @staticmethod
+    def meta_path(path: Path) -> Path:
+        return path.with_suffix(".json")
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["ReferenceBank"]:
+        try:
+            meta = json.loads(cls.meta_path(path).read_text(encoding="utf-8"))
+            vectors = np.load(path)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(meta, dict) or meta.get("version") != BANK_VERSION:
+            return None
+        profiles = [Profile(str(p["name"]), int(p["count"]), list(p.get("segments") or [])) for p in meta.get("profiles") or []]
+        if vectors.ndim != 2 or vectors.shape[0] != len(profiles):
+            return None
+        return cls(vectors, profiles, feature=str(meta.get("feature") or ""), updated_at=str(meta.get("updated_at") or ""))
+
+    def save(self, path: Path, *, updated_at: str) -> None:
+        self.updated_at = updated_at
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with tmp.open("wb") as f:
+            np.save(f, self.vectors)
+        os.replace(tmp, path)
+        meta = {
+            "version": BANK_VERSION,
+            "feature": self.feature,
+            "updated_at": updated_at,
+            "profiles": [{"name": p.name, "count": p.count, "segments": p.segments} for p in self.profiles],
+        }
+        meta_p = self.meta_path(path)
+        tmp = meta_p.with_name(f".{meta_p.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(meta, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(tmp, meta_p)
+
+    def has_segment(self, segment: Dict[str, object]) -> bool:
+        return any(segment in p.segments for p in self.profiles)
+
+    def add(self, name: str, feats: np.ndarray, segment: Dict[str, object]) -> bool:
+        """
+        Fold the chunk features of one confirmed-Bach segment into profile `name`
+        (created if new). Returns False if the segment was already added or has no features.
+        """
+        if len(feats) == 0 or self.has_segment(segment):
+            return False
+        feats = np.asarray(feats, dtype=np.float64).reshape(len(feats), -1)
+        if name not in self.names:
+            self.profiles.append(Profile(name))
+            self.vectors = np.vstack([self.vectors, np.zeros((1, feats.shape[1]), dtype=np.float32)])
+        i = self.names.index(name)
+        p = self.profiles[i]
+        total = p.count + len(feats)
+        mean = (self.vectors[i].astype(np.float64) * p.count + feats.sum(axis=0)) / total
+        self.vectors[i] = mean.astype(np.float32)
+        p.count = total
+        p.segments.append(segment)
+        return True
+
+    def score(self, centroids_z: np.ndarray, mu: np.ndarray, sd: np.ndarray) -> List[Tuple[float, str]]:
+        """
+        (similarity, profile name) of the nearest profile for each standardized centroid.
+        """
+        if not self.profiles:
+            raise ValueError("empty reference bank")
+        refs = (self.vectors - mu[None, :]) / sd[None, :]
+        refs /= np.linalg.norm(refs, axis=1, keepdims=True) + 1e-12
+        cents = centroids_z / (np.linalg.norm(centroids_z, axis=1, keepdims=True) + 1e-12)
+        sims = cents @ refs.T
+        best = sims.argmax(axis=1)
+        return [(float(sims[j, b]), self.profiles[b].name) for j, b in enumerate(best)]
@@ -0,0 +1,376 @@
+"""
+On-disk inverted index over local transcript cues (transcripts/_search/), with BM25 ranking.
+
+Layout:
+
+  manifest.json        version + per-source {sig, kind, cues, tokens}
+  sources/<sid>.json   token position at which each cue starts, and the shard prefixes it touched
+  shards/<hex>.json    {term: {source_id: [delta-encoded token positions]}}, one per term prefix
+
+Token positions run across a whole source, so phrase and proximity matches may cross
+cue boundaries; a position maps back to its cue ordinal by bisecting the cue starts,
+and the cue's time/text come from the cue store (`_core.cuestore`). `update()` only
+re-tokenizes sources whose transcript changed (mtime/size) and only rewrites the
+shards those sources touch.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import os
+import re
+import shutil
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from _core.corpus import file_signature
+from _core.cuestore import CueTable, open_cues
+
+
+INDEX_VERSION = 1
+PREFIX_LEN = 2
+TERM_RX = re.compile(r"\w+")
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+Clause = Tuple[str, ...]  # one term, or a quoted phrase
+
+
+@dataclass(frozen=True)
+class IndexedSource:
+    source_id: str
+    kind: str
+    path: Path
+
+
+@dataclass(frozen=True)
+class Match:
+    source_id: str
+    cue: int
+    score: float
+
+
+def tokenize(text: str) -> List[str]:
+    return TERM_RX.findall(text.casefold())
+
+
+def parse_query(query: str) -> List[Clause]:
+    """
+    Split a query into clauses: each bare word is a term, each "quoted run" a phrase.
+    """
+    clauses: List[Clause] = []
+    for m in re.finditer(r'"([^"]*)"?|(\S+)', query):
+        if m.group(2) is None:
+            terms = tuple(tokenize(m.group(1)))
+            if terms:
+                clauses.append(terms)
+        else:
+            clauses.extend((t,) for t in tokenize(m.group(2)))
+    return clauses
+
+
+def _delta(positions: List[int]) -> List[int]:
+    out, prev = [], 0
+    for p in positions:
+        out.append(p - prev)
+        prev = p
+    return out
+
+
+def _undelta(deltas: List[int]) -> List[int]:
+    out, acc = [], 0
+    for d in deltas:
+        acc += d
+        out.append(acc)
+    return out
+
+
+def _shard_name(prefix: str) -> str:
+    return prefix.encode("utf-8").hex() + ".json"
+
+
+def _load_json(path: Path) -> Optional[dict]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: Path, data: object) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def index_cues(cues: CueTable) -> Tuple[List[int], int, Dict[str, List[int]]]:
+    """
+    Tokenize a source: (token position at which each cue starts, token count, term -> positions).
+    """
+    cue_tokens: List[int] = []
+    postings: Dict[str, List[int]] = {}
+    pos = 0
+    for i in range(len(cues)):
+        cue_tokens.append(pos)
+        for term in tokenize(cues.text(i)):
+            postings.setdefault(term, []).append(pos)
+            pos += 1
+    return cue_tokens, pos, postings
+
+
+def _phrase_positions(lists: Sequence[List[int]]) -> List[int]:
+    # Start positions p such that term i occurs at p + i.
+    out = lists[0]
+    for i, positions in enumerate(lists[1:], 1):
+        later = set(positions)
+        out = [p for p in out if p + i in later]
+    return out
+
+
+def _near(positions: List[int], others: Sequence[List[int]], window: int) -> List[int]:
+    # Keep occurrences that have every other clause within `window` tokens.
+    kept = []
+    for p in positions:
+        for other in others:
+            j = bisect_left(other, p - window)
+            if j >= len(other) or other[j] > p + window:
+                break
+        else:
+            kept.append(p)
+    return kept
+
+
+def _intersect_sorted(a: List[int], b: Sequence[int]) -> List[int]:
+    out, j = [], 0
+    for x in a:
+        while j < len(b) and b[j] < x:
+            j += 1
+        if j < len(b) and b[j] == x:
+            out.append(x)
+    return out
+
+
+class TranscriptIndex:
+    def __init__(self, index_dir: Path) -> None:
+        self.dir = index_dir
+        manifest = _load_json(index_dir / "manifest.json") or {}
+        # Without a current manifest, whatever is on disk is from another version (or torn): start over.
+        self._reset = manifest.get("version") != INDEX_VERSION
+        if self._reset:
+            manifest = {}
+        self.sources: Dict[str, Dict[str, object]] = dict(manifest.get("sources") or {})
+        self._cue_tokens: Dict[str, List[int]] = {}
+
+    def _source_path(self, sid: str) -> Path:
+        return self.dir / "sources" / f"{sid}.json"
+
+    def _shard_path(self, prefix: str) -> Path:
+        return self.dir / "shards" / _shard_name(prefix)
+
+    def update(self, sources: Iterable[IndexedSource], *, cues_dir: Path) -> bool:
+        """
+        Bring the index in line with `sources`; returns True if anything was (re)indexed or dropped.
+        """
+        if self._reset:
+            for sub in ("sources", "shards"):
+                shutil.rmtree(self.dir / sub, ignore_errors=True)
+            self._reset = False
+        wanted: Dict[str, IndexedSource] = {s.source_id: s for s in sources}
+        stale: Set[str] = set()
+        fresh: Dict[str, Dict[str, List[int]]] = {}
+        meta_changed = False
+        # Shards holding postings of sources that are dropped or re-indexed.
+        touched: Set[str] = set()
+
+        def drop(sid: str) -> None:
+            stale.add(sid)
+            touched.update((_load_json(self._source_path(sid)) or {}).get("prefixes") or [])
+
+        for sid in set(self.sources) - set(wanted):
+            drop(sid)
+        for sid, src in wanted.items():
+            sig = file_signature(src.path)
+            ent = self.sources.get(sid)
+            if sig is None:
+                if ent:
+                    drop(sid)
+                continue
+            if ent and ent.get("sig") == list(sig):
+                if ent.get("kind") != src.kind:
+                    ent["kind"] = src.kind
+                    meta_changed = True
+                continue
+            if ent:
+                drop(sid)
+            with open_cues(sid, src.path, cache_dir=cues_dir) as cues:
+                cue_tokens, n_tokens, postings = index_cues(cues)
+            fresh[sid] = postings
+            prefixes = sorted({t[:PREFIX_LEN] for t in postings})
+            _write_json(self._source_path(sid), {"cue_tokens": cue_tokens, "prefixes": prefixes})
+            self._cue_tokens[sid] = cue_tokens
+            self.sources[sid] = {"sig": list(sig), "kind": src.kind, "cues": len(cue_tokens), "tokens": n_tokens}
+
+        if not stale and not fresh:
+            if meta_changed:
+                self._write_manifest()
+            return False
+
+        for sid in stale:
+            if sid not in fresh:
+                self.sources.pop(sid, None)
+                self._cue_tokens.pop(sid, None)
+                try:
+                    self._source_path(sid).unlink()
+                except OSError:
+                    pass
+        for postings in fresh.values():
+            touched.update(t[:PREFIX_LEN] for t in postings)
+
+        for prefix in sorted(touched):
+            path = self._shard_path(prefix)
+            shard: Dict[str, Dict[str, List[int]]] = _load_json(path) or {}
+            for term in list(shard):
+                by_sid = {sid: p for sid, p in shard[term].items() if sid not in stale and sid not in fresh}
+                if by_sid:
+                    shard[term] = by_sid
+                else:
+                    del shard[term]
+            for sid, postings in fresh.items():
+                for term, positions in postings.items():
+                    if term[:PREFIX_LEN] == prefix:
+                        shard.setdefault(term, {})[sid] = _delta(positions)
+            if shard:
+                _write_json(path, shard)
+            else:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+        self._write_manifest()
+        return True
+
+    def _write_manifest(self) -> None:
+        _write_json(self.dir / "manifest.json", {"version": INDEX_VERSION, "sources": self.sources})
+
+    def cue_tokens(self, sid: str) -> List[int]:
+        hit = self._cue_tokens.get(sid)
+        if hit is None:
+            hit = list((_load_json(self._source_path(sid)) or {}).get("cue_tokens") or [])
+            self._cue_tokens[sid] = hit
+        return hit
+
+    def postings(self, terms: Iterable[str]) -> Dict[str, Dict[str, List[int]]]:
+        out: Dict[str, Dict[str, List[int]]] = {}
+        by_prefix: Dict[str, List[str]] = {}
+        for t in terms:
+            by_prefix.setdefault(t[:PREFIX_LEN], []).append(t)
+        for prefix, group in by_prefix.items():
+            shard = _load_json(self._shard_path(prefix)) or {}
+            for t in group:
+                out[t] = {sid: _undelta(d) for sid, d in (shard.get(t) or {}).items()}
+        return out
+
+    def prefix_postings(self, prefix: str) -> Dict[str, List[int]]:
+        """
+        Positions of every indexed term starting with `prefix` (at least PREFIX_LEN chars), merged per source.
+        """
+        shard = _load_json(self._shard_path(prefix[:PREFIX_LEN])) or {}
+        per_sid: Dict[str, List[List[int]]] = {}
+        for term in sorted(shard):
+            if term.startswith(prefix):
+                for sid, deltas in shard[term].items():
+                    per_sid.setdefault(sid, []).append(_undelta(deltas))
+        return {sid: lists[0] if len(lists) == 1 else list(heapq.merge(*lists)) for sid, lists in per_sid.items()}
+
+    def search(
+        self,
+        clauses: Sequence[Clause],
+        *,
+        kinds: Optional[Set[str]] = None,
+        near: int = 0,
+        match_all: bool = False,
+        prefix_last: bool = False,
+        cue_filter: Optional[Callable[[str], Optional[Sequence[int]]]] = None,
+        limit: int = 200,
+    ) -> List[Match]:
+        """
+        Rank cues by BM25 over `clauses` (a cue matches if it holds any clause occurrence).
+
+        `kinds` restricts the searched sources; `near` requires every clause within that many
+        tokens of each counted occurrence; `match_all` requires every clause in the cue itself;
+        `prefix_last` lets a trailing single-term clause match every term it prefixes
+        ("conscious" -> "consciousness"); `cue_filter(sid)` may return the sorted cue ordinals
+        allowed in a source (None = all), which is intersected with the matching cues.
+        """
+        if not clauses:
+            return []
+        scope = [sid for sid, ent in self.sources.items() if not kinds or ent.get("kind") in kinds]
+        n_cues = sum(int(self.sources[sid]["cues"]) for sid in scope)
+        n_tokens = sum(int(self.sources[sid]["tokens"]) for sid in scope)
+        if not n_cues or not n_tokens:
+            return []
+        avg_len = n_tokens / n_cues
+        postings = self.postings({t for c in clauses for t in c})
+        # Per clause, the postings of each of its terms.
+        clause_postings = [[postings[t] for t in clause] for clause in clauses]
+        if prefix_last and len(clauses[-1]) == 1 and len(clauses[-1][0]) >= PREFIX_LEN:
+            clause_postings[-1] = [self.prefix_postings(clauses[-1][0])]
+
+        # clause -> sid -> sorted start positions
+        occ: List[Dict[str, List[int]]] = []
+        for term_postings in clause_postings:
+            per_sid: Dict[str, List[int]] = {}
+            for sid in scope:
+                lists = [p.get(sid) for p in term_postings]
+                if all(lists):
+                    found = lists[0] if len(lists) == 1 else _phrase_positions(lists)  # type: ignore[arg-type]
+                    if found:
+                        per_sid[sid] = found
+            occ.append(per_sid)
+
+        # Document frequency: cues holding each clause anywhere in scope, however the
+        # candidates are narrowed below (all terms, --near, cue_filter).
+        df = [0] * len(clauses)
+        for ci, per_sid in enumerate(occ):
+            for sid, positions in per_sid.items():
+                starts = self.cue_tokens(sid)
+                df[ci] += len({bisect_right(starts, p) - 1 for p in positions})
+
+        candidates = set.intersection(*(set(o) for o in occ)) if near or match_all else set().union(*occ)
+        # (sid, cue) -> per-clause term frequency
+        tf: Dict[Tuple[str, int], List[int]] = {}
+        for sid in scope:
+            if sid not in candidates:
+                continue
+            starts = self.cue_tokens(sid)
+            allowed = cue_filter(sid) if cue_filter else None
+            for ci, per_sid in enumerate(occ):
+                positions = per_sid.get(sid)
+                if not positions:
+                    continue
+                if near:
+                    others = [o[sid] for oj, o in enumerate(occ) if oj != ci]
+                    positions = _near(positions, others, near)
+                cues = [bisect_right(starts, p) - 1 for p in positions]
+                if allowed is not None:
+                    cues = _intersect_sorted(cues, allowed)
+                for cue in cues:
+                    tf.setdefault((sid, cue), [0] * len(clauses))[ci] += 1
+
+        idf = [math.log(1.0 + (n_cues - d + 0.5) / (d + 0.5)) for d in df]
+        order = {sid: i for i, sid in enumerate(scope)}
+        scored = []
+        for (sid, cue), counts in tf.items():
+            if match_all and not near and not all(counts):
+                continue
+            starts = self.cue_tokens(sid)
+            end = starts[cue + 1] if cue + 1 < len(starts) else int(self.sources[sid]["tokens"])
+            norm = BM25_K1 * (1.0 - BM25_B + BM25_B * (end - starts[cue]) / avg_len)
+            score = sum(w * f * (BM25_K1 + 1.0) / (f + norm) for w, f in zip(idf, counts) if f)
+            scored.append((score, -order[sid], -cue, sid))
+        best = heapq.nlargest(limit, scored)
+        return [Match(sid, -neg_cue, score) for score, _o, neg_cue, sid in best]
@@ -0,0 +1,194 @@
+"""
+Streaming Silero speech detection with the same result as faster_whisper.vad.get_speech_timestamps.
+
+`get_speech_timestamps(audio)` needs the whole recording: it pads a copy of it and builds
+another (n/512 x 576) copy as model input, i.e. over twice the decoded audio in RAM for
+one call. `SpeechStream` takes the audio in pieces instead:
+
+- samples are buffered up to one model batch (ENCODER_BATCH rows of 512), so the ONNX
+  session sees exactly the batches (inputs, 64-sample context, LSTM state) the one-shot
+  call would, and produces the same speech probabilities;
+- the hysteresis over the probabilities (threshold / neg_threshold / min silence /
+  max speech) runs as a state machine carried across batches;
+- padding of the finished regions (speech_pad_ms, halving short gaps) is applied in
+  `finish()` over the region list, which is tiny.
+
+Memory is bounded by one batch (ENCODER_BATCH x 512 samples) regardless of length.
+
+This mirrors faster_whisper internals, so it only runs on the release pinned in
+`_core.fwcompat` (checked when a stream is created).
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from faster_whisper import vad as fw_vad
+
+from _core.fwcompat import require_supported
+
+
+WINDOW_SAMPLES = 512
+CONTEXT_SAMPLES = 64
+ENCODER_BATCH = 10000  # rows per session.run in SileroVADModel.__call__
+BATCH_SAMPLES = ENCODER_BATCH * WINDOW_SAMPLES
+
+# (model input rows, h, c) -> (speech probabilities, h, c)
+RunFn = Callable[[np.ndarray, np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray, np.ndarray]]
+
+
+def silero_run() -> RunFn:
+    session = fw_vad.get_vad_model().session
+
+    def run(batch: np.ndarray, h: np.ndarray, c: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        out, h, c = session.run(None, {"input": batch, "h": h, "c": c})
+        return out, h, c
+
+    return run
+
+
+class SpeechStream:
+    """
+    Feed consecutive pieces of a 16 kHz recording, then `finish()` for the speech regions
+    ({"start", "end"} in samples) `get_speech_timestamps` would return for all of it.
+    """
+
+    def __init__(self, options: Optional[fw_vad.VadOptions] = None, *, sampling_rate: int = 16000, run: Optional[RunFn] = None) -> None:
+        require_supported()
+        o = options or fw_vad.VadOptions()
+        self.threshold = o.threshold
+        self.neg_threshold = o.neg_threshold if o.neg_threshold is not None else max(o.threshold - 0.15, 0.01)
+        self.min_speech_samples = sampling_rate * o.min_speech_duration_ms / 1000
+        self.speech_pad_samples = sampling_rate * o.speech_pad_ms / 1000
+        self.max_speech_samples = sampling_rate * o.max_speech_duration_s - WINDOW_SAMPLES - 2 * self.speech_pad_samples
+        self.min_silence_samples = sampling_rate * o.min_silence_duration_ms / 1000
+        self.min_silence_samples_at_max_speech = sampling_rate * 98 / 1000
+        self._run = run or silero_run()
+
+        self._buf = np.empty(BATCH_SAMPLES, dtype=np.float32)
+        self._filled = 0
+        self._h = np.zeros((1, 1, 128), dtype=np.float32)
+        self._c = np.zeros((1, 1, 128), dtype=np.float32)
+        self._context = np.zeros(CONTEXT_SAMPLES, dtype=np.float32)
+        self.n_samples = 0
+
+        # Hysteresis state, as in get_speech_timestamps.
+        self._i = 0  # index of the next 512-sample window
+        self._triggered = False
+        self._current: Dict[str, int] = {}
+        self._temp_end = 0
+        self._prev_end = 0
+        self._next_start = 0
+        self._speeches: List[Dict[str, int]] = []
+
+    def feed(self, samples: np.ndarray) -> None:
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        self.n_samples += len(samples)
+        while len(samples):
+            take = min(BATCH_SAMPLES - self._filled, len(samples))
+            self._buf[self._filled : self._filled + take] = samples[:take]
+            self._filled += take
+            samples = samples[take:]
+            if self._filled == BATCH_SAMPLES:
+                self._run_batch(self._buf, last=False)
+                self._filled = 0
+
+    def finish(self) -> List[Dict[str, int]]:
+        # get_speech_timestamps pads to a multiple of 512 (a whole window if already aligned).
+        pad = WINDOW_SAMPLES - self.n_samples % WINDOW_SAMPLES
+        tail = np.zeros(self._filled + pad, dtype=np.float32)
+        tail[: self._filled] = self._buf[: self._filled]
+        self._run_batch(tail, last=True)
+        self._filled = 0
+
+        if self._current and (self.n_samples - self._current["start"]) > self.min_speech_samples:
+            self._current["end"] = self.n_samples
+            self._speeches.append(self._current)
+            self._current = {}
+        return self._pad(self._speeches)
+
+    def _run_batch(self, audio: np.ndarray, *, last: bool) -> None:
+        rows = audio.reshape(-1, WINDOW_SAMPLES)
+        context = np.empty((len(rows), CONTEXT_SAMPLES), dtype=np.float32)
+        context[0] = self._context
+        context[1:] = rows[:-1, -CONTEXT_SAMPLES:]
+        self._context = rows[-1, -CONTEXT_SAMPLES:].copy()
+        model_in = np.concatenate([context, rows], axis=1)
+        if last:
+            # SileroVADModel zeroes the tail of the final window (in its context bookkeeping).
+            model_in[-1, -CONTEXT_SAMPLES:] = 0.0
+        for r0 in range(0, len(model_in), ENCODER_BATCH):
+            probs, self._h, self._c = self._run(model_in[r0 : r0 + ENCODER_BATCH], self._h, self._c)
+            self._step(np.asarray(probs).reshape(-1))
+
+    def _step(self, speech_probs: np.ndarray) -> None:
+        w = WINDOW_SAMPLES
+        speeches = self._speeches
+        current = self._current
+        triggered, temp_end, prev_end, next_start = self._triggered, self._temp_end, self._prev_end, self._next_start
+        i = self._i - 1
+        for speech_prob in speech_probs.tolist():
+            i += 1
+            if speech_prob >= self.threshold and temp_end:
+                temp_end = 0
+                if next_start < prev_end:
+                    next_start = w * i
+
+            if speech_prob >= self.threshold and not triggered:
+                triggered = True
+                current["start"] = w * i
+                continue
+
+            if triggered and (w * i) - current["start"] > self.max_speech_samples:
+                if prev_end:
+                    current["end"] = prev_end
+                    speeches.append(current)
+                    current = {}
+                    # previously reached silence (< neg_thres) and is still not speech (< thres)
+                    if next_start < prev_end:
+                        triggered = False
+                    else:
+                        current["start"] = next_start
+                    prev_end = next_start = temp_end = 0
+                else:
+                    current["end"] = w * i
+                    speeches.append(current)
+                    current = {}
+                    prev_end = next_start = temp_end = 0
+                    triggered = False
+                    continue
+
+            if speech_prob < self.neg_threshold and triggered:
+                if not temp_end:
+                    temp_end = w * i
+                if (w * i) - temp_end > self.min_silence_samples_at_max_speech:
+                    prev_end = temp_end
+                if (w * i) - temp_end < self.min_silence_samples:
+                    continue
+                current["end"] = temp_end
+                if (current["end"] - current["start"]) > self.min_speech_samples:
+                    speeches.append(current)
+                current = {}
+                prev_end = next_start = temp_end = 0
+                triggered = False
+        self._i = i + 1
+        self._current = current
+        self._triggered, self._temp_end, self._prev_end, self._next_start = triggered, temp_end, prev_end, next_start
+
+    def _pad(self, speeches: List[Dict[str, int]]) -> List[Dict[str, int]]:
+        n, pad = self.n_samples, self.speech_pad_samples
+        for i, speech in enumerate(speeches):
+            if i == 0:
+                speech["start"] = int(max(0, speech["start"] - pad))
+            if i != len(speeches) - 1:
+                silence = speeches[i + 1]["start"] - speech["end"]
+                if silence < 2 * pad:
+                    speech["end"] += int(silence // 2)
+                    speeches[i + 1]["start"] = int(max(0, speeches[i + 1]["start"] - silence // 2))
+                else:
+                    speech["end"] = int(min(n, speech["end"] + pad))
+                    speeches[i + 1]["start"] = int(max(0, speeches[i + 1]["start"] - pad))
+            else:
+                speech["end"] = int(min(n, speech["end"] + pad))
+        return speeches
@@ -8,23 +8,41 @@ We attach anchors as HTML comments to avoid cluttering reader-facing prose:
   [BACH] ... <!-- src: yt_xxx @ 00:00:00 -->
 
 Anchors are chosen from the chapter's existing "Anchors (sources + timecodes)"
-section, using a simple keyword-overlap heuristic with a small amount of local
-context (the tagged line + following non-empty lines).
+section by TF-IDF cosine similarity between a small amount of local context (the
+tagged line + following non-empty lines) and one vector per anchor, built from its
+keywords plus the source-note segment tags near its timecode
+(sources/source_notes/<source_id>.md). The per-chapter vectors are cached under
+.cache/anchor_index/ and rebuilt when the anchors section or a note changes.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
+import math
+import os
 import re
 import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
+from _core import corpus
+from _core.codehash import code_fingerprint
 from _core.provenance import format_src_comment
+from _core.timecodes import parse_timecode_to_seconds
 
 
 ROOT = Path(__file__).resolve().parents[1]
 CHAPTERS_DIR = ROOT / "manuscript" / "chapters"
+NOTES_DIR = ROOT / "sources" / "source_notes"
+INDEX_CACHE_DIR = ROOT / ".cache" / "anchor_index"
+INDEX_VERSION = 1
+
+NOTE_TAG_WINDOW_S = 60  # note segments starting this close to an anchor's timecode lend it their tags
+NOTE_TAG_WEIGHT = 0.5  # term count of one note tag, relative to one anchor keyword
+MIN_MARGIN = 0.02  # cosine gap to the runner-up below which a choice needs review
+SCORE_DIGITS = 6  # scores are rounded before ranking so ties do not depend on float noise
 
 
 ANCHOR_RX = re.compile(
@@ -33,6 +51,8 @@ ANCHOR_RX = re.compile(
 )
 BACH_LINE_RX = re.compile(r"^\[BACH\]")
 HAS_SRC_RX = re.compile(r"<!--\s*src:\s*[^>]+-->", re.IGNORECASE)
+WORD_RX = re.compile(r"[a-z0-9]+")
+NOTE_SEGMENT_RX = re.compile(r"^-\s+\[(\d{2}:\d{2}:\d{2})-\d{2}:\d{2}:\d{2}\]\s+keywords:\s*(.*?)\s*$")
 
 
 STOPWORDS = {
@@ -77,13 +97,50 @@ def tokenize_keywords(s: str) -> List[str]:
     return out
 
 
-def score_anchor(context: str, a: Anchor) -> int:
-    ctx = context.lower()
-    score = 0
-    for kw in a.keywords:
-        if kw and kw in ctx:
-            score += 1
-    return score
+SUFFIXES = ("ations", "ation", "ings", "ing", "ies", "ed", "es", "s")
+
+
+def stem(tok: str) -> str:
+    """
+    Crude suffix stripping, enough to match "models"/"modeling" to "model".
+    """
+    for suf in SUFFIXES:
+        if tok.endswith(suf) and len(tok) - len(suf) >= 4:
+            return tok[: -len(suf)]
+    return tok
+
+
+def terms(text: str) -> List[str]:
+    return [stem(w) for w in WORD_RX.findall(text.lower()) if w not in STOPWORDS]
+
+
+def parse_note_segments(md: str) -> List[Tuple[int, List[str]]]:
+    """
+    (start seconds, keyword tags) of each "- [HH:MM:SS-HH:MM:SS] keywords: ..." line in a source note.
+    """
+    out: List[Tuple[int, List[str]]] = []
+    for line in md.splitlines():
+        m = NOTE_SEGMENT_RX.match(line)
+        if not m:
+            continue
+        start = parse_timecode_to_seconds(m.group(1))
+        if start is None:
+            continue
+        out.append((start, [t.strip() for t in m.group(2).split(",") if t.strip()]))
+    return out
+
+
+def note_tags(a: "Anchor", notes_dir: Path = NOTES_DIR) -> List[str]:
+    """
+    Tags of the note segments of `a.source_id` within NOTE_TAG_WINDOW_S of its locator
+    (none for page locators or sources without a note).
+    """
+    at = parse_timecode_to_seconds(a.locator)
+    path = notes_dir / f"{a.source_id}.md"
+    if at is None or not path.exists():
+        return []
+    segments = corpus.parsed(path, parse_note_segments, name="add_bach_anchors.note_segments")
+    return [tag for start, tags in segments if abs(start - at) <= NOTE_TAG_WINDOW_S for tag in tags]
 
 
 def load_chapter_anchors(lines: List[str]) -> List[Anchor]:
@@ -130,48 +187,147 @@ def context_for_bach_line(lines: List[str], i: int, max_follow: int = 10) -> str
     return " ".join(ctx_parts).strip()
 
 
-def choose_anchor(context: str, anchors: List[Anchor]) -> Anchor:
+class AnchorIndex:
+    """
+    TF-IDF vectors (unit length) of one chapter's anchors, in anchor order.
+
+    An anchor's document is its keywords plus its nearby note tags (at NOTE_TAG_WEIGHT);
+    idf is over the chapter's anchors, so terms shared by every anchor weigh least.
+    """
+
+    def __init__(self, idf: Dict[str, float], vectors: List[Dict[str, float]]) -> None:
+        self.idf = idf
+        self.vectors = vectors
+
+    @classmethod
+    def build(cls, anchors: List[Anchor], notes_dir: Path = NOTES_DIR) -> "AnchorIndex":
+        docs: List[Dict[str, float]] = []
+        for a in anchors:
+            tf: Dict[str, float] = {}
+            for t in terms(" ".join(a.keywords)):
+                tf[t] = tf.get(t, 0.0) + 1.0
+            for t in terms(" ".join(note_tags(a, notes_dir))):
+                tf[t] = tf.get(t, 0.0) + NOTE_TAG_WEIGHT
+            docs.append(tf)
+        df: Dict[str, int] = {}
+        for tf in docs:
+            for t in tf:
+                df[t] = df.get(t, 0) + 1
+        n = len(docs)
+        idf = {t: math.log((1 + n) / (1 + c)) + 1.0 for t, c in sorted(df.items())}
+        return cls(idf, [_unit({t: c * idf[t] for t, c in sorted(tf.items())}) for tf in docs])
+
+    def scores(self, context: str) -> List[float]:
+        """
+        Cosine similarity of `context` (restricted to the anchors' vocabulary) to each anchor.
+        """
+        tf: Dict[str, float] = {}
+        for t in terms(context):
+            if t in self.idf:
+                tf[t] = tf.get(t, 0.0) + 1.0
+        q = _unit({t: c * self.idf[t] for t, c in sorted(tf.items())})
+        return [round(sum(w * q.get(t, 0.0) for t, w in v.items()), SCORE_DIGITS) for v in self.vectors]
+
+    def to_json(self) -> Dict[str, object]:
+        return {"idf": self.idf, "vectors": self.vectors}
+
+    @classmethod
+    def from_json(cls, data: Dict[str, object]) -> "AnchorIndex":
+        return cls(dict(data["idf"]), [dict(v) for v in data["vectors"]])  # type: ignore[arg-type]
+
+
+def _unit(v: Dict[str, float]) -> Dict[str, float]:
+    norm = math.sqrt(sum(x * x for x in v.values()))
+    return {t: x / norm for t, x in v.items()} if norm else {}
+
+
+def index_key(anchors: List[Anchor], notes_dir: Path = NOTES_DIR) -> str:
+    """
+    Cache key of a chapter's index: the anchors, the (mtime, size) of the notes they read,
+    and the code that builds and serializes it (this script and its `_core` imports).
+    """
+    notes: Dict[str, Optional[Tuple[int, int]]] = {}
+    for a in anchors:
+        notes[a.source_id] = corpus.file_signature(notes_dir / f"{a.source_id}.md")
+    payload = {
+        "version": INDEX_VERSION,
+        "code": code_fingerprint(Path(__file__)),
+        "window_s": NOTE_TAG_WINDOW_S,
+        "tag_weight": NOTE_TAG_WEIGHT,
+        "anchors": [[a.source_id, a.locator, a.keywords] for a in anchors],
+        "notes": sorted(notes.items()),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def load_anchor_index(anchors: List[Anchor], cache_path: Optional[Path], notes_dir: Path = NOTES_DIR) -> AnchorIndex:
+    """
+    The chapter's AnchorIndex, read from `cache_path` when its key still matches (else built and written).
+    """
+    key = index_key(anchors, notes_dir)
+    if cache_path is not None:
+        try:
+            data = json.loads(cache_path.read_text(encoding="utf-8"))
+            if isinstance(data, dict) and data.get("key") == key:
+                return AnchorIndex.from_json(data)
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+    index = AnchorIndex.build(anchors, notes_dir)
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"key": key, **index.to_json()}, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(tmp, cache_path)
+    return index
+
+
+def rank_anchors(context: str, anchors: List[Anchor], index: Optional[AnchorIndex] = None) -> List[Tuple[float, int]]:
+    """
+    (score, anchor position) best first; equal scores keep the anchors section order.
+    """
     if not anchors:
         raise RuntimeError("chapter has no anchors section")
-    scored = [(score_anchor(context, a), idx, a) for idx, a in enumerate(anchors)]
-    scored.sort(key=lambda t: (-t[0], t[1]))
-    return scored[0][2]
+    scores = (index or AnchorIndex.build(anchors)).scores(context)
+    return sorted(((s, idx) for idx, s in enumerate(scores)), key=lambda t: (-t[0], t[1]))
+
 
+def choose_anchor(context: str, anchors: List[Anchor], index: Optional[AnchorIndex] = None) -> Anchor:
+    return anchors[rank_anchors(context, anchors, index)[0][1]]
 
-def choose_anchor_with_confidence(context: str, anchors: List[Anchor]) -> Tuple[Anchor, Dict[str, str]]:
+
+def choose_anchor_with_confidence(
+    context: str, anchors: List[Anchor], index: Optional[AnchorIndex] = None
+) -> Tuple[Anchor, Dict[str, str]]:
     """
     Choose an anchor and return optional non-public metadata when matching is ambiguous.
 
     Ambiguity conditions:
-      - best_score == 0 (no keyword overlap)
+      - best_score == 0 (no term overlap)
       - tie for best_score
-      - low margin between best and runner-up (margin < 1)
+      - low margin between best and runner-up (margin < MIN_MARGIN)
     """
-    if not anchors:
-        raise RuntimeError("chapter has no anchors section")
-
-    scored = [(score_anchor(context, a), idx, a) for idx, a in enumerate(anchors)]
-    scored.sort(key=lambda t: (-t[0], t[1]))
-    best_score, _best_idx, best = scored[0]
-    second_score = scored[1][0] if len(scored) > 1 else -1
-    margin = best_score - second_score
-    tied = sum(1 for s, _idx, _a in scored if s == best_score) > 1
+    scored = rank_anchors(context, anchors, index)
+    best_score, best_idx = scored[0]
+    second_score = scored[1][0] if len(scored) > 1 else 0.0
+    margin = round(best_score - second_score, SCORE_DIGITS)
+    tied = sum(1 for s, _idx in scored if s == best_score) > 1
 
-    needs_review = best_score <= 0 or tied or margin < 1
+    needs_review = best_score <= 0 or tied or margin < MIN_MARGIN
     if not needs_review:
-        return best, {}
+        return anchors[best_idx], {}
 
-    meta: Dict[str, str] = {"auto": "needs_review", "score": str(best_score), "margin": str(margin)}
+    meta: Dict[str, str] = {"auto": "needs_review", "score": f"{best_score:.3f}", "margin": f"{margin:.3f}"}
     if tied:
         meta["tie"] = "1"
-    return best, meta
+    return anchors[best_idx], meta
 
 
-def process_chapter(path: Path) -> Tuple[bool, int, int]:
-    lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
+def process_chapter(path: Path, cache_dir: Optional[Path] = INDEX_CACHE_DIR) -> Tuple[bool, int, int]:
+    lines = corpus.read_text(path).splitlines()
     anchors = load_chapter_anchors(lines)
     if not anchors:
         return False, 0, 0
+    index: Optional[AnchorIndex] = None
 
     changed = False
     total_bach = 0
@@ -184,8 +340,10 @@ def process_chapter(path: Path) -> Tuple[bool, int, int]:
         if HAS_SRC_RX.search(line):
             anchored += 1
             continue
+        if index is None:
+            index = load_anchor_index(anchors, cache_dir / f"{path.stem}.json" if cache_dir else None)
         ctx = context_for_bach_line(lines, i)
-        a, meta = choose_anchor_with_confidence(ctx, anchors)
+        a, meta = choose_anchor_with_confidence(ctx, anchors, index)
         suffix = " " + format_src_comment([(a.source_id, a.locator)], meta=meta or None)
         lines[i] = line.rstrip() + suffix
         anchored += 1
@@ -197,7 +355,7 @@ def process_chapter(path: Path) -> Tuple[bool, int, int]:
 
 
 def main(argv: List[str]) -> int:
-    paths = sorted(CHAPTERS_DIR.glob("ch*.md"))
+    paths = corpus.chapter_paths(CHAPTERS_DIR)
     if not paths:
         print("no chapters found", file=sys.stderr)
         return 2
@@ -7,6 +7,9 @@ This script is intentionally local-only:
 - Updates transcripts/_index.csv (also gitignored).
 - Downloads audio (via yt-dlp). By default, keeps the audio file until QA confirms
   transcript quality and (if applicable) speaker attribution; then it can be deleted.
+- Streams cues to `<transcript>.part` with a checkpoint, so an interrupted run resumes
+  where it stopped (`--no-resume` starts over). Long audio can be split on VAD silences
+  (`--split-minutes`) and the chunks transcribed in parallel.
 
 Requires:
 - A Python env with faster-whisper installed (e.g. `.venv313`).
@@ -17,19 +20,33 @@ from __future__ import annotations
 import argparse
 import csv
 import datetime as dt
+import json
+import multiprocessing
 import os
+import queue
 import shutil
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from _core.journal import IndexJournal
+
 
 ROOT = Path(__file__).resolve().parents[1]
 SOURCES_CSV = ROOT / "sources" / "sources.csv"
 TRANSCRIPTS_DIR = ROOT / "transcripts"
 INDEX_CSV = TRANSCRIPTS_DIR / "_index.csv"
+# Separate from fetch_transcripts' journal; both compact into _index.csv.
+INDEX_JOURNAL = TRANSCRIPTS_DIR / "_index.asr.journal.jsonl"
+PCM_DIR = TRANSCRIPTS_DIR / "_pcm"  # decoded audio shared with diarize_bach
+
+SR = 16000
+RESUME_OVERLAP_S = 5.0  # audio re-decoded before a checkpoint so the seam has context
 
 def _resolve_bin(env_key: str, fallback: str) -> str:
     override = (os.environ.get(env_key) or "").strip()
@@ -164,18 +181,198 @@ def format_vtt_time(seconds: float) -> str:
     return f"{h:02}:{m:02}:{s:02}.{ms:03}"
 
 
-def write_vtt(path: Path, segments) -> None:
-    lines = ["WEBVTT", ""]
-    for seg in segments:
-        start = format_vtt_time(seg.start)
-        end = format_vtt_time(seg.end)
-        text = (seg.text or "").strip()
-        if not text:
-            continue
-        lines.append(f"{start} --> {end}")
-        lines.append(text)
-        lines.append("")
-    path.write_text("\n".join(lines).rstrip() + "\n", encoding="utf-8")
+def vtt_cue(start_s: float, end_s: float, text: str) -> str:
+    return f"{format_vtt_time(start_s)} --> {format_vtt_time(end_s)}\n{text}\n\n"
+
+
+def _norm_text(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+class PartWriter:
+    """
+    Streams cues of one ASR chunk into `<transcript>.part` and checkpoints after each cue.
+
+    The checkpoint (`<part>.json`) records the byte length of the part file, the end time of
+    the last written cue and whether the chunk finished. On resume the part file is
+    truncated to the checkpointed length (dropping a torn cue), decoding restarts
+    RESUME_OVERLAP_S before `done_s`, and cues already covered by the part are skipped.
+    """
+
+    def __init__(self, part: Path, *, resume: bool) -> None:
+        self.part = part
+        self.ckpt = part.with_name(part.name + ".json")
+        self.done_s: Optional[float] = None
+        self.language = ""
+        self.complete = False
+        self._seam: Optional[float] = None
+        self._last_text = ""
+        state = self._load() if resume else None
+        if state is None:
+            self.part.write_text("WEBVTT\n\n", encoding="utf-8")
+            self.ckpt.unlink(missing_ok=True)
+            self._bytes = self.part.stat().st_size
+        else:
+            self._bytes = int(state["bytes"])
+            self.done_s = float(state["done_s"]) if state.get("done_s") is not None else None
+            self.language = str(state.get("language") or "")
+            self.complete = bool(state.get("complete"))
+            self._seam = self.done_s
+            self._last_text = str(state.get("last_text") or "")
+        self._f = None if self.complete else self.part.open("ab")
+
+    def _load(self) -> Optional[dict]:
+        try:
+            state = json.loads(self.ckpt.read_text(encoding="utf-8"))
+            size = self.part.stat().st_size
+        except (OSError, ValueError):
+            return None
+        if not isinstance(state, dict) or not isinstance(state.get("bytes"), int) or state["bytes"] > size:
+            return None
+        if size > state["bytes"]:
+            with self.part.open("r+b") as f:
+                f.truncate(state["bytes"])
+        return state
+
+    def _checkpoint(self) -> None:
+        state = {
+            "bytes": self._bytes,
+            "done_s": self.done_s,
+            "language": self.language,
+            "last_text": self._last_text,
+            "complete": self.complete,
+        }
+        tmp = self.ckpt.with_name(f".{self.ckpt.name}.tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp, self.ckpt)
+
+    def add(self, start_s: float, end_s: float, text: str) -> bool:
+        text = (text or "").strip()
+        if not text or self._f is None:
+            return False
+        if self._seam is not None and start_s < self._seam + RESUME_OVERLAP_S:
+            # Decoding restarted before the checkpoint: skip what the part already has.
+            if (start_s + end_s) / 2.0 <= self._seam or _norm_text(text) == _norm_text(self._last_text):
+                return False
+        data = vtt_cue(start_s, end_s, text).encode("utf-8")
+        self._f.write(data)
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._bytes += len(data)
+        self.done_s = end_s
+        self._last_text = text
+        self._checkpoint()
+        return True
+
+    def finish(self) -> None:
+        self.close()
+        self.complete = True
+        self._checkpoint()
+
+    def close(self) -> None:
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+
+def part_path(out_vtt: Path, chunk: int, n_chunks: int) -> Path:
+    suffix = ".part" if n_chunks == 1 else f".{chunk:03d}.part"
+    return out_vtt.with_name(out_vtt.name + suffix)
+
+
+def plan_path(out_vtt: Path) -> Path:
+    return out_vtt.with_name(out_vtt.name + ".plan.json")
+
+
+def split_on_silences(
+    speech: List[Dict[str, int]],
+    duration_s: float,
+    chunk_s: float,
+    *,
+    sr: int = SR,
+) -> List[Tuple[float, Optional[float]]]:
+    """
+    Cut roughly every `chunk_s` seconds, at the middle of the silence (gap between VAD
+    speech regions) closest to each target; falls back to a hard cut when a long stretch
+    has no gap at all. The last chunk is open-ended.
+    """
+    gaps: List[float] = []
+    prev_end = 0.0
+    for seg in speech:
+        start, end = seg["start"] / sr, seg["end"] / sr
+        if start > prev_end:
+            gaps.append((prev_end + start) / 2.0)
+        prev_end = max(prev_end, end)
+
+    cuts: List[float] = []
+    last = 0.0
+    while duration_s - last > chunk_s * 1.5:
+        target = last + chunk_s
+        lo, hi = last + chunk_s / 2.0, last + chunk_s * 1.5
+        near = [g for g in gaps if lo <= g <= hi]
+        cut = min(near, key=lambda g: abs(g - target)) if near else target
+        cuts.append(cut)
+        last = cut
+    bounds = [0.0] + cuts
+    return [(a, b) for a, b in zip(bounds, cuts + [None])]  # type: ignore[list-item]
+
+
+def load_plan(out_vtt: Path) -> Optional[List[Tuple[float, Optional[float]]]]:
+    try:
+        data = json.loads(plan_path(out_vtt).read_text(encoding="utf-8"))
+        return [(float(a), None if b is None else float(b)) for a, b in data["chunks"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def plan_chunks(
+    audio_path: Path,
+    out_vtt: Path,
+    split_s: float,
+    *,
+    resume: bool,
+    pcm_dir: Path,
+) -> List[Tuple[float, Optional[float]]]:
+    """
+    Chunk boundaries for one source. A plan is kept next to the part files so a resumed
+    run maps checkpoints to the same chunks.
+    """
+    if resume:
+        plan = load_plan(out_vtt)
+        if plan:
+            return plan
+    plan = [(0.0, None)]
+    if split_s > 0:
+        from faster_whisper.vad import get_speech_timestamps  # type: ignore
+
+        from _core.pcm import load_pcm
+
+        audio = load_pcm(audio_path, pcm_dir)
+        if len(audio) / SR > split_s * 1.5:
+            plan = split_on_silences(get_speech_timestamps(audio, sampling_rate=SR), len(audio) / SR, split_s)
+    plan_path(out_vtt).write_text(json.dumps({"chunks": plan}), encoding="utf-8")
+    return plan
+
+
+def assemble_parts(out_vtt: Path, n_chunks: int) -> None:
+    """
+    Concatenate finished chunk parts into the final transcript and drop the partial files.
+    """
+    parts = [part_path(out_vtt, k, n_chunks) for k in range(n_chunks)]
+    cues: List[str] = []
+    for p in parts:
+        body = p.read_text(encoding="utf-8")
+        if body.startswith("WEBVTT"):
+            body = body[len("WEBVTT") :]
+        if body.strip():
+            cues.append(body.strip())
+    tmp = out_vtt.with_name(f".{out_vtt.name}.tmp")
+    tmp.write_text("\n\n".join(["WEBVTT"] + cues) + "\n", encoding="utf-8")
+    os.replace(tmp, out_vtt)
+    for p in parts:
+        p.unlink(missing_ok=True)
+        p.with_name(p.name + ".json").unlink(missing_ok=True)
+    plan_path(out_vtt).unlink(missing_ok=True)
 
 
 def download_audio(
@@ -224,6 +421,204 @@ def find_existing_media(media_dir: Path, source_id: str) -> Optional[Path]:
     return cands[0] if cands else None
 
 
+@dataclass
+class AsrJob:
+    sid: str
+    row: Dict[str, str]  # index row being updated
+    out_vtt: Path
+    audio_path: Optional[Path] = None
+    downloaded_tmp: Optional[Path] = None  # fresh download in _tmp_audio (not yet retained)
+    ok: bool = True
+    chunks: List[Tuple[float, Optional[float]]] = field(default_factory=lambda: [(0.0, None)])
+    pending: int = 0  # chunks still transcribing
+    languages: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+
+def retain_audio(job: AsrJob, media_dir: Path) -> None:
+    """
+    Move a fresh download into the media dir for QA and record it on the row.
+    """
+    if job.downloaded_tmp is None:
+        return
+    dest = media_dir / f"{job.sid}{job.downloaded_tmp.suffix}"
+    try:
+        job.downloaded_tmp.replace(dest)
+        job.row.update(
+            {
+                "media_kind": "audio",
+                "media_path": str(dest.relative_to(ROOT)),
+                "media_status": "ok",
+                "media_error": "",
+            }
+        )
+    except Exception as exc:
+        eprint(f"failed to store audio for QA: {job.sid}: {exc}")
+        job.row.update(
+            {
+                "media_kind": "audio",
+                "media_status": "error",
+                "media_error": f"failed to store audio: {exc}",
+            }
+        )
+
+
+def fetch_audio(job: AsrJob, media_dir: Path, tmp_dir: Path, *, timeout_s: int, max_attempts: int) -> None:
+    """
+    Point the job at retained media, or download it; failures are recorded on the row.
+    """
+    prev = job.row
+    existing = find_existing_media(media_dir, job.sid)
+    if existing is not None:
+        job.audio_path = existing
+        prev.update(
+            {
+                "media_kind": "audio",
+                "media_path": str(existing.relative_to(ROOT)),
+                "media_status": "ok",
+                "media_error": "",
+                "qa_status": prev.get("qa_status") or "pending",
+            }
+        )
+        return
+
+    eprint(f"download audio: {job.sid}")
+    downloaded, err = download_audio(prev.get("url", ""), job.sid, tmp_dir, timeout_s=timeout_s, max_attempts=max_attempts)
+    if downloaded is None:
+        eprint(f"audio download failed: {job.sid}: {err}")
+        prev.update(
+            {
+                "media_kind": "audio",
+                "media_path": prev.get("media_path", ""),
+                "media_status": "error",
+                "media_error": err or "audio download failed",
+                "qa_status": prev.get("qa_status") or "pending",
+            }
+        )
+        job.ok = False
+        return
+    job.audio_path = job.downloaded_tmp = downloaded
+
+
+def download_stage(jobs: List[AsrJob], out: "queue.Queue[Optional[AsrJob]]", media_dir: Path, tmp_dir: Path, args: argparse.Namespace) -> None:
+    # Runs ahead of transcription; the bounded queue caps how many downloads wait on disk.
+    try:
+        for job in jobs:
+            try:
+                fetch_audio(job, media_dir, tmp_dir, timeout_s=args.download_timeout, max_attempts=args.download_attempts)
+            except Exception as exc:  # noqa: BLE001 - tool script
+                job.ok = False
+                job.row.update({"media_status": "error", "media_error": f"audio download failed: {exc}"})
+            if job.ok and not args.download_only and job.audio_path is not None:
+                try:
+                    job.chunks = plan_chunks(
+                        job.audio_path,
+                        job.out_vtt,
+                        args.split_minutes * 60.0,
+                        resume=not args.no_resume,
+                        pcm_dir=PCM_DIR,
+                    )
+                except Exception as exc:  # noqa: BLE001 - tool script
+                    eprint(f"chunk planning failed, transcribing whole file: {job.sid}: {exc}")
+            out.put(job)
+    finally:
+        out.put(None)
+
+
+_WORKER_MODEL = None
+
+
+def init_asr_worker(model_name: str, device: str, compute_type: str, cpu_threads: int) -> None:
+    """
+    Load one WhisperModel per worker (process, or the in-process thread when --workers 1).
+    """
+    global _WORKER_MODEL
+    # Import lazily so download-only mode doesn't require faster-whisper installed.
+    from faster_whisper import WhisperModel  # type: ignore
+
+    _WORKER_MODEL = WhisperModel(model_name, device=device, compute_type=compute_type, cpu_threads=cpu_threads)
+
+
+def transcribe_chunk(
+    audio_path: str,
+    part: str,
+    language: Optional[str],
+    start_s: float,
+    end_s: Optional[float],
+    resume: bool,
+    pcm_dir: str,
+) -> str:
+    """
+    Transcribe [start_s, end_s) of one file into its part file in a worker; returns the
+    detected language. Resumes from the part's checkpoint when there is one.
+    """
+    assert _WORKER_MODEL is not None
+    writer = PartWriter(Path(part), resume=resume)
+    try:
+        if writer.complete:
+            return writer.language
+        decode_from = start_s if writer.done_s is None else max(start_s, writer.done_s - RESUME_OVERLAP_S)
+        from _core.pcm import load_pcm
+
+        # Decoded once into the PCM cache; chunks and resumed runs slice the memory map.
+        pcm = load_pcm(Path(audio_path), Path(pcm_dir))
+        audio = pcm[int(decode_from * SR) : None if end_s is None else int(end_s * SR)]
+        segments, info = _WORKER_MODEL.transcribe(audio, language=writer.language or language, vad_filter=True)
+        writer.language = writer.language or str(getattr(info, "language", "") or "")
+        for seg in segments:
+            writer.add(seg.start + decode_from, seg.end + decode_from, seg.text)
+        writer.finish()
+        return writer.language
+    finally:
+        writer.close()
+
+
+def finish_transcription(job: AsrJob, *, detected_lang: str, error: str, args: argparse.Namespace, media_dir: Path) -> None:
+    prev = job.row
+    lang_arg = None if args.language.lower() == "auto" else args.language
+    try:
+        if error:
+            eprint(f"transcription failed: {job.sid}: {error}")
+            prev.update({"status": "error", "error": f"asr failed: {error}", "updated_at": now_iso()})
+            if not args.delete_audio:
+                retain_audio(job, media_dir)
+            return
+
+        selected_lang = detected_lang or ("" if lang_arg is None else args.language)
+        preferred = "en" if selected_lang.startswith("en") else ("de" if selected_lang.startswith("de") else "other")
+        prev.update(
+            {
+                "preferred_lang": preferred,
+                "selected_lang": selected_lang,
+                "selected_kind": "asr",
+                "transcript_path": str(job.out_vtt.relative_to(ROOT)),
+                "media_kind": "audio",
+                "media_status": "missing" if args.delete_audio else (prev.get("media_status") or "ok"),
+                "media_error": "" if not args.delete_audio else (prev.get("media_error") or ""),
+                "qa_status": prev.get("qa_status") or "pending",
+                "status": "ok",
+                "error": "",
+                "updated_at": now_iso(),
+            }
+        )
+        if not args.delete_audio:
+            retain_audio(job, media_dir)
+        eprint(f"ok: {job.sid} -> {job.out_vtt}")
+    finally:
+        if args.delete_audio and job.downloaded_tmp is not None:
+            # The decoded copy is several times the size of the audio; it goes with it.
+            try:
+                from _core.pcm import drop_pcm
+
+                drop_pcm(job.downloaded_tmp, PCM_DIR)
+            except Exception:
+                pass
+            try:
+                job.downloaded_tmp.unlink()
+            except Exception:
+                pass
+
+
 def main(argv: Optional[List[str]] = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--source-id", action="append", required=True, help="Repeatable source id (e.g. yt_XXXX)")
@@ -237,6 +632,16 @@ def main(argv: Optional[List[str]] = None) -> int:
     ap.add_argument("--media-dir", default=str(TRANSCRIPTS_DIR / "_media"), help="Where to keep audio for QA")
     ap.add_argument("--delete-audio", action="store_true", help="Delete audio after ASR (overrides default retention)")
     ap.add_argument("--force", action="store_true", help="Overwrite existing ASR transcript output if present")
+    ap.add_argument("--workers", type=int, default=1, help="Transcription worker processes, each with its own model")
+    ap.add_argument("--cpu-threads", type=int, default=0, help="CPU threads per worker (0 = cores / workers)")
+    ap.add_argument("--prefetch", type=int, default=2, help="Max downloaded sources waiting for a transcription worker")
+    ap.add_argument(
+        "--split-minutes",
+        type=float,
+        default=0.0,
+        help="Split audio longer than this on VAD silences into chunks transcribed in parallel (0 = off)",
+    )
+    ap.add_argument("--no-resume", action="store_true", help="Discard ASR checkpoints (.part files) and start over")
     args = ap.parse_args(argv)
 
     sources = read_sources(SOURCES_CSV)
@@ -246,209 +651,137 @@ def main(argv: Optional[List[str]] = None) -> int:
         # Allow ASR-only workflows to bootstrap the local index.
         write_index(INDEX_CSV, fieldnames, index)
 
-    media_dir = Path(args.media_dir)
-    media_dir.mkdir(parents=True, exist_ok=True)
-
-    model = None
     if not args.download_only:
-        # Import lazily so download-only mode doesn't require faster-whisper installed.
-        from faster_whisper import WhisperModel  # type: ignore
-
-        model = WhisperModel(args.model, device=args.device, compute_type=args.compute_type)
+        # Fail fast here rather than in every worker's initializer.
+        import faster_whisper  # type: ignore  # noqa: F401
 
+    media_dir = Path(args.media_dir)
+    media_dir.mkdir(parents=True, exist_ok=True)
     tmp_dir = TRANSCRIPTS_DIR / "_tmp_audio"
-    for sid in args.source_id:
-        row = sources.get(sid)
-        if not row:
-            eprint(f"unknown source_id: {sid}")
-            continue
-        kind = row.get("kind")
-        if kind not in {"youtube", "ccc"}:
-            eprint(f"unsupported kind for ASR (currently youtube+ccc only): {sid} kind={kind}")
-            continue
 
-        url = row.get("url", "")
-        if not url:
-            eprint(f"missing url for {sid}")
-            continue
+    # The main thread is the only index writer; rows are journaled and compacted into the CSV.
+    journal = IndexJournal(INDEX_JOURNAL, index, lambda idx: write_index(INDEX_CSV, fieldnames, idx), compact_every=10)
+    journal.replay()
 
-        prev = index.get(sid, {})
-        prev.update(
-            {
-                "source_id": sid,
-                "kind": kind or "youtube",
-                "url": url,
-                "published_date": row.get("published_date", ""),
-                "updated_at": now_iso(),
-            }
-        )
+    jobs: List[AsrJob] = []
+    with journal:
+        for sid in args.source_id:
+            row = sources.get(sid)
+            if not row:
+                eprint(f"unknown source_id: {sid}")
+                continue
+            kind = row.get("kind")
+            if kind not in {"youtube", "ccc"}:
+                eprint(f"unsupported kind for ASR (currently youtube+ccc only): {sid} kind={kind}")
+                continue
 
-        # In download-only mode we want to keep the audio even if a transcript already exists.
-        # In ASR mode we skip early if we already have a transcript and we're not forcing.
-        out_vtt = TRANSCRIPTS_DIR / f"{sid}.{args.language}.asr.vtt"
-        if not args.download_only and out_vtt.exists() and not args.force:
-            eprint(f"skip (exists): {out_vtt}")
-            index[sid] = prev
-            write_index(INDEX_CSV, fieldnames, index)
-            continue
+            url = row.get("url", "")
+            if not url:
+                eprint(f"missing url for {sid}")
+                continue
 
-        existing = find_existing_media(media_dir, sid)
-        downloaded_tmp: Optional[Path] = None
-        audio_path: Optional[Path] = None
-        if existing is not None:
-            audio_path = existing
+            prev = dict(index.get(sid, {}))
             prev.update(
                 {
-                    "media_kind": "audio",
-                    "media_path": str(existing.relative_to(ROOT)),
-                    "media_status": "ok",
-                    "media_error": "",
-                    "qa_status": prev.get("qa_status") or "pending",
+                    "source_id": sid,
+                    "kind": kind or "youtube",
+                    "url": url,
+                    "published_date": row.get("published_date", ""),
+                    "updated_at": now_iso(),
                 }
             )
-            index[sid] = prev
-            write_index(INDEX_CSV, fieldnames, index)
-        else:
-            eprint(f"download audio: {sid}")
-            downloaded_tmp, err = download_audio(
-                url,
-                sid,
-                tmp_dir,
-                timeout_s=args.download_timeout,
-                max_attempts=args.download_attempts,
-            )
-            if downloaded_tmp is None:
-                eprint(f"audio download failed: {sid}: {err}")
-                prev.update(
-                    {
-                        "media_kind": "audio",
-                        "media_path": prev.get("media_path", ""),
-                        "media_status": "error",
-                        "media_error": err or "audio download failed",
-                        "qa_status": prev.get("qa_status") or "pending",
-                    }
-                )
-                index[sid] = prev
-                write_index(INDEX_CSV, fieldnames, index)
-                continue
-            audio_path = downloaded_tmp
 
-        if args.download_only:
-            if downloaded_tmp is None:
-                eprint(f"skip (already have audio): {sid}")
+            # In download-only mode we want to keep the audio even if a transcript already exists.
+            # In ASR mode we skip early if we already have a transcript and we're not forcing.
+            out_vtt = TRANSCRIPTS_DIR / f"{sid}.{args.language}.asr.vtt"
+            if not args.download_only and out_vtt.exists() and not args.force:
+                eprint(f"skip (exists): {out_vtt}")
+                journal.record(prev)
                 continue
-            dest = media_dir / f"{sid}{downloaded_tmp.suffix}"
-            try:
-                downloaded_tmp.replace(dest)
-                prev.update(
-                    {
-                        "media_kind": "audio",
-                        "media_path": str(dest.relative_to(ROOT)),
-                        "media_status": "ok",
-                        "media_error": "",
-                        "qa_status": prev.get("qa_status") or "pending",
-                    }
-                )
-                index[sid] = prev
-                write_index(INDEX_CSV, fieldnames, index)
-                eprint(f"ok: {sid} -> {dest}")
-            except Exception as exc:
-                eprint(f"failed to store audio for QA: {sid}: {exc}")
-                prev.update(
-                    {
-                        "media_kind": "audio",
-                        "media_path": "",
-                        "media_status": "error",
-                        "media_error": f"failed to store audio: {exc}",
-                        "qa_status": prev.get("qa_status") or "pending",
-                    }
-                )
-                index[sid] = prev
-                write_index(INDEX_CSV, fieldnames, index)
-            continue
+            jobs.append(AsrJob(sid, prev, out_vtt))
 
-        try:
-            lang_arg = None if args.language.lower() == "auto" else args.language
-            assert audio_path is not None
-            assert model is not None
-            eprint(f"transcribe: {sid} ({audio_path.name})")
-            segments, info = model.transcribe(
-                str(audio_path),
-                language=lang_arg,
-                vad_filter=True,
-            )
-            write_vtt(out_vtt, segments)
-        except Exception as exc:  # noqa: BLE001 - tool script
-            eprint(f"transcription failed: {sid}: {exc}")
-            prev.update(
-                {
-                    "status": "error",
-                    "error": f"asr failed: {exc}",
-                    "updated_at": now_iso(),
-                }
+        ready: "queue.Queue[Optional[AsrJob]]" = queue.Queue(maxsize=max(1, args.prefetch))
+        downloader = threading.Thread(target=download_stage, args=(jobs, ready, media_dir, tmp_dir, args), daemon=True)
+        downloader.start()
+
+        if args.download_only:
+            while (job := ready.get()) is not None:
+                if job.ok:
+                    if job.downloaded_tmp is None:
+                        eprint(f"skip (already have audio): {job.sid}")
+                        continue
+                    retain_audio(job, media_dir)
+                    eprint(f"ok: {job.sid} -> {job.row.get('media_path', '')}")
+                journal.record(job.row)
+            return 0
+
+        workers = max(1, args.workers)
+        cpu_threads = args.cpu_threads or max(1, (os.cpu_count() or 1) // workers)
+        init_args = (args.model, args.device, args.compute_type, cpu_threads)
+        if workers == 1:
+            pool: Executor = ThreadPoolExecutor(max_workers=1, initializer=init_asr_worker, initargs=init_args)
+        else:
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_asr_worker,
+                initargs=init_args,
             )
-            if downloaded_tmp is not None and not args.delete_audio:
-                dest = media_dir / f"{sid}{downloaded_tmp.suffix}"
+        lang_arg = None if args.language.lower() == "auto" else args.language
+
+        inflight: Dict[Future, Tuple[AsrJob, int]] = {}
+
+        def collect(timeout: Optional[float]) -> None:
+            done, _ = wait(list(inflight), timeout=timeout, return_when=FIRST_COMPLETED)
+            for fut in done:
+                job, k = inflight.pop(fut)
+                job.pending -= 1
                 try:
-                    downloaded_tmp.replace(dest)
-                    prev.update(
-                        {
-                            "media_kind": "audio",
-                            "media_path": str(dest.relative_to(ROOT)),
-                            "media_status": "ok",
-                            "media_error": "",
-                        }
-                    )
-                except Exception as exc2:
-                    prev.update(
-                        {
-                            "media_status": "error",
-                            "media_error": f"failed to store audio: {exc2}",
-                        }
-                    )
-            index[sid] = prev
-            write_index(INDEX_CSV, fieldnames, index)
-            continue
-        finally:
-            if args.delete_audio and downloaded_tmp is not None:
+                    job.languages.append(fut.result())
+                except Exception as exc:  # noqa: BLE001 - tool script
+                    job.errors.append(f"chunk {k}: {exc or type(exc).__name__}" if len(job.chunks) > 1 else str(exc) or type(exc).__name__)
+                if job.pending:
+                    continue
+                # Part files of failed chunks stay behind as checkpoints for the next run.
+                error = "; ".join(job.errors)
+                if not error:
+                    try:
+                        assemble_parts(job.out_vtt, len(job.chunks))
+                    except OSError as exc:
+                        error = f"failed to assemble transcript: {exc}"
+                detected = max(set(job.languages), key=job.languages.count) if job.languages else ""
+                finish_transcription(job, detected_lang=detected, error=error, args=args, media_dir=media_dir)
+                journal.record(job.row)
+
+        with pool:
+            downloads_done = False
+            while not downloads_done or inflight:
+                if downloads_done or len(inflight) >= workers:
+                    collect(None)
+                    continue
                 try:
-                    downloaded_tmp.unlink()
-                except Exception:
-                    pass
-
-        # Update local transcript index.
-        detected_lang = info.language if hasattr(info, "language") else ""
-        selected_lang = detected_lang or ("" if lang_arg is None else args.language)
-        preferred = "en" if selected_lang.startswith("en") else ("de" if selected_lang.startswith("de") else "other")
-        prev.update(
-            {
-                "preferred_lang": preferred,
-                "selected_lang": selected_lang,
-                "selected_kind": "asr",
-                "transcript_path": str(out_vtt.relative_to(ROOT)),
-                "media_kind": "audio",
-                "media_status": "missing" if args.delete_audio else (prev.get("media_status") or "ok"),
-                "media_error": "" if not args.delete_audio else (prev.get("media_error") or ""),
-                "qa_status": prev.get("qa_status") or "pending",
-                "status": "ok",
-                "error": "",
-                "updated_at": now_iso(),
-            }
-        )
-        if downloaded_tmp is not None and not args.delete_audio:
-            dest = media_dir / f"{sid}{downloaded_tmp.suffix}"
-            try:
-                downloaded_tmp.replace(dest)
-                prev["media_path"] = str(dest.relative_to(ROOT))
-                prev["media_status"] = "ok"
-                prev["media_error"] = ""
-            except Exception as exc:
-                prev["media_status"] = "error"
-                prev["media_error"] = f"failed to store audio: {exc}"
-
-        index[sid] = prev
-        write_index(INDEX_CSV, fieldnames, index)
-        eprint(f"ok: {sid} -> {out_vtt}")
+                    job = ready.get(timeout=0.5 if inflight else None)
+                except queue.Empty:
+                    collect(0)
+                    continue
+                if job is None:
+                    downloads_done = True
+                    continue
+                if not job.ok:
+                    journal.record(job.row)
+                    continue
+                # Record the media state before the (long) transcription.
+                journal.record(dict(job.row))
+                assert job.audio_path is not None
+                n = len(job.chunks)
+                eprint(f"transcribe: {job.sid} ({job.audio_path.name})" + (f" in {n} chunks" if n > 1 else ""))
+                job.pending = n
+                for k, (start_s, end_s) in enumerate(job.chunks):
+                    part = str(part_path(job.out_vtt, k, n))
+                    fut = pool.submit(
+                        transcribe_chunk, str(job.audio_path), part, lang_arg, start_s, end_s, not args.no_resume, str(PCM_DIR)
+                    )
+                    inflight[fut] = (job, k)
 
     return 0
 
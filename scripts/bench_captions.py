@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark `_core.captions` against the per-script caption parsers it replaced.
+
+Local-only: reads the transcripts listed in transcripts/_index.csv (or --paths).
+The legacy parsers no longer live in the tree, so they are loaded from a git
+revision that still has them (e.g. the commit before the migration):
+
+  python3 scripts/bench_captions.py --legacy-rev <rev>
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import subprocess
+import sys
+import time
+import types
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from _core.captions import CAPTION_SUFFIXES, iter_cues
+
+
+ROOT = Path(__file__).resolve().parents[1]
+INDEX_CSV = ROOT / "transcripts" / "_index.csv"
+LEGACY_SCRIPTS = ("search_transcripts", "show_transcript_snippet", "build_source_notes")
+
+
+def transcript_paths(index_path: Path) -> List[Path]:
+    if not index_path.exists():
+        return []
+    out: List[Path] = []
+    with index_path.open("r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            rel = (row.get("transcript_path") or "").strip()
+            if row.get("status") != "ok" or not rel:
+                continue
+            p = ROOT / rel
+            if p.exists() and p.suffix.lower() in CAPTION_SUFFIXES:
+                out.append(p)
+    return out
+
+
+def load_legacy_module(rev: str, name: str) -> types.ModuleType:
+    cp = subprocess.run(
+        ["git", "show", f"{rev}:scripts/{name}.py"],
+        cwd=str(ROOT),
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if cp.returncode != 0:
+        raise SystemExit(f"cannot load scripts/{name}.py at {rev}: {cp.stderr.strip()}")
+    mod = types.ModuleType(f"legacy_{name}")
+    mod.__file__ = str(ROOT / "scripts" / f"{name}.py")
+    sys.modules[mod.__name__] = mod  # dataclasses resolve annotations via sys.modules
+    exec(compile(cp.stdout, f"{rev}:scripts/{name}.py", "exec"), mod.__dict__)
+    return mod
+
+
+def legacy_parser(mod: types.ModuleType) -> Callable[[Path], Iterable[object]]:
+    # search_transcripts yielded raw start strings and parsed them per cue in main();
+    # include that so every parser is measured producing float start times.
+    parse_start = getattr(mod, "parse_timecode_start", None)
+    if parse_start is None:
+        return mod.iter_segments
+
+    def run(path: Path) -> Iterable[object]:
+        for tc, text in mod.iter_segments(path):
+            yield parse_start(tc), text
+
+    return run
+
+
+def time_parser(fn: Callable[[Path], Iterable[object]], paths: List[Path], *, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    cues = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        cues = 0
+        for p in paths:
+            for _cue in fn(p):
+                cues += 1
+        best = min(best, time.perf_counter() - t0)
+    return best, cues
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--index", default=str(INDEX_CSV), help="Path to transcripts/_index.csv")
+    ap.add_argument("--paths", nargs="*", default=None, help="Transcript files to use instead of the index")
+    ap.add_argument("--legacy-rev", default="", help="Git revision with the pre-_core.captions parsers")
+    ap.add_argument("--repeat", type=int, default=3, help="Timing rounds; the best round is reported (default: 3)")
+    args = ap.parse_args(argv)
+
+    paths = [Path(p) for p in args.paths] if args.paths else transcript_paths(Path(args.index))
+    if not paths:
+        print("no transcripts found (fetch some, or pass --paths)", file=sys.stderr)
+        return 2
+    total_mb = sum(p.stat().st_size for p in paths) / 1e6
+
+    parsers: Dict[str, Callable[[Path], Iterable[object]]] = {"_core.captions": iter_cues}
+    if args.legacy_rev:
+        for name in LEGACY_SCRIPTS:
+            parsers[name] = legacy_parser(load_legacy_module(args.legacy_rev, name))
+
+    print("bench_captions")
+    print(f"  files: {len(paths)} ({total_mb:.1f} MB)")
+    base_s: Optional[float] = None
+    for label, fn in parsers.items():
+        secs, cues = time_parser(fn, paths, repeat=args.repeat)
+        base_s = secs if base_s is None else base_s
+        rel = f"  ({secs / base_s:.2f}x)" if base_s else ""
+        print(f"  {label:24} {secs:8.3f}s  {cues:9d} cues  {total_mb / secs if secs else 0:7.1f} MB/s{rel}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark diarize_bach chunk features: per-chunk `logmel_mean` calls vs whole-file `logmel_means`.
+
+By default runs on a synthetic 2-hour recording (noise with speech-like regions of
+2-40 s separated by short pauses). Pass `--media` to use a real file from
+transcripts/_media (decoded via the PCM cache, regions from the Silero VAD).
+Reports timings, the largest feature difference and whether k-means labels agree.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+import diarize_bach as d
+
+
+def synthetic(minutes: float, seed: int = 0) -> Tuple[np.ndarray, List[Dict[str, int]]]:
+    rng = np.random.default_rng(seed)
+    n = int(minutes * 60 * d.SR)
+    y = (rng.standard_normal(n) * 0.05).astype(np.float32)
+    speech: List[Dict[str, int]] = []
+    t = int(rng.integers(0, d.SR))
+    while t < n:
+        seg = int(rng.uniform(2.0, 40.0) * d.SR)
+        end = min(n, t + seg)
+        tone = np.sin(np.arange(end - t, dtype=np.float32) * (2 * np.pi * rng.uniform(90, 240) / d.SR))
+        y[t:end] += 0.3 * tone
+        speech.append({"start": t, "end": end})
+        t = end + int(rng.uniform(0.2, 2.0) * d.SR)
+    return y, speech
+
+
+def per_chunk(y: np.ndarray, spans: List[Tuple[int, int]]) -> List[Optional[np.ndarray]]:
+    return [d.logmel_mean(y[a0:a1]) for a0, a1 in spans]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--media", default="", help="Audio file to use instead of synthetic audio")
+    ap.add_argument("--minutes", type=float, default=120.0, help="Length of the synthetic recording (default: 120)")
+    ap.add_argument("--chunk-seconds", type=float, default=8.0)
+    ap.add_argument("--min-chunk-seconds", type=float, default=2.0)
+    ap.add_argument("--repeat", type=int, default=3, help="Timing rounds; the best round is reported (default: 3)")
+    args = ap.parse_args(argv)
+
+    if args.media:
+        from faster_whisper import vad as fw_vad  # type: ignore
+
+        y = d.load_pcm(Path(args.media), d.PCM_DIR, sampling_rate=d.SR)
+        speech = fw_vad.get_speech_timestamps(y, sampling_rate=d.SR)
+    else:
+        y, speech = synthetic(args.minutes)
+    chunks = d.speech_chunks(speech, args.chunk_seconds, args.min_chunk_seconds)
+    spans = [(int(t * d.SR), int(t2 * d.SR)) for t, t2 in chunks]
+
+    timings: Dict[str, float] = {}
+    results: Dict[str, List[Optional[np.ndarray]]] = {}
+    for label, fn in (("per-chunk", per_chunk), ("whole-file", d.logmel_means)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            results[label] = fn(y, spans)
+            best = min(best, time.perf_counter() - t0)
+        timings[label] = best
+
+    old = np.stack([f for f in results["per-chunk"] if f is not None])
+    new = np.stack([f for f in results["whole-file"] if f is not None])
+    labels = []
+    for x in (old, new):
+        xz = (x - x.mean(axis=0)) / (x.std(axis=0) + 1e-6)
+        labels.append(d.kmeans(xz, k=2, seed=0).labels)
+
+    print("bench_diarize_features")
+    print(f"  audio: {len(y) / d.SR / 60:.1f} min, {len(speech)} speech regions, {len(spans)} chunks")
+    for label, secs in timings.items():
+        print(f"  {label:12} {secs:8.3f}s")
+    print(f"  speedup: {timings['per-chunk'] / timings['whole-file']:.2f}x")
+    print(f"  max |feature diff|: {float(np.abs(old - new).max()):.2e}")
+    same = old.shape == new.shape and bool(np.array_equal(labels[0], labels[1]))
+    print(f"  k-means labels identical: {same}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
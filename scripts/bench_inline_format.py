@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-line cost of build_site.inline_format on the reader page.
+
+Compares the guarded passes (precompiled, skipped when their trigger text is absent)
+with the original formatter (`inline_format_reference`, kept as the golden reference in
+tests/test_inline_format.py) over every inline string the V1 reader renders (headings,
+paragraphs, list items, blockquote lines), and checks they agree.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import Callable, List, Optional
+
+import build_site
+
+sys.path.insert(0, str(build_site.ROOT / "tests"))
+from test_inline_format import inline_format_reference  # noqa: E402
+
+
+def reader_inline_strings() -> List[str]:
+    md = "\n\n---\n\n".join(
+        p.read_text(encoding="utf-8", errors="replace").rstrip() for p in sorted(build_site.CHAPTERS_DIR.glob("ch*.md"))
+    )
+    out: List[str] = []
+    for b in build_site.parse_blocks(md):
+        if b.kind in {"heading", "para"}:
+            out.append(b.text)
+        elif b.kind == "blockquote":
+            out.extend(b.text.split("\n"))
+        elif b.kind == "list":
+            for it in b.items or []:
+                out.extend(it.split("\n"))
+    return [s for s in out if s]
+
+
+def per_line_us(fn: Callable[..., str], lines: List[str], *, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for s in lines:
+            fn(s, root="../")
+        best = min(best, time.perf_counter() - t0)
+    return best / max(1, len(lines)) * 1e6
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5, help="Timing rounds; the best round is reported (default: 5).")
+    args = ap.parse_args(argv)
+
+    lines = reader_inline_strings()
+    mismatches = sum(
+        1 for s in lines if build_site.inline_format(s, root="../") != inline_format_reference(s, root="../")
+    )
+    old_us = per_line_us(inline_format_reference, lines, repeat=args.repeat)
+    new_us = per_line_us(build_site.inline_format, lines, repeat=args.repeat)
+
+    print("bench_inline_format (reader page)")
+    print(f"  lines: {len(lines)}")
+    print(f"  mismatches: {mismatches}")
+    print(f"  reference:   {old_us:8.2f} us/line")
+    print(f"  guarded:     {new_us:8.2f} us/line")
+    print(f"  speedup: {old_us / new_us:.2f}x" if new_us else "  speedup: n/a")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Benchmark build_source_notes against the original implementation, over every source
+with a transcript: whole notes (per-keyword substring scans twice per segment + full-sort
+selection vs one `KeywordMatcher` scan + heap selection), and `top_segments` alone
+(reference vs heap vs numpy ranking).
+
+The original implementations live here (`keyword_hits_reference`, `top_segments_reference`,
+`build_note_reference`) and double as the golden references for tests/test_build_source_notes.py.
+
+Local-only: reads the transcripts listed in transcripts/_index.csv. Without any, or with
+`--synthetic N`, runs on N synthetic cue texts instead. Checks the notes are identical.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+import build_source_notes as bsn
+
+
+Segments = List[Tuple[float, float, str]]
+
+FILLER = (
+    "so the thing is that we basically have a way of looking at how our mind works and why it does that "
+    "i think you know when people talk about this they often mean something else entirely because there "
+    "is no simple answer here but if we look at it from the outside we see a system that tries to make sense"
+).split()
+KEYWORD_RATE = 0.04  # share of synthetic words that are keywords (transcripts are mostly filler)
+
+
+def keyword_hits_reference(text: str, keywords: List[str]) -> List[str]:
+    """
+    The original `keyword_hits`: one substring search per keyword.
+    """
+    t = text.lower()
+    hits = []
+    for kw in keywords:
+        if kw in t:
+            hits.append(kw)
+    return hits
+
+
+def top_segments_reference(
+    segments: Segments,
+    segment_hits: List[List[str]],
+    max_segments: int,
+    min_gap_s: int,
+) -> List[Tuple[float, float, List[str]]]:
+    """
+    The original `top_segments`: full sort, then a gap check against every picked segment.
+    """
+    scored: List[Tuple[int, float, float, List[str]]] = []
+    for (start, end, _text), hits in zip(segments, segment_hits, strict=True):
+        if not hits:
+            continue
+        score = sum(max(1, len(h.split())) for h in hits)
+        scored.append((score, start, end, hits))
+    scored.sort(key=lambda x: (-x[0], x[1]))
+
+    picked: List[Tuple[float, float, List[str]]] = []
+    for score, start, end, hits in scored:
+        if len(picked) >= max_segments:
+            break
+        if any(abs(start - ps) < min_gap_s for ps, _, _ in picked):
+            continue
+        picked.append((start, end, hits))
+    picked.sort(key=lambda x: x[0])
+    return picked
+
+
+def build_note_reference(
+    source_id: str,
+    meta: Dict[str, str],
+    segments: Segments,
+    keywords: List[str],
+    *,
+    max_segments: int,
+    min_gap_s: int,
+) -> str:
+    """
+    `build_note` as it was before KeywordMatcher and the heap selection: every keyword
+    searched in every segment, once for the dominant terms and again for the segment
+    ranking, then a full sort.
+    """
+    counts: Dict[str, int] = {k: 0 for k in keywords}
+    for _, _, text in segments:
+        for kw in keyword_hits_reference(text, keywords):
+            counts[kw] += 1
+    ranked = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+    dominant = [k for k, v in ranked if v > 0][:8]
+    selected = top_segments_reference(
+        segments, [keyword_hits_reference(text, keywords) for _, _, text in segments], max_segments, min_gap_s
+    )
+    return bsn.render_note(source_id, meta, selected, dominant)
+
+
+def corpus_sources(max_text_chars: int) -> Dict[str, Tuple[Dict[str, str], Segments]]:
+    sources = bsn.load_sources(bsn.SOURCES_CSV) if bsn.SOURCES_CSV.exists() else {}
+    index = bsn.load_index(bsn.INDEX_CSV)
+    out: Dict[str, Tuple[Dict[str, str], Segments]] = {}
+    for sid, meta in sources.items():
+        segments = bsn.load_segments(sid, index.get(sid), max_text_chars=max_text_chars, bach_only=False)
+        if segments:
+            out[sid] = (meta, segments)
+    return out
+
+
+def synthetic_sources(n_cues: int, seed: int = 0) -> Dict[str, Tuple[Dict[str, str], Segments]]:
+    rng = random.Random(seed)
+    segments: Segments = []
+    for i in range(n_cues):
+        words = [rng.choice(bsn.KEYWORDS if rng.random() < KEYWORD_RATE else FILLER) for _ in range(rng.randint(4, 14))]
+        text = " ".join(words)
+        segments.append((i * 3.0, i * 3.0 + 3.0, text.capitalize() if i % 3 else text.upper()))
+    return {"synthetic": ({"title": "Synthetic"}, segments)}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--synthetic", type=int, default=0, help="Use N synthetic cues instead of the transcripts")
+    ap.add_argument("--repeat", type=int, default=3, help="Timing rounds; the best round is reported (default: 3)")
+    ap.add_argument("--max-segments", type=int, default=8)
+    ap.add_argument("--min-gap", type=int, default=60)
+    ap.add_argument("--max-text-chars", type=int, default=500)
+    args = ap.parse_args(argv)
+
+    data = synthetic_sources(args.synthetic) if args.synthetic else corpus_sources(args.max_text_chars)
+    if not data:
+        print("no transcripts found; falling back to --synthetic 200000")
+        data = synthetic_sources(200000)
+    n_segments = sum(len(segs) for _meta, segs in data.values())
+    kw = dict(max_segments=args.max_segments, min_gap_s=args.min_gap)
+
+    def run_reference() -> Dict[str, str]:
+        return {sid: build_note_reference(sid, meta, segs, bsn.KEYWORDS, **kw) for sid, (meta, segs) in data.items()}
+
+    def run_matcher() -> Dict[str, str]:
+        matcher = bsn.KeywordMatcher(bsn.KEYWORDS)  # built once per run, as in main()
+        return {sid: bsn.build_note(sid, meta, segs, matcher, **kw) for sid, (meta, segs) in data.items()}
+
+    timings: Dict[str, float] = {}
+    notes: Dict[str, Dict[str, str]] = {}
+    for label, fn in (("substring x2", run_reference), ("matcher", run_matcher)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            notes[label] = fn()
+            best = min(best, time.perf_counter() - t0)
+        timings[label] = best
+
+    mismatches = sum(1 for sid in data if notes["substring x2"][sid] != notes["matcher"][sid])
+    print("bench_source_notes")
+    print(f"  sources: {len(data)}, segments: {n_segments}, keywords: {len(bsn.KEYWORDS)}")
+    for label, secs in timings.items():
+        print(f"  {label:14} {secs:8.3f}s")
+    print(f"  speedup: {timings['substring x2'] / timings['matcher']:.2f}x")
+    print(f"  notes differing: {mismatches}")
+
+    # Selection only, on precomputed hits.
+    matcher = bsn.KeywordMatcher(bsn.KEYWORDS)
+    hits = {sid: [matcher.hits(t) for _, _, t in segs] for sid, (_meta, segs) in data.items()}
+    threshold = bsn.NUMPY_MIN_SEGMENTS
+    selections: Dict[str, List[object]] = {}
+    print(f"  top_segments (max {args.max_segments}, gap {args.min_gap}s):")
+    for label, fn, numpy_min in (
+        ("reference", top_segments_reference, threshold),
+        ("heap", bsn.top_segments, 1 << 62),
+        ("numpy", bsn.top_segments, 0),
+    ):
+        if label == "numpy" and bsn.np is None:
+            continue
+        bsn.NUMPY_MIN_SEGMENTS = numpy_min
+        best = float("inf")
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            selections[label] = [fn(segs, hits[sid], args.max_segments, args.min_gap) for sid, (_meta, segs) in data.items()]
+            best = min(best, time.perf_counter() - t0)
+        print(f"    {label:12} {best:8.4f}s")
+    bsn.NUMPY_MIN_SEGMENTS = threshold
+    differing = sum(1 for label in selections if selections[label] != selections["reference"])
+    print(f"  selections differing: {differing}")
+    return 1 if mismatches or differing else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
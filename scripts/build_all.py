@@ -5,31 +5,177 @@ One-command build for the public-facing outputs.
 This is intentionally simple and local:
 - no transcripts are emitted
 - outputs go to manuscript/, content/blog/posts/, content/series/chapters/, and dist/ (dist is gitignored)
+
+Steps run in one interpreter: each step's `main()` is imported and called
+directly, and all of them share the parsed corpus cache in `_core.corpus`
+(sources table, chapter texts, parsed blocks). Steps declare the repo paths
+they read and write; a step starts once every earlier step writing one of its
+inputs has finished, so independent steps run concurrently.
 """
 
 from __future__ import annotations
 
-import subprocess
+import argparse
+import importlib
+import inspect
 import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 
 ROOT = Path(__file__).resolve().parents[1]
-PY = sys.executable
 
 
-def run(*args: str) -> None:
-    subprocess.run([PY, *args], cwd=str(ROOT), check=True)
+@dataclass(frozen=True)
+class Step:
+    name: str  # module name under scripts/
+    args: Tuple[str, ...] = ()  # passed to main(argv) when the step takes argv
+    inputs: Tuple[str, ...] = ()  # repo-relative paths (files or directory prefixes)
+    outputs: Tuple[str, ...] = ()
+
+
+STEPS: Tuple[Step, ...] = (
+    Step("build_readme", inputs=("site/home.md",), outputs=("README.md",)),
+    Step("add_bach_anchors", args=(), inputs=("manuscript/chapters", "sources/source_notes"), outputs=("manuscript/chapters",)),
+    Step(
+        "build_references",
+        inputs=("sources/sources.csv", "manuscript/chapters"),
+        outputs=("manuscript/references.md",),
+    ),
+    Step(
+        "build_book_md",
+        inputs=("manuscript/chapters", "manuscript/references.md"),
+        outputs=("manuscript/book.md",),
+    ),
+    Step(
+        "build_book_public_md",
+        inputs=("manuscript/chapters", "manuscript/references.md"),
+        outputs=("manuscript/book_public.md",),
+    ),
+    Step("export_blog_posts", inputs=("manuscript/chapters",), outputs=("content/series/chapters",)),
+    Step(
+        "build_site",
+        args=("--out", str(ROOT / "dist")),  # absolute: steps run in the caller's cwd
+        inputs=(
+            "site",
+            "content/guide",
+            "content/questions",
+            "content/archive",
+            "content/glossary",
+            "content/claims",
+            "notes",
+            "docs",
+            "manuscript/chapters",
+            "sources/sources.csv",
+            "transcripts/_speakers",
+        ),
+        outputs=("dist",),
+    ),
+)
+
+
+def _overlaps(a: str, b: str) -> bool:
+    a = a.rstrip("/")
+    b = b.rstrip("/")
+    return a == b or a.startswith(b + "/") or b.startswith(a + "/")
+
+
+def step_dependencies(steps: Sequence[Step]) -> Dict[str, List[str]]:
+    """
+    A step depends on every earlier step that writes one of its inputs or outputs.
+
+    Declaration order is the tie-breaker, so the serial order of the old
+    subprocess pipeline is preserved wherever two steps touch the same path.
+    """
+    deps: Dict[str, List[str]] = {}
+    for i, step in enumerate(steps):
+        touched = step.inputs + step.outputs
+        deps[step.name] = [
+            prev.name
+            for prev in steps[:i]
+            if any(_overlaps(out, p) for out in prev.outputs for p in touched)
+            or any(_overlaps(inp, out) for inp in prev.inputs for out in step.outputs)
+        ]
+    return deps
+
+
+def step_callable(step: Step) -> Callable[[], int]:
+    mod = importlib.import_module(step.name)
+    takes_argv = bool(inspect.signature(mod.main).parameters)
+
+    def call() -> int:
+        try:
+            rc = mod.main(list(step.args)) if takes_argv else mod.main()
+        except SystemExit as exc:
+            if isinstance(exc.code, str):
+                print(exc.code, file=sys.stderr)
+                return 1
+            rc = exc.code
+        return int(rc or 0)
+
+    return call
+
+
+def run_steps(steps: Sequence[Step], *, jobs: int) -> Dict[str, float]:
+    """
+    Run steps in dependency order (up to `jobs` at a time). Returns wall time per step.
+    Raises SystemExit on the first failing step.
+    """
+    deps = step_dependencies(steps)
+    calls = {s.name: step_callable(s) for s in steps}
+    timings: Dict[str, float] = {}
+    done: set[str] = set()
+    pending = [s.name for s in steps]
+    running: Dict[Future[int], str] = {}
+
+    def timed(name: str) -> int:
+        t0 = time.perf_counter()
+        rc = calls[name]()
+        timings[name] = time.perf_counter() - t0
+        return rc
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while pending or running:
+            for name in list(pending):
+                if len(running) >= max(1, jobs):
+                    break
+                if all(d in done for d in deps[name]):
+                    pending.remove(name)
+                    running[pool.submit(timed, name)] = name
+            finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for fut in finished:
+                name = running.pop(fut)
+                rc = fut.result()
+                if rc != 0:
+                    raise SystemExit(f"build step failed: {name} (exit {rc})")
+                done.add(name)
+    return timings
+
+
+def print_timings(steps: Sequence[Step], timings: Dict[str, float], total_s: float) -> None:
+    width = max(len(s.name) for s in steps)
+    print("build_all timings")
+    for s in steps:
+        if s.name in timings:
+            print(f"  {s.name.ljust(width)}  {timings[s.name]:7.3f}s")
+    print(f"  {'total (wall)'.ljust(width)}  {total_s:7.3f}s")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--jobs", type=int, default=4, help="Max steps to run concurrently (default: 4; 1 = serial).")
+    args = ap.parse_args(argv)
 
+    scripts_dir = str(ROOT / "scripts")
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
 
-def main() -> int:
-    run("scripts/build_readme.py")
-    run("scripts/add_bach_anchors.py")
-    run("scripts/build_references.py")
-    run("scripts/build_book_md.py")
-    run("scripts/build_book_public_md.py")
-    run("scripts/export_blog_posts.py")
-    run("scripts/build_site.py", "--out", "dist")
+    t0 = time.perf_counter()
+    timings = run_steps(STEPS, jobs=args.jobs)
+    print_timings(STEPS, timings, time.perf_counter() - t0)
     return 0
 
 
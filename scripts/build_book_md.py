@@ -9,6 +9,8 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from _core import corpus
+
 
 ROOT = Path(__file__).resolve().parents[1]
 CHAPTERS_DIR = ROOT / "manuscript" / "chapters"
@@ -17,18 +19,18 @@ OUT_MD = ROOT / "manuscript" / "book.md"
 
 
 def main() -> int:
-    chapters = sorted(CHAPTERS_DIR.glob("ch*.md"))
+    chapters = corpus.chapter_paths(CHAPTERS_DIR)
     parts = []
     parts.append("# the-mind\n")
     parts.append("A book-length synthesis of how the mind works according to Joscha Bach.\n")
     parts.append("---\n")
 
     for path in chapters:
-        parts.append(path.read_text(encoding="utf-8", errors="replace").rstrip() + "\n")
+        parts.append(corpus.read_text(path).rstrip() + "\n")
         parts.append("---\n")
 
     if REFS_MD.exists():
-        parts.append(REFS_MD.read_text(encoding="utf-8", errors="replace").rstrip() + "\n")
+        parts.append(corpus.read_text(REFS_MD).rstrip() + "\n")
 
     OUT_MD.write_text("\n".join(parts).strip() + "\n", encoding="utf-8")
     print(f"wrote {OUT_MD}")
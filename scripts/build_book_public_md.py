@@ -21,6 +21,8 @@ from __future__ import annotations
 import re
 from pathlib import Path
 
+from _core import corpus
+
 
 ROOT = Path(__file__).resolve().parents[1]
 CHAPTERS_DIR = ROOT / "manuscript" / "chapters"
@@ -73,7 +75,7 @@ def transform(text: str) -> str:
 
 
 def main() -> int:
-    chapters = sorted(CHAPTERS_DIR.glob("ch*.md"))
+    chapters = corpus.chapter_paths(CHAPTERS_DIR)
     if not chapters:
         raise SystemExit(f"no chapters under {CHAPTERS_DIR}")
 
@@ -83,11 +85,11 @@ def main() -> int:
     parts.append("\n---\n")
 
     for ch in chapters:
-        parts.append(transform(ch.read_text(encoding="utf-8", errors="replace")).rstrip() + "\n")
+        parts.append(transform(corpus.read_text(ch)).rstrip() + "\n")
         parts.append("\n---\n")
 
     if REFS_MD.exists():
-        parts.append(REFS_MD.read_text(encoding="utf-8", errors="replace").rstrip() + "\n")
+        parts.append(corpus.read_text(REFS_MD).rstrip() + "\n")
 
     OUT_MD.write_text("\n".join(parts).strip() + "\n", encoding="utf-8")
     print(f"wrote {OUT_MD}")
@@ -12,7 +12,7 @@ import re
 from pathlib import Path
 from typing import Dict, List, Tuple
 
-from _core.sources import load_sources_csv
+from _core import corpus
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -25,7 +25,7 @@ ANCHOR_RX = re.compile(r"^- ([^\s]+) @ ([^\s]+) \(keywords: (.*)\)$")
 
 
 def load_sources(path: Path) -> Dict[str, Dict[str, str]]:
-    return load_sources_csv(path)
+    return corpus.load_sources(path)
 
 
 def parse_chapter_anchors(text: str) -> List[Tuple[str, str, str]]:
@@ -51,7 +51,7 @@ def parse_chapter_anchors(text: str) -> List[Tuple[str, str, str]]:
 def main() -> int:
     sources = load_sources(SOURCES_CSV)
 
-    chapters = sorted(CHAPTERS_DIR.glob("ch*.md"))
+    chapters = corpus.chapter_paths(CHAPTERS_DIR)
     parts: List[str] = []
     parts.append("# References")
     parts.append("")
@@ -59,7 +59,7 @@ def main() -> int:
     parts.append("")
 
     for ch_path in chapters:
-        ch_text = ch_path.read_text(encoding="utf-8", errors="replace")
+        ch_text = corpus.read_text(ch_path)
         # Chapter title is the first H1.
         ch_title = next((l[2:].strip() for l in ch_text.splitlines() if l.startswith("# ")), ch_path.stem)
         anchors = parse_chapter_anchors(ch_text)
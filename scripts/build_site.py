@@ -26,7 +26,7 @@ The site keeps provenance as links to original sources (URL + locator).
 from __future__ import annotations
 
 import argparse
-import csv
+import hashlib
 import html
 import json
 import os
@@ -35,9 +35,13 @@ import shutil
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from urllib.parse import urljoin
 
+from _core import corpus
+from _core.codehash import code_fingerprint
+from _core.intervals import bach_intervals
+
 
 ROOT = Path(__file__).resolve().parents[1]
 
@@ -59,6 +63,18 @@ FURTHER_READING_MD = ROOT / "docs" / "further_reading.md"
 SOURCES_CSV = ROOT / "sources" / "sources.csv"
 SPEAKERS_DIR = ROOT / "transcripts" / "_speakers"
 DEFAULT_SITE_BASE_URL = "https://the-mind.xyz/"
+# Incremental build state, kept outside the output dir so it is never deployed.
+SITE_CACHE_DIR = ROOT / ".cache" / "site"
+LEGACY_MANIFEST_NAME = ".build_manifest.json"
+# Bump when the manifest layout changes; edits to this file are picked up via its hash.
+BUILDER_VERSION = 2
+
+# Client search index (see write_search_index / site/assets/app.js).
+SEARCH_DIR = "search"
+SEARCH_INDEX_VERSION = 1
+SEARCH_PREFIX_LEN = 2  # shard key: first N chars of a term
+SEARCH_TEXT_CHUNK = 2048  # page text is split into chunks of N chars (fetched only for snippets)
+SEARCH_TERM_RX = re.compile(r"\w+")
 
 
 TAG_RX = re.compile(r"^\[(BACH|SYNTH|NOTE|OPEN)\]\s*", re.IGNORECASE)
@@ -150,8 +166,6 @@ def extract_src_comment_refs(text: str) -> Tuple[str, List[Tuple[str, str]]]:
 
 ALLOWED_PRESENTATION_FORMATS = {"talk", "interview", "essay"}
 
-_BACH_TIME_S_CACHE: Dict[str, Optional[int]] = {}
-
 
 def parse_notes_kv(notes: str) -> Dict[str, str]:
     out: Dict[str, str] = {}
@@ -228,36 +242,8 @@ def bach_time_seconds(source_id: str) -> Optional[int]:
     Optional local-only enrichment: approximate total seconds attributed to Joscha Bach.
     Requires transcripts/_speakers/<source_id>.speakers.json (typically gitignored).
     """
-    if source_id in _BACH_TIME_S_CACHE:
-        return _BACH_TIME_S_CACHE[source_id]
-    if not SPEAKERS_DIR.exists():
-        _BACH_TIME_S_CACHE[source_id] = None
-        return None
-
-    p = SPEAKERS_DIR / f"{source_id}.speakers.json"
-    if not p.exists():
-        _BACH_TIME_S_CACHE[source_id] = None
-        return None
-
-    try:
-        data = json.loads(p.read_text(encoding="utf-8", errors="replace"))
-        segs = data.get("bach_segments") or []
-        total = 0.0
-        for seg in segs:
-            if not isinstance(seg, dict):
-                continue
-            start = seg.get("start_s")
-            end = seg.get("end_s")
-            if isinstance(start, (int, float)) and isinstance(end, (int, float)) and end > start:
-                total += float(end) - float(start)
-        secs = int(round(total))
-        if secs <= 0:
-            secs = None
-    except Exception:
-        secs = None
-
-    _BACH_TIME_S_CACHE[source_id] = secs
-    return secs
+    secs = int(round(bach_intervals(source_id, SPEAKERS_DIR).total()))
+    return secs if secs > 0 else None
 
 
 def render_cite_link(source_id: str, locator: str, sources: Dict[str, Dict[str, str]], *, show_time: bool) -> Optional[str]:
@@ -402,14 +388,7 @@ def render_mermaid_svg(code: str) -> Optional[str]:
 
 
 def load_sources() -> Dict[str, Dict[str, str]]:
-    out: Dict[str, Dict[str, str]] = {}
-    with SOURCES_CSV.open("r", encoding="utf-8", newline="") as f:
-        for row in csv.DictReader(f):
-            sid = (row.get("source_id") or "").strip()
-            if not sid:
-                continue
-            out[sid] = dict(row)
-    return out
+    return corpus.load_sources(SOURCES_CSV)
 
 
 def escape(s: str) -> str:
@@ -477,11 +456,36 @@ def read_markdown_or_missing(path: Path, fallback_title: str) -> str:
     return f"# {fallback_title}\n\n_{fallback_title} content missing: {path.relative_to(ROOT)}._\n"
 
 
+_IMAGE_RX = re.compile(r"!\[([^\]]*)\]\(([^)]+)\)")
+_CODE_RX = re.compile(r"`([^`]+)`")
+_LINK_RX = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+_BARE_URL_RX = re.compile(r"(?<![\"'=])(https?://[^\s<>()]+)")
+_BOLD_RX = re.compile(r"\*\*([^*]+)\*\*")
+_EM_STAR_RX = re.compile(r"(?<!\w)\*([^*\n]+?)\*(?!\w)")
+_EM_UNDERSCORE_RX = re.compile(r"(?<!\w)_([^_\n]+?)_(?!\w)")
+# Every (possibly overlapping) "@@FMT<n>@@" placeholder left by inline_format's stash().
+_FMT_TOKEN_RX = re.compile(r"(?=(@@FMT(0|[1-9][0-9]*)@@))")
+
+
+def _attr(s: str) -> str:
+    # Inputs are already escaped except for quotes (escape() uses quote=False).
+    return s.replace('"', "&quot;").replace("'", "&#x27;")
+
+
+def _inline_anchor(label: str, href: str, *, root: str) -> str:
+    norm_href = normalize_site_href(href, root=root)
+    if norm_href.startswith(("http://", "https://")):
+        return f'<a href="{_attr(norm_href)}" target="_blank" rel="noopener noreferrer">{label}</a>'
+    return f'<a href="{_attr(norm_href)}">{label}</a>'
+
+
 def inline_format(s: str, *, root: str) -> str:
     # Conservative inline formatting:
     # - Escape text
     # - Protect code/links from emphasis processing
     # - Apply bold/italics to remaining text only
+    # Each pass only runs when its trigger text occurs (most lines have none); a pass
+    # that cannot match leaves the line unchanged, so the output is the same either way.
     s = escape(s)
     protected: List[str] = []
 
@@ -491,57 +495,74 @@ def inline_format(s: str, *, root: str) -> str:
         return token
 
     # ![alt](src)
-    def make_image(alt: str, src: str) -> str:
-        norm_src = normalize_site_href(src, root=root)
-        src_attr = norm_src.replace('"', "&quot;").replace("'", "&#x27;")
-        alt_attr = alt.replace('"', "&quot;").replace("'", "&#x27;")
-        return f'<img class="mdimg" src="{src_attr}" alt="{alt_attr}" loading="lazy" />'
-
-    s = re.sub(r"!\[([^\]]*)\]\(([^)]+)\)", lambda m: stash(make_image(m.group(1), m.group(2))), s)
-
+    if "![" in s:
+        s = _IMAGE_RX.sub(
+            lambda m: stash(
+                f'<img class="mdimg" src="{_attr(normalize_site_href(m.group(2), root=root))}" '
+                f'alt="{_attr(m.group(1))}" loading="lazy" />'
+            ),
+            s,
+        )
     # `code`
-    s = re.sub(r"`([^`]+)`", lambda m: stash(f"<code>{m.group(1)}</code>"), s)
-
+    if "`" in s:
+        s = _CODE_RX.sub(lambda m: stash(f"<code>{m.group(1)}</code>"), s)
     # [text](url)
-    def make_anchor(label: str, href: str) -> str:
-        norm_href = normalize_site_href(href, root=root)
-        # `href` is already escaped except for quotes (escape() uses quote=False).
-        href_attr = norm_href.replace('"', "&quot;").replace("'", "&#x27;")
-        if norm_href.startswith(("http://", "https://")):
-            return f'<a href="{href_attr}" target="_blank" rel="noopener noreferrer">{label}</a>'
-        return f'<a href="{href_attr}">{label}</a>'
-
-    s = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", lambda m: stash(make_anchor(m.group(1), m.group(2))), s)
-
+    if "](" in s:
+        s = _LINK_RX.sub(lambda m: stash(_inline_anchor(m.group(1), m.group(2), root=root)), s)
     # Bare URLs
-    s = re.sub(
-        r"(?<![\"'=])(https?://[^\s<>()]+)",
-        lambda m: stash(make_anchor(m.group(1), m.group(1))),
-        s,
-    )
-
+    if "http" in s:
+        s = _BARE_URL_RX.sub(lambda m: stash(_inline_anchor(m.group(1), m.group(1), root=root)), s)
     # Cross-link stable knowledge-base IDs.
-    s = re.sub(
-        CLM_ID_RX,
-        lambda m: stash(make_anchor(m.group(0), f"{root}claims/index.html#clm-{m.group(1)}")),
-        s,
-    )
-    s = re.sub(
-        TERM_ID_RX,
-        lambda m: stash(make_anchor(m.group(0), f"{root}glossary/index.html#term-{m.group(1)}")),
-        s,
-    )
+    if "-" in s:
+        s = CLM_ID_RX.sub(
+            lambda m: stash(_inline_anchor(m.group(0), f"{root}claims/index.html#clm-{m.group(1)}", root=root)), s
+        )
+        s = TERM_ID_RX.sub(
+            lambda m: stash(_inline_anchor(m.group(0), f"{root}glossary/index.html#term-{m.group(1)}", root=root)), s
+        )
 
     # **bold**
-    s = re.sub(r"\*\*([^*]+)\*\*", lambda m: f"<strong>{m.group(1)}</strong>", s)
-    # *italics* and _italics_ (keep conservative boundaries)
-    s = re.sub(r"(?<!\w)\*([^*\n]+?)\*(?!\w)", lambda m: f"<em>{m.group(1)}</em>", s)
-    s = re.sub(r"(?<!\w)_([^_\n]+?)_(?!\w)", lambda m: f"<em>{m.group(1)}</em>", s)
+    if "*" in s:
+        s = _BOLD_RX.sub(lambda m: f"<strong>{m.group(1)}</strong>", s)
+        # *italics* and _italics_ (keep conservative boundaries)
+        s = _EM_STAR_RX.sub(lambda m: f"<em>{m.group(1)}</em>", s)
+    if "_" in s:
+        s = _EM_UNDERSCORE_RX.sub(lambda m: f"<em>{m.group(1)}</em>", s)
 
     # Restore protected fragments (code/links) after emphasis processing.
-    for idx in range(len(protected) - 1, -1, -1):
-        s = s.replace(f"@@FMT{idx}@@", protected[idx])
-    return s
+    return _restore_protected(s, protected, len(protected))
+
+
+def _restore_protected(s: str, protected: List[str], bound: int) -> str:
+    """
+    Replace placeholders of fragments below `bound` in one scan. Same result as replacing
+    "@@FMT{i}@@" for i = bound-1, ..., 0 in turn: a fragment's own placeholders (a code
+    span inside a link label) only refer to earlier fragments, and where placeholders
+    overlap (only possible with "@@FMT" typed in the text) the higher index wins.
+    """
+    if "@@FMT" not in s:
+        return s
+    found = [(m.start(), m.start() + len(m.group(1)), int(m.group(2))) for m in _FMT_TOKEN_RX.finditer(s)]
+    found = [t for t in found if t[2] < bound]
+    keep = [True] * len(found)
+    if any(found[i + 1][0] < found[i][1] for i in range(len(found) - 1)):
+        # A placeholder can only overlap its neighbours (they share the "@@" delimiter).
+        keep = [False] * len(found)
+        for i in sorted(range(len(found)), key=lambda i: (-found[i][2], found[i][0])):
+            if i > 0 and keep[i - 1] and found[i - 1][1] > found[i][0]:
+                continue
+            if i + 1 < len(found) and keep[i + 1] and found[i][1] > found[i + 1][0]:
+                continue
+            keep[i] = True
+    out: List[str] = []
+    pos = 0
+    for (start, end, idx), use in zip(found, keep):
+        if use:
+            out.append(s[pos:start])
+            out.append(_restore_protected(protected[idx], protected, idx))
+            pos = end
+    out.append(s[pos:])
+    return "".join(out)
 
 
 def strip_md_for_search(s: str) -> str:
@@ -779,10 +800,18 @@ def blocks_to_html(
     *,
     root: str,
     page_kind: str = "",
+    seen_ids: Optional[Dict[str, int]] = None,
 ) -> Tuple[str, str]:
+    """
+    Render blocks to (html, search_text).
+
+    `seen_ids` carries heading-id counters across fragments of one page (updated in place),
+    so fragments rendered separately get the same ids as rendering their concatenation.
+    """
     parts: List[str] = []
     search_parts: List[str] = []
-    seen_ids: Dict[str, int] = {}
+    if seen_ids is None:
+        seen_ids = {}
 
     glossary_heading_ids: Dict[int, str] = {}
     if page_kind == "glossary":
@@ -890,6 +919,52 @@ def blocks_to_html(
     return "\n".join(parts), " ".join([p for p in search_parts if p]).strip()
 
 
+@dataclass
+class RenderedDocument:
+    blocks: List[Block]
+    html: str
+    text: str
+    seen_ids: Dict[str, int]  # heading-id counters after this document
+
+
+class DocumentCache:
+    """
+    Parse/render cache for markdown files that feed more than one output (chapters feed
+    both the reader page and the per-chapter search entries).
+
+    Blocks come from `_core.corpus`, keyed by path + mtime/size. Rendered HTML and search
+    text are additionally keyed by root, page kind and the incoming heading-id counters,
+    because heading ids are de-duplicated across the whole page.
+    """
+
+    def __init__(self, sources: Dict[str, Dict[str, str]]) -> None:
+        self.sources = sources
+        self._rendered: Dict[Tuple[Path, object, str, str, Tuple[Tuple[str, int], ...]], RenderedDocument] = {}
+
+    def blocks(self, path: Path) -> List[Block]:
+        return corpus.parsed(path, parse_blocks)
+
+    def render(
+        self,
+        path: Path,
+        *,
+        root: str,
+        page_kind: str = "",
+        seen_ids: Optional[Dict[str, int]] = None,
+    ) -> RenderedDocument:
+        incoming = dict(seen_ids or {})
+        key = (path.resolve(), corpus.file_signature(path), root, page_kind, tuple(sorted(incoming.items())))
+        hit = self._rendered.get(key)
+        if hit is not None:
+            return hit
+        blocks = self.blocks(path)
+        counters = dict(incoming)
+        html_body, text_body = blocks_to_html(blocks, self.sources, root=root, page_kind=page_kind, seen_ids=counters)
+        doc = RenderedDocument(blocks=blocks, html=html_body, text=text_body, seen_ids=counters)
+        self._rendered[key] = doc
+        return doc
+
+
 def read_template() -> str:
     return TEMPLATE_BASE.read_text(encoding="utf-8", errors="replace")
 
@@ -957,8 +1032,33 @@ def emit_markdown_page(
 ) -> Tuple[str, str]:
     root = page_root(href)
     html_body, text_body = blocks_to_html(parse_blocks(md), sources, root=root, page_kind=page_kind)
+    emit_html_page(
+        out_dir=out_dir,
+        template=template,
+        href=href,
+        title=title,
+        html_body=html_body,
+        base_url=base_url,
+        og_image_url=og_image_url,
+        nav_html=nav_html,
+    )
+    return html_body, text_body
+
+
+def emit_html_page(
+    *,
+    out_dir: Path,
+    template: str,
+    href: str,
+    title: str,
+    html_body: str,
+    base_url: str,
+    og_image_url: str,
+    nav_html: str,
+) -> None:
+    root = page_root(href)
     body_class = "supports-annotations" if href == "reader/index.html" else ""
-    write(
+    write_if_changed(
         out_dir / href,
         render_page(
             template,
@@ -972,7 +1072,6 @@ def emit_markdown_page(
             body_class=body_class,
         ),
     )
-    return html_body, text_body
 
 
 def build_nav(
@@ -1027,30 +1126,66 @@ def write(path: Path, text: str) -> None:
     path.write_text(text, encoding="utf-8")
 
 
-def copy_assets(out_dir: Path) -> None:
+def write_if_changed(path: Path, text: str) -> bool:
+    """
+    Write `text` unless the file already holds exactly that content.
+
+    Keeps mtimes stable on incremental builds so downstream sync/deploy steps see no change.
+    """
+    data = text.encode("utf-8")
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+
+def copy_if_changed(src: Path, dst: Path) -> bool:
+    try:
+        a = src.stat()
+        b = dst.stat()
+        if a.st_size == b.st_size and int(a.st_mtime) == int(b.st_mtime):
+            return False
+    except OSError:
+        pass
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(src, dst)
+    return True
+
+
+def copy_assets(out_dir: Path) -> List[str]:
     dst = out_dir / "assets"
     dst.mkdir(parents=True, exist_ok=True)
-    for p in ASSETS_DIR.glob("*"):
+    copied: List[str] = []
+    for p in sorted(ASSETS_DIR.glob("*")):
         if p.is_file():
-            shutil.copy2(p, dst / p.name)
+            copy_if_changed(p, dst / p.name)
+            copied.append(f"assets/{p.name}")
+    return copied
 
 
-def copy_root_assets(out_dir: Path) -> None:
+def copy_root_assets(out_dir: Path) -> List[str]:
     """
     Copy a few conventional top-level assets for better UX / link previews.
 
     We still keep the canonical files under site/assets/; this just provides
     stable root paths like /favicon.ico and /og.png.
     """
+    copied: List[str] = []
     for name in ("favicon.ico", "favicon.svg", "apple-touch-icon.png", "og.png"):
         p = ASSETS_DIR / name
         if p.is_file():
-            shutil.copy2(p, out_dir / name)
+            copy_if_changed(p, out_dir / name)
+            copied.append(name)
+    return copied
 
 
 def write_nojekyll(out_dir: Path) -> None:
     # Makes branch-based Pages deployments work (no Jekyll processing).
-    (out_dir / ".nojekyll").write_text("", encoding="utf-8")
+    write_if_changed(out_dir / ".nojekyll", "")
 
 
 def write_sitemap(out_dir: Path, base_url: str, hrefs: Iterable[str]) -> None:
@@ -1060,7 +1195,7 @@ def write_sitemap(out_dir: Path, base_url: str, hrefs: Iterable[str]) -> None:
     for u in urls:
         parts.append(f"  <url><loc>{escape(u)}</loc></url>")
     parts.append("</urlset>")
-    (out_dir / "sitemap.xml").write_text("\n".join(parts) + "\n", encoding="utf-8")
+    write_if_changed(out_dir / "sitemap.xml", "\n".join(parts) + "\n")
 
 
 def write_robots(out_dir: Path, base_url: str) -> None:
@@ -1074,12 +1209,205 @@ def write_robots(out_dir: Path, base_url: str) -> None:
             "",
         ]
     )
-    (out_dir / "robots.txt").write_text(text, encoding="utf-8")
+    write_if_changed(out_dir / "robots.txt", text)
+
+
+def search_terms(text: str) -> Iterator[Tuple[str, int]]:
+    """
+    Yield (term, offset) pairs: lowercased word tokens and their char offsets in `text`.
+    """
+    for m in SEARCH_TERM_RX.finditer(text or ""):
+        yield m.group(0).lower(), m.start()
+
+
+def build_search_postings(entries: List[Dict[str, str]]) -> Dict[str, Dict[str, List[object]]]:
+    """
+    Invert search entries into prefix shards: {prefix: {term: [[page_id, title_count, offsets], ...]}}.
+
+    Page ids index `entries`. Offsets are code point offsets into the page text (app.js
+    slices by code point, not UTF-16 unit), delta-encoded.
+    """
+    postings: Dict[str, Dict[int, List[int]]] = {}
+    for pid, e in enumerate(entries):
+        title_counts: Dict[str, int] = {}
+        for term, _off in search_terms(e.get("title") or ""):
+            title_counts[term] = title_counts.get(term, 0) + 1
+        offsets: Dict[str, List[int]] = {}
+        for term, off in search_terms(e.get("text") or ""):
+            offsets.setdefault(term, []).append(off)
+        for term in sorted(set(title_counts) | set(offsets)):
+            offs = offsets.get(term, [])
+            deltas = [b - a for a, b in zip([0] + offs[:-1], offs)]
+            postings.setdefault(term, {})[pid] = [title_counts.get(term, 0)] + deltas
+
+    shards: Dict[str, Dict[str, List[object]]] = {}
+    for term in sorted(postings):
+        by_page = postings[term]
+        shards.setdefault(term[:SEARCH_PREFIX_LEN], {})[term] = [
+            [pid, by_page[pid][0], by_page[pid][1:]] for pid in sorted(by_page)
+        ]
+    return shards
+
+
+def write_search_index(out_dir: Path, entries: List[Dict[str, str]]) -> List[str]:
+    """
+    Write the client search index under search/ and return the output paths (relative to out_dir).
+
+    - manifest.json: pages (href, title, text length, text chunk hashes) + {term prefix: shard hash}
+    - shards/<hash>.json: term -> postings for every term sharing a prefix
+    - text/<hash>.json: fixed-size page text chunks, fetched only to render snippets
+
+    Shard and chunk names are content hashes, so clients can cache them indefinitely and
+    only the small manifest needs revalidation.
+    """
+    outputs: List[str] = []
+
+    def put(kind: str, payload: object) -> str:
+        text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        digest = sha256_text(text)[:12]
+        rel = f"{SEARCH_DIR}/{kind}/{digest}.json"
+        write_if_changed(out_dir / rel, text + "\n")
+        outputs.append(rel)
+        return digest
+
+    pages: List[Dict[str, object]] = []
+    for e in entries:
+        text = e.get("text") or ""
+        chunks = [put("text", text[i : i + SEARCH_TEXT_CHUNK]) for i in range(0, len(text), SEARCH_TEXT_CHUNK)]
+        pages.append({"href": e["href"], "title": e["title"], "len": len(text), "chunks": chunks})
+
+    shard_hashes = {prefix: put("shards", terms) for prefix, terms in sorted(build_search_postings(entries).items())}
+    manifest = {
+        "version": SEARCH_INDEX_VERSION,
+        "prefix_len": SEARCH_PREFIX_LEN,
+        "chunk": SEARCH_TEXT_CHUNK,
+        "pages": pages,
+        "shards": shard_hashes,
+    }
+    rel = f"{SEARCH_DIR}/manifest.json"
+    write_if_changed(out_dir / rel, json.dumps(manifest, ensure_ascii=False, separators=(",", ":")) + "\n")
+    outputs.append(rel)
+    return sorted(set(outputs))
+
+
+def sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def sha256_file(path: Path) -> str:
+    if not path.is_file():
+        return ""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def speakers_fingerprint() -> str:
+    """
+    Cheap fingerprint of local diarization metadata (it feeds cite tooltips on every page).
+    """
+    if not SPEAKERS_DIR.exists():
+        return ""
+    h = hashlib.sha256()
+    for p in sorted(SPEAKERS_DIR.glob("*.speakers.json")):
+        st = p.stat()
+        h.update(f"{p.name}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def build_inputs_fingerprint(*, template: str, base_url: str, nav_key: str) -> Dict[str, str]:
+    """
+    Inputs shared by every page. If any of these change, all pages are re-rendered.
+    """
+    return {
+        "builder": f"{BUILDER_VERSION}:{code_fingerprint(Path(__file__))}",  # this script + its _core imports
+        "template": sha256_text(template),
+        "sources_csv": sha256_file(SOURCES_CSV),
+        "speakers": speakers_fingerprint(),
+        "base_url": base_url,
+        "nav": sha256_text(nav_key),
+    }
+
+
+def build_cache_dir(out_dir: Path) -> Path:
+    """
+    Incremental state for one output dir: `manifest.json` (input/page hashes, output list)
+    and `search/<hash>.json` (the search entries of each rendered page version).
+    """
+    return SITE_CACHE_DIR / sha256_text(str(out_dir.resolve()))[:12]
+
+
+def load_build_manifest(out_dir: Path) -> Dict[str, object]:
+    p = build_cache_dir(out_dir) / "manifest.json"
+    if not p.is_file():
+        return {}
+    try:
+        data = json.loads(p.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    if not isinstance(data, dict) or data.get("version") != BUILDER_VERSION:
+        return {}
+    return data
+
+
+def write_build_manifest(out_dir: Path, manifest: Dict[str, object]) -> None:
+    cache = build_cache_dir(out_dir)
+    write_if_changed(cache / "manifest.json", json.dumps(manifest, ensure_ascii=True, sort_keys=True) + "\n")
+    # Drop search entries of page versions the manifest no longer refers to.
+    pages = manifest.get("pages")
+    live = {search_cache_name(href, key) for href, key in pages.items()} if isinstance(pages, dict) else set()
+    search_dir = cache / "search"
+    if search_dir.is_dir():
+        for p in search_dir.glob("*.json"):
+            if p.name not in live:
+                p.unlink(missing_ok=True)
+
+
+def search_cache_name(href: str, key: object) -> str:
+    return sha256_text(f"{href}\0{key}")[:16] + ".json"
+
+
+def load_search_entries(out_dir: Path, href: str, key: str) -> Optional[List[Dict[str, str]]]:
+    p = build_cache_dir(out_dir) / "search" / search_cache_name(href, key)
+    try:
+        entries = json.loads(p.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return entries if isinstance(entries, list) else None
+
+
+def write_search_entries(out_dir: Path, href: str, key: str, entries: List[Dict[str, str]]) -> None:
+    p = build_cache_dir(out_dir) / "search" / search_cache_name(href, key)
+    write_if_changed(p, json.dumps(entries, ensure_ascii=False) + "\n")
+
+
+def remove_orphans(out_dir: Path, previous: Iterable[str], current: Iterable[str]) -> List[str]:
+    """
+    Delete outputs recorded by the previous build that this build no longer produces.
+    Empty parent directories are pruned (never `out_dir` itself).
+    """
+    keep = set(current)
+    out_abs = out_dir.resolve()
+    removed: List[str] = []
+    for rel in sorted(set(previous) - keep):
+        p = (out_dir / rel).resolve()
+        if out_abs not in p.parents or not p.is_file():
+            continue
+        p.unlink()
+        removed.append(rel)
+        parent = p.parent
+        while parent != out_abs and parent.is_dir() and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+    return removed
 
 
 def main(argv: Optional[List[str]] = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--out", default=str(ROOT / "dist"), help="Output directory (default: ./dist)")
+    ap.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Keep the output dir and only re-render pages whose inputs changed (state in .cache/site/).",
+    )
     args = ap.parse_args(argv)
 
     out_dir = Path(args.out)
@@ -1088,23 +1416,32 @@ def main(argv: Optional[List[str]] = None) -> int:
     root_abs = ROOT.resolve()
     if out_abs in {Path("/"), root_abs, root_abs.parent}:
         raise SystemExit(f"Refusing to delete unsafe output dir: {out_abs}")
-    if out_dir.exists():
+    prev_manifest: Dict[str, object] = {}
+    if args.incremental:
+        # Stale files are removed via the manifest's output list instead of wiping the tree.
+        prev_manifest = load_build_manifest(out_dir)
+    elif out_dir.exists():
         shutil.rmtree(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
-    copy_assets(out_dir)
-    copy_root_assets(out_dir)
+    # Older builds kept the manifest inside the output dir (and so deployed it).
+    (out_dir / LEGACY_MANIFEST_NAME).unlink(missing_ok=True)
+    outputs: List[str] = []
+    outputs.extend(copy_assets(out_dir))
+    outputs.extend(copy_root_assets(out_dir))
     write_nojekyll(out_dir)
+    outputs.append(".nojekyll")
 
     sources = load_sources()
+    docs = DocumentCache(sources)
     template = read_template()
     base_url = site_base_url()
     og_image_url = absolute_page_url(base_url, "og.png")
 
     # Collect chapters (used for Reader + nav; we do not emit per-chapter pages).
-    chapter_files = sorted(CHAPTERS_DIR.glob("ch*.md"))
+    chapter_files = corpus.chapter_paths(CHAPTERS_DIR)
     chapter_pages: List[Tuple[str, str, str, str]] = []  # (anchor_id, title, src_path, h1)
     for p in chapter_files:
-        md = p.read_text(encoding="utf-8", errors="replace")
+        md = corpus.read_text(p)
         h1 = next((l[2:].strip() for l in md.splitlines() if l.startswith("# ")), p.stem)
         title = re.sub(r"^Chapter\s+\d+:\s*", "", h1).strip()
         anchor_id = slugify(h1)
@@ -1113,31 +1450,59 @@ def main(argv: Optional[List[str]] = None) -> int:
     question_files = sorted([p for p in QUESTIONS_DIR.glob("*.md") if p.is_file() and p.name != "index.md"])
     question_pages: List[Tuple[str, str, Path]] = []
     for p in question_files:
-        md = p.read_text(encoding="utf-8", errors="replace")
+        md = corpus.read_text(p)
         question_pages.append((f"questions/{p.stem}/index.html", markdown_title(md, p.stem.replace("-", " ")), p))
     question_nav = [(href, title) for href, title, _path in question_pages]
 
+    inputs = build_inputs_fingerprint(
+        template=template,
+        base_url=base_url,
+        nav_key=json.dumps(question_nav, ensure_ascii=True),
+    )
+    prev_pages: Dict[str, object] = {}
+    if prev_manifest.get("inputs") == inputs and isinstance(prev_manifest.get("pages"), dict):
+        prev_pages = prev_manifest["pages"]  # type: ignore[assignment]
+    pages_manifest: Dict[str, str] = {}
+    rendered = 0
+
     search_index: List[Dict[str, str]] = []
     page_hrefs: List[str] = []
 
     def nav_for(href: str) -> str:
         return build_nav(question_nav, current_href=href, root=page_root(href))
 
-    def emit(href: str, title: str, md: str, *, page_kind: str = "") -> None:
-        _html_body, text_body = emit_markdown_page(
-            out_dir=out_dir,
-            template=template,
-            sources=sources,
-            href=href,
-            title=title,
-            md=md,
-            page_kind=page_kind,
-            base_url=base_url,
-            og_image_url=og_image_url,
-            nav_html=nav_for(href),
-        )
+    def reuse(href: str, key: str) -> Optional[List[Dict[str, str]]]:
+        if prev_pages.get(href) != key or not (out_dir / href).is_file():
+            return None
+        return load_search_entries(out_dir, href, key)
+
+    def record(href: str, key: str, entries: List[Dict[str, str]]) -> None:
+        write_search_entries(out_dir, href, key, entries)
+        pages_manifest[href] = key
         page_hrefs.append(href)
-        search_index.append({"href": href, "title": title, "text": text_body})
+        outputs.append(href)
+        search_index.extend(entries)
+
+    def emit(href: str, title: str, md: str, *, page_kind: str = "") -> None:
+        nonlocal rendered
+        key = sha256_text("\0".join([title, page_kind, md]))
+        entries = reuse(href, key)
+        if entries is None:
+            _html_body, text_body = emit_markdown_page(
+                out_dir=out_dir,
+                template=template,
+                sources=sources,
+                href=href,
+                title=title,
+                md=md,
+                page_kind=page_kind,
+                base_url=base_url,
+                og_image_url=og_image_url,
+                nav_html=nav_for(href),
+            )
+            entries = [{"href": href, "title": title, "text": text_body}]
+            rendered += 1
+        record(href, key, entries)
 
     emit("index.html", "the-mind", read_markdown_or_missing(HOME_MD, "the-mind"))
 
@@ -1148,7 +1513,7 @@ def main(argv: Optional[List[str]] = None) -> int:
     emit("questions/index.html", markdown_title(questions_index_md, "Questions"), questions_index_md)
 
     for href, title, path in question_pages:
-        emit(href, title, path.read_text(encoding="utf-8", errors="replace"))
+        emit(href, title, corpus.read_text(path))
 
     archive_md = read_markdown_or_missing(ARCHIVE_MD, "Archive")
     if chapter_pages and "(/reader/)" not in archive_md:
@@ -1213,34 +1578,62 @@ def main(argv: Optional[List[str]] = None) -> int:
         for anchor_id, title, _src_path, _h1 in chapter_pages:
             reader_parts.append(f"- [{title}](#{anchor_id})")
         reader_parts.append("")
-        reader_md = "\n".join(reader_parts) + "\n\n---\n\n" + "\n\n---\n\n".join(
-            [Path(src_path).read_text(encoding="utf-8", errors="replace").rstrip() for _anchor_id, _title, src_path, _h1 in chapter_pages]
-        )
-        _html_body, reader_text = emit_markdown_page(
-            out_dir=out_dir,
-            template=template,
-            sources=sources,
-            href="reader/index.html",
-            title="Reader / V1",
-            md=reader_md,
-            page_kind="",
-            base_url=base_url,
-            og_image_url=og_image_url,
-            nav_html=nav_for("reader/index.html"),
+        toc_md = "\n".join(reader_parts)
+        reader_md = toc_md + "\n\n---\n\n" + "\n\n---\n\n".join(
+            [corpus.read_text(Path(src_path)).rstrip() for _anchor_id, _title, src_path, _h1 in chapter_pages]
         )
-        page_hrefs.append("reader/index.html")
-        search_index.append({"href": "reader/index.html", "title": "Reader / V1", "text": reader_text})
-
-        for anchor_id, title, src_path, _h1 in chapter_pages:
-            md = Path(src_path).read_text(encoding="utf-8", errors="replace")
-            _html_body, text_body = blocks_to_html(parse_blocks(md), sources, root=page_root("reader/index.html"))
-            search_index.append({"href": f"reader/index.html#{anchor_id}", "title": title, "text": text_body})
+        # The reader md embeds every chapter, so its hash also covers the per-chapter search entries.
+        reader_key = sha256_text(reader_md)
+        reader_entries = reuse("reader/index.html", reader_key)
+        if reader_entries is None:
+            # Assemble the reader from per-chapter fragments: each chapter is parsed and
+            # rendered once, and the same fragment provides its search entry.
+            reader_root = page_root("reader/index.html")
+            seen_ids: Dict[str, int] = {}
+            toc_html, _toc_text = blocks_to_html(parse_blocks(toc_md), sources, root=reader_root, seen_ids=seen_ids)
+            html_parts = [toc_html]
+            chapter_entries: List[Dict[str, str]] = []
+            for anchor_id, title, src_path, _h1 in chapter_pages:
+                doc = docs.render(Path(src_path), root=reader_root, seen_ids=seen_ids)
+                seen_ids = dict(doc.seen_ids)
+                html_parts.extend(["<hr />", doc.html])
+                chapter_entries.append({"href": f"reader/index.html#{anchor_id}", "title": title, "text": doc.text})
+            emit_html_page(
+                out_dir=out_dir,
+                template=template,
+                href="reader/index.html",
+                title="Reader / V1",
+                html_body="\n".join([h for h in html_parts if h]),
+                base_url=base_url,
+                og_image_url=og_image_url,
+                nav_html=nav_for("reader/index.html"),
+            )
+            rendered += 1
+            # Only the chapters are indexed: a whole-reader entry would repeat every chapter hit.
+            reader_entries = chapter_entries
+        record("reader/index.html", reader_key, reader_entries)
 
-    (out_dir / "search_index.json").write_text(json.dumps(search_index, ensure_ascii=True, indent=2) + "\n", encoding="utf-8")
+    outputs.extend(write_search_index(out_dir, search_index))
     write_sitemap(out_dir, base_url, page_hrefs)
     write_robots(out_dir, base_url)
+    outputs.extend(["sitemap.xml", "robots.txt"])
+
+    prev_outputs = prev_manifest.get("outputs") if args.incremental else None
+    removed = remove_orphans(out_dir, prev_outputs if isinstance(prev_outputs, list) else [], outputs)
+    write_build_manifest(
+        out_dir,
+        {
+            "version": BUILDER_VERSION,
+            "inputs": inputs,
+            "pages": pages_manifest,
+            "outputs": sorted(set(outputs)),
+        },
+    )
 
-    print(f"wrote site to {out_dir}")
+    if args.incremental:
+        print(f"wrote site to {out_dir} (rendered {rendered}/{len(pages_manifest)} pages, removed {len(removed)} orphans)")
+    else:
+        print(f"wrote site to {out_dir}")
     return 0
 
 
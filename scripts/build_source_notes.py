@@ -5,17 +5,43 @@ Generate lightweight, non-quoting source notes from local transcripts.
 Notes are committed; transcripts are not. To avoid attribution and copyright
 issues, this script never copies transcript text into source notes. Instead it
 lists timecoded segments with keyword tags only.
+
+Keyword tagging uses one compiled `KeywordMatcher` per run: a single regex scan per
+segment finds every keyword it contains, and those hits feed both the dominant terms
+and the segment ranking.
+
+Rebuilds are incremental: transcripts/_notes_fingerprints.json records, per source, a
+hash of everything a note is made from (transcript, time offset, speaker file, keyword
+set, options, metadata, this script) and of the note written. A source whose inputs and
+note are unchanged is skipped without parsing its transcript; the rest are rebuilt on
+a `--jobs` process pool.
 """
 
 from __future__ import annotations
 
 import argparse
 import csv
+import hashlib
+import heapq
+import json
+import os
 import re
-from dataclasses import dataclass
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
-import json
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional (vectorized scoring for long transcripts)
+    np = None
+
+from _core.captions import parse_offset_seconds
+from _core.codehash import code_fingerprint
+from _core.corpus import file_signature
+from _core.cuestore import open_cues
+from _core.intervals import SPEAKERS_SUFFIX, bach_intervals
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -23,6 +49,10 @@ SOURCES_CSV = ROOT / "sources" / "sources.csv"
 INDEX_CSV = ROOT / "transcripts" / "_index.csv"
 OUT_DIR = ROOT / "sources" / "source_notes"
 SPEAKERS_DIR = ROOT / "transcripts" / "_speakers"
+CUES_DIR = ROOT / "transcripts" / "_cues"
+FINGERPRINTS_PATH = ROOT / "transcripts" / "_notes_fingerprints.json"
+FINGERPRINTS_VERSION = 1
+NUMPY_MIN_SEGMENTS = 5000  # below this, the heap path is faster than numpy's setup cost
 
 
 KEYWORDS = [
@@ -104,21 +134,6 @@ def load_index(path: Path) -> Dict[str, Dict[str, str]]:
     return out
 
 
-def parse_timecode(tc: str) -> Optional[float]:
-    m = re.match(r"^(\d+):(\d+):(\d+)[\.,](\d+)$", tc.strip())
-    if not m:
-        return None
-    h, mnt, s, ms = m.groups()
-    return int(h) * 3600 + int(mnt) * 60 + int(s) + int(ms) / 1000.0
-
-
-def parse_offset_seconds(v: str) -> float:
-    try:
-        return float((v or "").strip() or "0")
-    except Exception:
-        return 0.0
-
-
 def format_timecode(seconds: float) -> str:
     if seconds < 0:
         seconds = 0.0
@@ -129,133 +144,148 @@ def format_timecode(seconds: float) -> str:
     return f"{h:02}:{m:02}:{s:02}"
 
 
-def iter_vtt(path: Path) -> Iterable[Tuple[float, float, str]]:
-    lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        if "-->" not in line:
-            i += 1
+class KeywordMatcher:
+    """
+    All keywords contained in a (lowercased) text, from one compiled pattern.
+
+    The keywords form one trie-shaped regex that matches the longest keyword at a
+    position. A plain search finds the first keyword (most cues have none, and the scan
+    stays in C); from there the same pattern inside a lookahead is tried at every
+    position. Other keywords starting at a position are prefixes of the longest one
+    ("predict" of "prediction error") and come from a table; keywords inside it ("model"
+    in "world model") match at their own positions. Same result as `kw in text.lower()`
+    for each keyword, in keyword order.
+    """
+
+    def __init__(self, keywords: Sequence[str]) -> None:
+        self.keywords = list(dict.fromkeys(keywords))
+        if not all(self.keywords):
+            raise ValueError("empty keyword")
+        self._rank = {kw: i for i, kw in enumerate(self.keywords)}
+        trie: Dict[str, dict] = {}
+        for kw in self.keywords:
+            node = trie
+            for ch in kw:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+        pattern = self._trie_pattern(trie)
+        self._first = re.compile(pattern)
+        self._every = re.compile(f"(?=({pattern}))")
+        self._prefixes = {kw: [p for p in self.keywords if kw.startswith(p)] for kw in self.keywords}
+
+    @classmethod
+    def _trie_pattern(cls, node: Dict[str, dict]) -> str:
+        alts = [re.escape(ch) + cls._trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        # Greedy optional continuation: the longest keyword at a position wins.
+        return f"(?:{body})?" if "" in node else body
+
+    def hits(self, text: str) -> List[str]:
+        t = text.lower()
+        first = self._first.search(t)
+        if first is None:
+            return []
+        found = {p for m in self._every.finditer(t, first.start()) for p in self._prefixes[m.group(1)]}
+        return sorted(found, key=self._rank.__getitem__)
+
+
+def segment_scores(segment_hits: Sequence[List[str]]) -> List[int]:
+    """
+    Score per segment: its keyword hits, multi-word keywords counting once per word.
+    """
+    weights: Dict[str, int] = {}
+    scores: List[int] = []
+    for hits in segment_hits:
+        score = 0
+        for h in hits:
+            w = weights.get(h)
+            if w is None:
+                w = weights[h] = max(1, len(h.split()))
+            score += w
+        scores.append(score)
+    return scores
+
+
+def _ranked_heap(starts: Sequence[float], scores: Sequence[int]) -> Iterator[int]:
+    # Segments with hits by (-score, start, position), popped lazily: only as many as
+    # the selection consumes pay the log n.
+    heap = [(-sc, st, i) for i, (st, sc) in enumerate(zip(starts, scores)) if sc]
+    heapq.heapify(heap)
+    while heap:
+        yield heapq.heappop(heap)[2]
+
+
+def _ranked_numpy(starts: Sequence[float], segment_hits: Sequence[List[str]]) -> Iterator[int]:
+    # Same order as _ranked_heap, with scoring and ordering done in numpy.
+    n = len(segment_hits)
+    counts = np.fromiter(map(len, segment_hits), dtype=np.int64, count=n)
+    weights: Dict[str, int] = {}
+    flat = np.fromiter(
+        (weights.get(h) or weights.setdefault(h, max(1, len(h.split()))) for hits in segment_hits for h in hits),
+        dtype=np.float64,
+        count=int(counts.sum()),
+    )
+    scores = np.bincount(np.repeat(np.arange(n), counts), weights=flat, minlength=n)
+    idx = np.flatnonzero(counts)
+    st = np.fromiter(starts, dtype=np.float64, count=n)[idx]
+    order = np.lexsort((idx, st, -scores[idx]))
+    return iter(idx[order].tolist())
+
+
+def select_spaced(ranked: Iterable[int], starts: Sequence[float], k: int, min_gap_s: float) -> List[int]:
+    """
+    Greedily take indices in `ranked` order, skipping any that start within `min_gap_s`
+    of one already taken, until `k` are taken. The taken start times stay sorted, so the
+    gap check only looks at the two neighbours (bisect) instead of every pick.
+    """
+    picked: List[int] = []
+    picked_starts: List[float] = []
+    if k <= 0:
+        return picked
+    for i in ranked:
+        s = starts[i]
+        j = bisect_left(picked_starts, s)
+        if j < len(picked_starts) and abs(picked_starts[j] - s) < min_gap_s:
             continue
-        start_raw, end_raw = [p.strip() for p in line.split("-->", 1)]
-        start_raw = start_raw.split()[0]
-        end_raw = end_raw.split()[0]
-        start = parse_timecode(start_raw.replace(",", "."))
-        end = parse_timecode(end_raw.replace(",", "."))
-        i += 1
-        txt_lines: List[str] = []
-        while i < len(lines):
-            cur = lines[i].strip()
-            if cur == "":
-                i += 1
-                break
-            if "-->" in cur:
-                # Next cue starts without a blank line.
-                break
-            txt_lines.append(cur)
-            i += 1
-        text = " ".join(txt_lines)
-        text = re.sub(r"<[^>]+>", "", text)
-        text = re.sub(r"\\s+", " ", text).strip()
-        if start is not None:
-            yield start, end or start, text
-
-
-def iter_srt(path: Path) -> Iterable[Tuple[float, float, str]]:
-    lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
-    i = 0
-    while i < len(lines):
-        if lines[i].strip().isdigit():
-            i += 1
-        if i >= len(lines):
-            break
-        time_line = lines[i].strip()
-        if "-->" not in time_line:
-            i += 1
+        if j > 0 and abs(s - picked_starts[j - 1]) < min_gap_s:
             continue
-        start_raw, end_raw = [p.strip() for p in time_line.split("-->", 1)]
-        start = parse_timecode(start_raw.replace(",", "."))
-        end = parse_timecode(end_raw.replace(",", "."))
-        i += 1
-        txt_lines: List[str] = []
-        while i < len(lines):
-            cur = lines[i].strip()
-            if cur == "":
-                i += 1
-                break
-            if "-->" in cur and re.match(r"^\d{2}:\d{2}:\d{2}", cur):
-                break
-            txt_lines.append(cur)
-            i += 1
-        text = " ".join(txt_lines).strip()
-        if start is not None:
-            yield start, end or start, text
-
-
-def iter_html(path: Path) -> Iterable[Tuple[float, float, str]]:
-    html = path.read_text(encoding="utf-8", errors="replace")
-    text = re.sub(r"<script\\b.*?</script>", " ", html, flags=re.IGNORECASE | re.DOTALL)
-    text = re.sub(r"<style\\b.*?</style>", " ", text, flags=re.IGNORECASE | re.DOTALL)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"\\s+", " ", text).strip()
-    if text:
-        yield 0.0, 0.0, text
-
-
-def iter_segments(path: Path) -> Iterable[Tuple[float, float, str]]:
-    suf = path.suffix.lower()
-    if suf == ".vtt":
-        yield from iter_vtt(path)
-    elif suf == ".srt":
-        yield from iter_srt(path)
-    elif suf == ".html":
-        yield from iter_html(path)
-    else:
-        return
-
-
-def keyword_hits(text: str, keywords: List[str]) -> List[str]:
-    t = text.lower()
-    hits = []
-    for kw in keywords:
-        if kw in t:
-            hits.append(kw)
-    return hits
+        picked_starts.insert(j, s)
+        picked.append(i)
+        if len(picked) >= k:
+            break
+    return picked
 
 
 def top_segments(
     segments: List[Tuple[float, float, str]],
-    keywords: List[str],
+    segment_hits: List[List[str]],
     max_segments: int,
     min_gap_s: int,
 ) -> List[Tuple[float, float, List[str]]]:
-    scored: List[Tuple[int, float, float, List[str]]] = []
-    for start, end, text in segments:
-        hits = keyword_hits(text, keywords)
-        if not hits:
-            continue
-        score = sum(max(1, len(h.split())) for h in hits)
-        scored.append((score, start, end, hits))
-    scored.sort(key=lambda x: (-x[0], x[1]))
-
-    picked: List[Tuple[float, float, List[str]]] = []
-    for score, start, end, hits in scored:
-        if len(picked) >= max_segments:
-            break
-        if any(abs(start - ps) < min_gap_s for ps, _, _ in picked):
-            continue
-        picked.append((start, end, hits))
-    picked.sort(key=lambda x: x[0])
-    return picked
+    """
+    Up to `max_segments` highest-scoring segments (ties: earlier first), at least
+    `min_gap_s` apart, in time order. Near-linear: candidates come from a heap (or a
+    numpy sort on long transcripts) and only until enough are picked.
+    """
+    if len(segments) != len(segment_hits):
+        raise ValueError("segments and segment_hits differ in length")
+    starts = [seg[0] for seg in segments]
+    if np is not None and len(segments) >= NUMPY_MIN_SEGMENTS:
+        ranked = _ranked_numpy(starts, segment_hits)
+    else:
+        ranked = _ranked_heap(starts, segment_scores(segment_hits))
+    picked = select_spaced(ranked, starts, max_segments, min_gap_s)
+    picked.sort(key=lambda i: starts[i])
+    return [(segments[i][0], segments[i][1], segment_hits[i]) for i in picked]
 
 
-def top_keywords(segments: List[Tuple[float, float, str]], keywords: List[str], limit: int = 8) -> List[str]:
+def top_keywords(segment_hits: Iterable[List[str]], keywords: List[str], limit: int = 8) -> List[str]:
     counts: Dict[str, int] = {k: 0 for k in keywords}
-    for _, _, text in segments:
-        t = text.lower()
-        for kw in keywords:
-            if kw in t:
-                counts[kw] += 1
+    for hits in segment_hits:
+        for kw in hits:
+            counts[kw] += 1
     ranked = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
     return [k for k, v in ranked if v > 0][:limit]
 
@@ -314,40 +344,152 @@ def render_note(
     return "\n".join(lines)
 
 
-def load_bach_intervals(source_id: str) -> List[Tuple[float, float]]:
-    path = SPEAKERS_DIR / f"{source_id}.speakers.json"
-    if not path.exists():
-        return []
+def load_segments(
+    sid: str,
+    idx: Optional[Dict[str, str]],
+    *,
+    max_text_chars: int,
+    bach_only: bool,
+) -> Optional[List[Tuple[float, float, str]]]:
+    """
+    The cues of a source's transcript that notes are built from, or None if it has none.
+    """
+    if not idx or idx.get("status") != "ok":
+        return None
+    offset_s = parse_offset_seconds(idx.get("time_offset_seconds", ""))
+    rel = idx.get("transcript_path", "")
+    if not rel:
+        return None
+    transcript_path = ROOT / rel
+    if not transcript_path.exists():
+        return None
+
+    # Web pages are one segment (no timecodes), which --max-text-chars normally drops.
+    with open_cues(sid, transcript_path, cache_dir=CUES_DIR, offset_s=offset_s, html_chunk_chars=None) as cues:
+        segments = [c for c in cues if len(c.text) <= max_text_chars]
+    if bach_only:
+        bach = bach_intervals(sid, SPEAKERS_DIR)
+        if bach:
+            inside = bach.contains_many([0.5 * (s[0] + s[1]) for s in segments])
+            segments = [s for s, ok in zip(segments, inside) if ok]
+    return segments
+
+
+def build_note(
+    source_id: str,
+    meta: Dict[str, str],
+    segments: List[Tuple[float, float, str]],
+    matcher: KeywordMatcher,
+    *,
+    max_segments: int,
+    min_gap_s: int,
+) -> str:
+    segment_hits = [matcher.hits(text) for _, _, text in segments]
+    dominant = top_keywords(segment_hits, matcher.keywords)
+    selected = top_segments(segments, segment_hits, max_segments, min_gap_s)
+    return render_note(source_id, meta, selected, dominant)
+
+
+@dataclass(frozen=True)
+class NotesOptions:
+    max_segments: int = 8
+    min_gap_s: int = 60
+    max_text_chars: int = 500
+    bach_only: bool = False
+
+
+def sha256_file(path: Path) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+def load_fingerprints(path: Path) -> Dict[str, Dict[str, object]]:
     try:
         data = json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        return []
-    segs = data.get("bach_segments") or []
-    out: List[Tuple[float, float]] = []
-    for s in segs:
-        try:
-            out.append((float(s.get("start_s", 0.0)), float(s.get("end_s", 0.0))))
-        except Exception:
-            continue
-    out.sort(key=lambda t: t[0])
-    return out
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != FINGERPRINTS_VERSION or not isinstance(data.get("sources"), dict):
+        return {}
+    return data["sources"]
 
 
-def in_intervals(t: float, intervals: List[Tuple[float, float]]) -> bool:
-    lo, hi = 0, len(intervals) - 1
-    while lo <= hi:
-        mid = (lo + hi) // 2
-        s, e = intervals[mid]
-        if t < s:
-            hi = mid - 1
-        elif t > e:
-            lo = mid + 1
-        else:
-            return True
-    return False
+def save_fingerprints(path: Path, entries: Dict[str, Dict[str, object]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    payload = {"version": FINGERPRINTS_VERSION, "sources": dict(sorted(entries.items()))}
+    tmp.write_text(json.dumps(payload, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
 
+def cached_sha256(path: Path, prev: object) -> Dict[str, object]:
+    """
+    {"sig": [mtime_ns, size], "sha256": ...} of a file; the hash is reused from `prev`
+    while the signature is unchanged, so unchanged transcripts are not re-read.
+    """
+    sig = file_signature(path)
+    if sig is None:
+        return {"sig": None, "sha256": ""}
+    if isinstance(prev, dict) and prev.get("sig") == list(sig) and prev.get("sha256"):
+        return {"sig": list(sig), "sha256": prev["sha256"]}
+    return {"sig": list(sig), "sha256": sha256_file(path)}
 
-def main() -> int:
+
+def builder_fingerprint() -> str:
+    """
+    Inputs shared by every note: this script (which holds the rendering), the `_core`
+    modules it parses cues and speaker turns with, and the keyword set.
+    """
+    keywords = hashlib.sha256("\n".join(KEYWORDS).encode("utf-8")).hexdigest()
+    return f"{code_fingerprint(Path(__file__))}:{keywords}"
+
+
+def note_inputs(
+    sid: str,
+    meta: Dict[str, str],
+    idx: Dict[str, str],
+    transcript: Dict[str, object],
+    speakers: Dict[str, object],
+    opts: NotesOptions,
+    builder: str,
+) -> str:
+    key = {
+        "builder": builder,
+        "options": asdict(opts),
+        "meta": {k: (meta.get(k) or "").strip() for k in ("title", "kind", "creator_or_channel", "published_date", "url", "language")},
+        "transcript_path": idx.get("transcript_path", ""),
+        "transcript": transcript.get("sha256"),
+        "offset": idx.get("time_offset_seconds", ""),
+        # The speaker file only matters when notes are restricted to Bach's turns.
+        "speakers": speakers.get("sha256") if opts.bach_only else "",
+    }
+    return hashlib.sha256(json.dumps([sid, key], sort_keys=True).encode("utf-8")).hexdigest()
+
+
+_MATCHER: Optional[KeywordMatcher] = None
+
+
+def init_worker() -> None:
+    # One compiled matcher per process, not per source.
+    global _MATCHER
+    _MATCHER = KeywordMatcher(KEYWORDS)
+
+
+def build_source(sid: str, meta: Dict[str, str], idx: Dict[str, str], out_path: str, opts: NotesOptions) -> str:
+    """
+    Build and write one source's note; returns the note's sha256 ("" if it has no transcript).
+    """
+    assert _MATCHER is not None
+    segments = load_segments(sid, idx, max_text_chars=opts.max_text_chars, bach_only=opts.bach_only)
+    if segments is None:
+        return ""
+    note = build_note(sid, meta, segments, _MATCHER, max_segments=opts.max_segments, min_gap_s=opts.min_gap_s)
+    Path(out_path).write_text(note, encoding="utf-8")
+    return hashlib.sha256(note.encode("utf-8")).hexdigest()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--sources", default=str(SOURCES_CSV), help="Path to sources.csv")
     ap.add_argument("--index", default=str(INDEX_CSV), help="Path to transcripts/_index.csv")
@@ -357,15 +499,22 @@ def main() -> int:
     ap.add_argument("--max-segments", type=int, default=8, help="Max segments to list per source")
     ap.add_argument("--min-gap", type=int, default=60, help="Min seconds between listed segments")
     ap.add_argument("--max-text-chars", type=int, default=500, help="Skip cues longer than this many chars")
-    ap.add_argument("--force", action="store_true", help="Overwrite existing notes")
-    args = ap.parse_args()
+    ap.add_argument("--force", action="store_true", help="Overwrite existing notes (unchanged ones are still skipped)")
+    ap.add_argument("--rebuild", action="store_true", help="Ignore recorded fingerprints and rebuild every selected note")
+    ap.add_argument("--jobs", type=int, default=0, help="Worker processes for notes that need rebuilding (0 = one per CPU)")
+    args = ap.parse_args(list(argv) if argv is not None else None)
 
     sources = load_sources(Path(args.sources))
     index = load_index(Path(args.index))
     out_dir = Path(args.out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
+    opts = NotesOptions(args.max_segments, args.min_gap, args.max_text_chars, args.bach_only)
 
+    prints = load_fingerprints(FINGERPRINTS_PATH)
+    builder = builder_fingerprint()
     want = set(args.source_id or [])
+    work: List[Tuple[str, Dict[str, str], Dict[str, str], Path, Dict[str, object]]] = []
+    skipped = 0
     for sid, meta in sources.items():
         if want and sid not in want:
             continue
@@ -373,28 +522,48 @@ def main() -> int:
         if out_path.exists() and not args.force:
             continue
         idx = index.get(sid)
-        if not idx or idx.get("status") != "ok":
+        if not idx or idx.get("status") != "ok" or not idx.get("transcript_path"):
             continue
-        offset_s = parse_offset_seconds(idx.get("time_offset_seconds", ""))
-        rel = idx.get("transcript_path", "")
-        if not rel:
+        prev = prints.get(sid) or {}
+        transcript = cached_sha256(ROOT / idx["transcript_path"], prev.get("transcript"))
+        if not transcript["sha256"]:
             continue
-        transcript_path = ROOT / rel
-        if not transcript_path.exists():
+        speakers = cached_sha256(SPEAKERS_DIR / f"{sid}{SPEAKERS_SUFFIX}", prev.get("speakers"))
+        entry: Dict[str, object] = {
+            "inputs": note_inputs(sid, meta, idx, transcript, speakers, opts, builder),
+            "transcript": transcript,
+            "speakers": speakers,
+        }
+        if (
+            not args.rebuild
+            and prev.get("inputs") == entry["inputs"]
+            and prev.get("note_sha256")
+            and prev.get("note_sha256") == sha256_file(out_path)
+        ):
+            skipped += 1
             continue
+        work.append((sid, meta, idx, out_path, entry))
 
-        segments = [s for s in iter_segments(transcript_path) if len(s[2]) <= args.max_text_chars]
-        if offset_s:
-            segments = [(max(0.0, s + offset_s), max(0.0, e + offset_s), t) for s, e, t in segments]
-        if args.bach_only:
-            intervals = load_bach_intervals(sid)
-            if intervals:
-                segments = [s for s in segments if in_intervals(0.5 * (s[0] + s[1]), intervals)]
-        dominant = top_keywords(segments, KEYWORDS)
-        selected = top_segments(segments, KEYWORDS, args.max_segments, args.min_gap)
-        note = render_note(sid, meta, selected, dominant)
-        out_path.write_text(note, encoding="utf-8")
+    def record(sid: str, entry: Dict[str, object], note_sha: str) -> None:
+        if note_sha:
+            prints[sid] = {**entry, "note_sha256": note_sha}
 
+    jobs = min(len(work), args.jobs if args.jobs > 0 else (os.cpu_count() or 1))
+    try:
+        if jobs <= 1:
+            init_worker()
+            for sid, meta, idx, out_path, entry in work:
+                record(sid, entry, build_source(sid, meta, idx, str(out_path), opts))
+        else:
+            with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker) as pool:
+                futs = [(sid, entry, pool.submit(build_source, sid, meta, idx, str(out_path), opts)) for sid, meta, idx, out_path, entry in work]
+                for sid, entry, fut in futs:
+                    record(sid, entry, fut.result())
+    finally:
+        # Record what was built even if a later source failed.
+        if work:
+            save_fingerprints(FINGERPRINTS_PATH, prints)
+    print(f"source notes: {len(work)} rebuilt, {skipped} unchanged")
     return 0
 
 
@@ -5,10 +5,19 @@ Local-only, lightweight speaker attribution helper for multi-speaker sources.
 Goal: mark approximate time ranges where Joscha Bach is speaking, so we can
 verify anchors and avoid mis-attribution in interviews/podcasts.
 
+Bach is picked as the cluster closest to a bank of reference voice profiles
+(transcripts/_speakers/_bach_bank.*, one per recording condition; grow it with
+--add-bach-ref). Cluster centroids are cached per source (<source_id>.clusters.npz) so
+--relabel can re-pick Bach after the bank changes without decoding audio again.
+
 Constraints:
 - No heavy ML deps (no torch). We reuse:
-  - faster_whisper.audio.decode_audio (PyAV) to decode media files
+  - faster_whisper.audio.decode_audio (PyAV) to decode media files, once, into the
+    shared PCM cache (transcripts/_pcm, see _core.pcm)
   - faster_whisper.vad (Silero ONNX) to detect speech regions
+- --stream decodes, runs the VAD and accumulates chunk features in fixed windows
+  (see _core.vad), so peak memory does not grow with the recording length; the
+  speaker file is the same as from the in-memory path.
 - Output goes under transcripts/ (gitignored).
 """
 
@@ -19,32 +28,46 @@ import csv
 import datetime as dt
 import json
 import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 import numpy as np
-from faster_whisper import audio as fw_audio
 from faster_whisper import vad as fw_vad
 
+from _core.kmeans import kmeans
+from _core.pcm import iter_pcm, load_pcm
+from _core.refbank import ReferenceBank
+from _core.vad import BATCH_SAMPLES, SpeechStream
+
 
 ROOT = Path(__file__).resolve().parents[1]
 SOURCES_CSV = ROOT / "sources" / "sources.csv"
 INDEX_CSV = ROOT / "transcripts" / "_index.csv"
 MEDIA_DIR = ROOT / "transcripts" / "_media"
 OUT_DIR = ROOT / "transcripts" / "_speakers"
+PCM_DIR = ROOT / "transcripts" / "_pcm"
+BANK_PATH = OUT_DIR / "_bach_bank.npy"  # + _bach_bank.json (profile names, counts, segments)
+LEGACY_REF_PATH = OUT_DIR / "_bach_ref.json"
+CLUSTERS_SUFFIX = ".clusters.npz"
+FEATURE = "logmel_mean"
 
 SR = 16000
 N_FFT = 512
 WIN_LENGTH = 400  # 25ms
 HOP_LENGTH = 160  # 10ms
 N_MELS = 40
+FRAME_BLOCK = 256  # frames per FFT block in logmel_means; small enough to stay in cache (~0.5 MB)
+STREAM_WINDOW = BATCH_SAMPLES  # samples per window with --stream (one VAD model batch, 320 s)
 
-# Reference audio snippets where Bach is speaking (start/end seconds).
-# These are local-only and can be edited if needed.
+# Reference audio snippets where Bach is speaking (start/end seconds, recording condition).
+# They seed the reference bank; add more with --add-bach-ref.
 BACH_REF_SLICES = [
-    ("ccc_38c3_self_models_of_loving_grace", 130.0, 730.0),
-    ("ccc_DS2017_8820_machine_dreams", 120.0, 720.0),
+    ("ccc_38c3_self_models_of_loving_grace", 130.0, 730.0, "conference"),
+    ("ccc_DS2017_8820_machine_dreams", 120.0, 720.0, "conference"),
 ]
 
 
@@ -120,6 +143,7 @@ def build_mel_filterbank(sr: int = SR, n_fft: int = N_FFT, n_mels: int = N_MELS)
 
 MEL_FB = build_mel_filterbank()
 WINDOW = np.hanning(WIN_LENGTH).astype(np.float32)
+MEL_FB_RI = np.repeat(MEL_FB.T, 2, axis=0)  # rows for interleaved (re, im) spectrum components
 
 
 def frame_audio(x: np.ndarray, win_length: int = WIN_LENGTH, hop_length: int = HOP_LENGTH) -> np.ndarray:
@@ -150,42 +174,122 @@ def logmel_mean(x: np.ndarray) -> Optional[np.ndarray]:
     return log_mel.mean(axis=0)
 
 
-def kmeans(x: np.ndarray, k: int, seed: int = 0, iters: int = 30) -> Tuple[np.ndarray, np.ndarray, float]:
-    # Minimal k-means; good enough for local-only diarization heuristics.
-    rng = np.random.default_rng(seed)
-    n = x.shape[0]
-    if n == 0:
-        raise ValueError("empty dataset")
-    k = max(1, min(k, n))
-    idx = rng.choice(n, size=k, replace=False)
-    centroids = x[idx].copy()
-
-    labels = np.zeros((n,), dtype=np.int32)
-    for _ in range(iters):
-        # Assign
-        d2 = ((x[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
-        new_labels = d2.argmin(axis=1).astype(np.int32)
-        if np.array_equal(new_labels, labels):
-            break
-        labels = new_labels
-
-        # Update
-        for j in range(k):
-            mask = labels == j
-            if not np.any(mask):
-                # Re-seed an empty cluster.
-                centroids[j] = x[rng.integers(0, n)]
-            else:
-                centroids[j] = x[mask].mean(axis=0)
+def logmel_means(y: np.ndarray, spans: Sequence[Tuple[int, int]], *, block_frames: int = FRAME_BLOCK) -> List[Optional[np.ndarray]]:
+    """
+    `logmel_mean(y[a0:a1])` for every sample span, computed for the whole file at once.
+
+    Windowed frames of all spans are packed into one zero-padded block buffer and
+    transformed together (one rfft + one mel matmul per block rather than per chunk);
+    each span's mean is a difference of the running cumulative sum at its first and last
+    frame. Memory is bounded by the block size, not the file length.
+    """
+    y = np.asarray(y)
+    counts = [max(0, 1 + (min(a1, len(y)) - a0 - WIN_LENGTH) // HOP_LENGTH) for a0, a1 in spans]
+    bounds = np.concatenate([np.zeros(1, dtype=np.int64), np.cumsum(counts, dtype=np.int64)])
+    out: List[Optional[np.ndarray]] = [None] * len(spans)
+    if bounds[-1] == 0:
+        return out
+
+    buf = np.zeros((min(block_frames, int(bounds[-1])), N_FFT), dtype=np.float32)
+    csum_at = np.zeros((len(bounds), N_MELS), dtype=np.float64)  # cumulative sum before frame bounds[i]
+    carry = np.zeros(N_MELS, dtype=np.float64)
+    stride = y.strides[0]
+    b0 = 0  # global index of the frame in buf[0]
+
+    def flush(n: int) -> None:
+        nonlocal carry
+        spec = np.fft.rfft(buf[:n], axis=1)
+        # |X|^2 @ fb == (re^2, im^2 interleaved) @ fb repeated per component.
+        sq = spec.view(np.float32)
+        np.square(sq, out=sq)
+        log_mel = np.log(sq @ MEL_FB_RI + 1e-10, dtype=np.float32)
+        block_csum = np.cumsum(log_mel, axis=0, dtype=np.float64)
+        block_csum += carry
+        lo, hi = np.searchsorted(bounds, [b0, b0 + n], side="right")
+        csum_at[lo:hi] = block_csum[bounds[lo:hi] - b0 - 1]
+        carry = block_csum[-1]
+
+    filled = 0
+    for (a0, _a1), n in zip(spans, counts):
+        f = 0
+        while f < n:
+            take = min(n - f, len(buf) - filled)
+            frames = np.lib.stride_tricks.as_strided(
+                y[a0 + f * HOP_LENGTH :],
+                shape=(take, WIN_LENGTH),
+                strides=(HOP_LENGTH * stride, stride),
+                writeable=False,
+            )
+            np.multiply(frames, WINDOW[None, :], out=buf[filled : filled + take, :WIN_LENGTH])
+            filled += take
+            f += take
+            if filled == len(buf):
+                flush(filled)
+                b0 += filled
+                filled = 0
+    if filled:
+        flush(filled)
+
+    for i, n in enumerate(counts):
+        if n:
+            out[i] = ((csum_at[i + 1] - csum_at[i]) / n).astype(np.float32)
+    return out
 
-    inertia = float(((x - centroids[labels]) ** 2).sum())
-    return labels, centroids, inertia
 
+def logmel_means_windowed(
+    windows: Iterable[np.ndarray],
+    spans: Sequence[Tuple[int, int]],
+    *,
+    block_frames: int = FRAME_BLOCK,
+) -> List[Optional[np.ndarray]]:
+    """
+    `logmel_means` over a recording given as consecutive windows of samples.
+
+    Spans (sorted by start) are computed as soon as the windows read so far cover them;
+    only the samples from the start of the first pending span onward are kept, so memory
+    is about one window plus one span.
+    """
+    out: List[Optional[np.ndarray]] = [None] * len(spans)
+    buf = np.zeros(0, dtype=np.float32)
+    buf0 = 0  # sample index of buf[0]
+    i = 0  # first pending span
+    for w in windows:
+        buf = np.concatenate([buf, w]) if len(buf) else np.asarray(w, dtype=np.float32)
+        buf1 = buf0 + len(buf)
+        j = i
+        while j < len(spans) and spans[j][1] <= buf1:
+            j += 1
+        if j > i:
+            out[i:j] = logmel_means(buf, [(a0 - buf0, a1 - buf0) for a0, a1 in spans[i:j]], block_frames=block_frames)
+            i = j
+        keep = min(max(spans[i][0], buf0), buf1) if i < len(spans) else buf1
+        buf = buf[keep - buf0 :]
+        buf0 = keep
+    if i < len(spans):
+        # Spans running past the end of the recording (clipped like logmel_means does).
+        out[i:] = logmel_means(buf, [(a0 - buf0, a1 - buf0) for a0, a1 in spans[i:]], block_frames=block_frames)
+    return out
 
-def cosine_sim(a: np.ndarray, b: np.ndarray) -> float:
-    na = float(np.linalg.norm(a) + 1e-12)
-    nb = float(np.linalg.norm(b) + 1e-12)
-    return float(np.dot(a, b) / (na * nb))
+
+def speech_chunks(
+    speech: Sequence[Dict[str, int]],
+    chunk_s: float,
+    min_chunk_s: float,
+) -> List[Tuple[float, float]]:
+    """
+    Split VAD speech regions into analysis chunks of at most `chunk_s` seconds.
+    """
+    chunks: List[Tuple[float, float]] = []
+    for seg in speech:
+        s0 = float(seg["start"]) / SR
+        s1 = float(seg["end"]) / SR
+        t = s0
+        while t < s1:
+            t2 = min(t + chunk_s, s1)
+            if t2 - t >= min_chunk_s:
+                chunks.append((t, t2))
+            t = t2
+    return chunks
 
 
 def merge_segments(segments: List[Tuple[float, float, str]], gap_s: float = 0.5) -> List[Tuple[float, float, str]]:
@@ -220,56 +324,63 @@ def merge_intervals(intervals: List[Tuple[float, float]], gap_s: float = 0.5) ->
     return out
 
 
-def compute_bach_reference(index: Dict[str, Dict[str, str]]) -> np.ndarray:
-    feats: List[np.ndarray] = []
-    for sid, start_s, end_s in BACH_REF_SLICES:
-        media = find_media_path(sid, index)
-        if media is None:
-            continue
-        y = fw_audio.decode_audio(str(media), sampling_rate=SR)
-        lo = int(max(0.0, start_s) * SR)
-        hi = int(min(float(len(y)) / SR, end_s) * SR)
-        if hi <= lo:
-            continue
-        chunk_len = int(8.0 * SR)
-        t = lo
-        while t + int(2.0 * SR) <= hi:
-            t2 = min(t + chunk_len, hi)
-            f = logmel_mean(y[t:t2])
-            if f is not None:
-                feats.append(f)
-            t = t2
-    if not feats:
-        raise RuntimeError("failed to build Bach reference; missing reference audio in transcripts/_media")
-    ref = np.stack(feats, axis=0).mean(axis=0)
-    return ref.astype(np.float32)
-
-
-def load_or_build_bach_reference(index: Dict[str, Dict[str, str]]) -> np.ndarray:
-    OUT_DIR.mkdir(parents=True, exist_ok=True)
-    path = OUT_DIR / "_bach_ref.json"
-    if path.exists():
-        data = json.loads(path.read_text(encoding="utf-8"))
+def segment_features(y: np.ndarray, start_s: float, end_s: float) -> np.ndarray:
+    """
+    Chunk features (8 s chunks, at least 2 s) of one reference segment.
+    """
+    lo = int(max(0.0, start_s) * SR)
+    hi = int(min(float(len(y)) / SR, end_s) * SR)
+    chunk_len = int(8.0 * SR)
+    spans: List[Tuple[int, int]] = []
+    t = lo
+    while t + int(2.0 * SR) <= hi:
+        t2 = min(t + chunk_len, hi)
+        spans.append((t, t2))
+        t = t2
+    feats = [f for f in logmel_means(y, spans) if f is not None]
+    return np.stack(feats, axis=0) if feats else np.zeros((0, N_MELS), dtype=np.float32)
+
+
+def guess_condition(meta: Dict[str, str]) -> str:
+    return "conference" if (meta.get("kind") or "") == "ccc" else "podcast"
+
+
+def add_bach_segment(
+    bank: ReferenceBank,
+    sid: str,
+    start_s: float,
+    end_s: float,
+    condition: str,
+    index: Dict[str, Dict[str, str]],
+) -> bool:
+    segment = {"source_id": sid, "start_s": float(start_s), "end_s": float(end_s)}
+    if bank.has_segment(segment):
+        return False
+    media = find_media_path(sid, index)
+    if media is None:
+        print(f"missing media for reference {sid}")
+        return False
+    y = load_pcm(media, PCM_DIR, sampling_rate=SR)
+    return bank.add(condition, segment_features(y, start_s, end_s), segment)
+
+
+def load_or_build_bank(index: Dict[str, Dict[str, str]]) -> ReferenceBank:
+    bank = ReferenceBank.load(BANK_PATH)
+    if bank is not None and len(bank):
+        return bank
+    bank = ReferenceBank.empty(N_MELS, feature=FEATURE)
+    for sid, start_s, end_s, condition in BACH_REF_SLICES:
+        add_bach_segment(bank, sid, start_s, end_s, condition, index)
+    if not len(bank) and LEGACY_REF_PATH.exists():
+        # Reference audio is gone but an old single-vector reference is still around.
+        data = json.loads(LEGACY_REF_PATH.read_text(encoding="utf-8"))
         vec = np.array(data.get("logmel_mean", []), dtype=np.float32)
         if vec.shape == (N_MELS,):
-            return vec
-    ref = compute_bach_reference(index)
-    path.write_text(
-        json.dumps(
-            {
-                "generated_at": now_iso(),
-                "feature": "logmel_mean",
-                "n_mels": N_MELS,
-                "ref_slices": [{"source_id": sid, "start_s": s, "end_s": e} for sid, s, e in BACH_REF_SLICES],
-                "logmel_mean": ref.tolist(),
-            },
-            indent=2,
-            sort_keys=True,
-        )
-        + "\n",
-        encoding="utf-8",
-    )
-    return ref
+            bank.add("conference", vec[None, :], {"source_id": LEGACY_REF_PATH.name, "start_s": 0.0, "end_s": 0.0})
+    if not len(bank):
+        raise RuntimeError("failed to build Bach reference; missing reference audio in transcripts/_media")
+    bank.save(BANK_PATH, updated_at=now_iso())
+    return bank
 
 
 def guess_num_speakers(meta: Dict[str, str]) -> int:
@@ -313,119 +424,410 @@ def is_likely_multi_speaker(meta: Dict[str, str]) -> bool:
     return False
 
 
+@dataclass(frozen=True)
+class DiarizeOptions:
+    num_speakers: int = 0
+    chunk_seconds: float = 8.0
+    min_chunk_seconds: float = 2.0
+    kmeans_restarts: int = 4
+    stream: bool = False  # windowed decode/VAD/features (same result, bounded memory)
+
+
+@dataclass
+class SourceClusters:
+    """
+    Everything needed to (re-)label a source without re-extracting features.
+    """
+
+    chunks: np.ndarray  # (n, 2) chunk start/end seconds
+    labels: np.ndarray  # (n,) cluster per chunk
+    centroids: np.ndarray  # (k, d) standardized
+    mu: np.ndarray
+    sd: np.ndarray
+    inertia: float
+    audio_path: str
+    media_duration_s: float
+    chunk_seconds: float
+    min_chunk_seconds: float
+
+    def save(self, path: Path) -> None:
+        meta = {
+            "inertia": self.inertia,
+            "audio_path": self.audio_path,
+            "media_duration_s": self.media_duration_s,
+            "chunk_seconds": self.chunk_seconds,
+            "min_chunk_seconds": self.min_chunk_seconds,
+        }
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with tmp.open("wb") as f:
+            np.savez(
+                f,
+                chunks=self.chunks,
+                labels=self.labels,
+                centroids=self.centroids,
+                mu=self.mu,
+                sd=self.sd,
+                meta=np.array(json.dumps(meta)),
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["SourceClusters"]:
+        try:
+            with np.load(path) as z:
+                meta = json.loads(str(z["meta"]))
+                return cls(z["chunks"], z["labels"], z["centroids"], z["mu"], z["sd"], **meta)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+
+def clusters_path(sid: str) -> Path:
+    return OUT_DIR / f"{sid}{CLUSTERS_SUFFIX}"
+
+
+def cluster_source(sid: str, meta: Dict[str, str], media: Path, opts: DiarizeOptions) -> Tuple[str, Optional[SourceClusters]]:
+    """
+    Extract chunk features and cluster them; returns ("ok", clusters) or (reason, None).
+    """
+    if opts.stream:
+        print(f"decode+vad (streaming): {sid} ({media.name})")
+        vad = SpeechStream(sampling_rate=SR)
+        for w in iter_pcm(media, PCM_DIR, sampling_rate=SR, window=STREAM_WINDOW):
+            vad.feed(w)
+        speech = vad.finish()
+        media_duration_s = float(vad.n_samples) / float(SR)
+    else:
+        print(f"decode: {sid} ({media.name})")
+        y = load_pcm(media, PCM_DIR, sampling_rate=SR)
+        media_duration_s = float(len(y)) / float(SR)
+
+        print(f"vad: {sid}")
+        speech = fw_vad.get_speech_timestamps(y, sampling_rate=SR)
+    if not speech:
+        print(f"no speech detected: {sid}")
+        return "no speech", None
+
+    # Build analysis chunks within speech regions.
+    chunk_s = float(opts.chunk_seconds)
+    min_chunk_s = float(opts.min_chunk_seconds)
+    chunks: List[Tuple[float, float]] = []
+    feats: List[np.ndarray] = []
+    candidates = speech_chunks(speech, chunk_s, min_chunk_s)
+    spans = [(int(t * SR), int(t2 * SR)) for t, t2 in candidates]
+    if opts.stream:
+        # Second pass over the (now cached) PCM; keeps only the chunk features.
+        candidate_feats = logmel_means_windowed(iter_pcm(media, PCM_DIR, sampling_rate=SR, window=STREAM_WINDOW), spans)
+    else:
+        candidate_feats = logmel_means(y, spans)
+    for span, f in zip(candidates, candidate_feats, strict=True):
+        if f is not None:
+            chunks.append(span)
+            feats.append(f)
+
+    if not feats:
+        print(f"no usable chunks: {sid}")
+        return "no usable chunks", None
+
+    x = np.stack(feats, axis=0).astype(np.float32)
+    # Standardize for k-means.
+    mu = x.mean(axis=0)
+    sd = x.std(axis=0) + 1e-6
+    xz = (x - mu) / sd
+
+    k = opts.num_speakers if opts.num_speakers > 0 else guess_num_speakers(meta)
+    km = kmeans(xz, k=k, seed=0, n_init=opts.kmeans_restarts)
+    labels, centroids, inertia = km.labels, km.centroids, km.inertia
+
+    return "ok", SourceClusters(
+        np.array(chunks, dtype=np.float64).reshape(-1, 2),
+        labels,
+        centroids,
+        mu,
+        sd,
+        inertia,
+        str(media.relative_to(ROOT)),
+        media_duration_s,
+        chunk_s,
+        min_chunk_s,
+    )
+
+
+def label_source(sid: str, meta: Dict[str, str], sc: SourceClusters, bank: ReferenceBank) -> dict:
+    """
+    Pick the Bach cluster by scoring centroids against the nearest bank profile, and
+    build the speakers document.
+    """
+    scores = bank.score(sc.centroids, sc.mu, sc.sd)
+    sims: List[Tuple[str, float, int, str]] = []
+    for j, (sim, profile) in enumerate(scores):
+        sims.append((f"spk{j}", sim, int((sc.labels == j).sum()), profile))
+    sims.sort(key=lambda t: t[1], reverse=True)
+    multi = is_likely_multi_speaker(meta)
+    if not multi:
+        # For solo talks/lectures, the dominant speaker is overwhelmingly likely to be Bach.
+        bach_label = max(sims, key=lambda t: t[2])[0]
+    else:
+        bach_label = sims[0][0]
+
+    # Merge chunk labels into contiguous time segments.
+    segs: List[Tuple[float, float, str]] = []
+    for (t0, t1), lab in zip(sc.chunks.tolist(), sc.labels, strict=True):
+        segs.append((t0, t1, f"spk{int(lab)}"))
+    segs = merge_segments(segs, gap_s=0.25)
+
+    bach_intervals = merge_intervals([(s, e) for s, e, l in segs if l == bach_label], gap_s=0.25)
+
+    return {
+        "source_id": sid,
+        "generated_at": now_iso(),
+        "audio_path": sc.audio_path,
+        "media_duration_s": sc.media_duration_s,
+        "feature": FEATURE,
+        "sample_rate_hz": SR,
+        "chunk_seconds": sc.chunk_seconds,
+        "min_chunk_seconds": sc.min_chunk_seconds,
+        "num_speakers": int(sc.centroids.shape[0]),
+        "kmeans_inertia": sc.inertia,
+        "multi_speaker_heuristic": bool(multi),
+        "bach_label": bach_label,
+        "reference_bank": {"profiles": bank.names, "updated_at": bank.updated_at},
+        "clusters": [
+            {"label": l, "similarity_to_bach": float(sim), "bach_profile": profile, "chunk_count": n}
+            for l, sim, n, profile in sims
+        ],
+        "segments": [{"start_s": float(s), "end_s": float(e), "label": l} for s, e, l in segs],
+        "bach_segments": [{"start_s": float(s), "end_s": float(e)} for s, e in bach_intervals],
+    }
+
+
+def write_speakers(sid: str, out: dict) -> Path:
+    out_path = OUT_DIR / f"{sid}.speakers.json"
+    out_path.write_text(json.dumps(out, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print(f"ok: {sid} -> {out_path}")
+    return out_path
+
+
+def summary_row(sid: str, status: str, out: Optional[dict]) -> Dict[str, object]:
+    row: Dict[str, object] = {"source_id": sid, "status": status, "bach_s": 0.0, "bach_share": 0.0, "media_duration_s": 0.0}
+    if out is not None:
+        bach_s = sum(seg["end_s"] - seg["start_s"] for seg in out["bach_segments"])
+        duration = float(out["media_duration_s"]) or 1.0
+        row.update({"bach_s": round(bach_s, 1), "bach_share": round(bach_s / duration, 4), "media_duration_s": round(duration, 1)})
+    return row
+
+
+_BANK: Optional[ReferenceBank] = None
+
+
+def init_worker(bank: ReferenceBank) -> None:
+    # The reference bank is handed to each worker once, not per source.
+    global _BANK
+    _BANK = bank
+
+
+def diarize_job(sid: str, meta: Dict[str, str], media: str, opts: DiarizeOptions) -> Dict[str, object]:
+    """
+    Diarize one source, caching its clusters and writing its speaker file; returns its summary row.
+    """
+    assert _BANK is not None
+    t0 = time.perf_counter()
+    out: Optional[dict] = None
+    try:
+        status, sc = cluster_source(sid, meta, Path(media), opts)
+        if sc is not None:
+            sc.save(clusters_path(sid))
+            out = label_source(sid, meta, sc, _BANK)
+            write_speakers(sid, out)
+    except Exception as exc:  # noqa: BLE001 - keep the batch going
+        status, out = f"error: {exc}", None
+        print(f"error: {sid}: {exc}")
+    row = summary_row(sid, status, out)
+    row["wall_s"] = round(time.perf_counter() - t0, 2)
+    return row
+
+
+def relabel_job(sid: str, meta: Dict[str, str], bank: ReferenceBank) -> Dict[str, object]:
+    """
+    Re-score a source's cached clusters against the current bank (no decoding).
+    """
+    t0 = time.perf_counter()
+    sc = SourceClusters.load(clusters_path(sid))
+    if sc is None:
+        print(f"no cached clusters for {sid} (diarize it first)")
+        row = summary_row(sid, "no cached clusters", None)
+    else:
+        out = label_source(sid, meta, sc, bank)
+        write_speakers(sid, out)
+        row = summary_row(sid, "relabeled", out)
+    row["wall_s"] = round(time.perf_counter() - t0, 2)
+    return row
+
+
+def parse_ref_spec(spec: str) -> Tuple[str, float, float, Optional[str]]:
+    """
+    SOURCE_ID:START_S:END_S[:CONDITION]
+    """
+    parts = spec.split(":")
+    if len(parts) not in {3, 4}:
+        raise ValueError(f"bad --add-bach-ref (want SOURCE_ID:START_S:END_S[:CONDITION]): {spec}")
+    start_s, end_s = float(parts[1]), float(parts[2])
+    if end_s <= start_s:
+        raise ValueError(f"bad --add-bach-ref (end before start): {spec}")
+    return parts[0], start_s, end_s, (parts[3] if len(parts) == 4 and parts[3] else None)
+
+
+def is_up_to_date(out_path: Path, media: Path, opts: DiarizeOptions) -> bool:
+    """
+    True if the speaker file was made from this media file (and is newer than it)
+    with the same chunking.
+    """
+    try:
+        if out_path.stat().st_mtime_ns < media.stat().st_mtime_ns:
+            return False
+        data = json.loads(out_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return (
+        data.get("audio_path") == str(media.relative_to(ROOT))
+        and data.get("chunk_seconds") == opts.chunk_seconds
+        and data.get("min_chunk_seconds") == opts.min_chunk_seconds
+    )
+
+
+def write_batch_summary(path: Path, rows: List[Dict[str, object]], *, jobs: int, wall_s: float) -> None:
+    rows = sorted(rows, key=lambda r: str(r["source_id"]))
+    path.write_text(
+        json.dumps(
+            {"generated_at": now_iso(), "jobs": jobs, "wall_s": round(wall_s, 1), "sources": rows},
+            indent=2,
+            sort_keys=True,
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+    print(f"{'source_id':48} {'status':18} {'wall_s':>8} {'bach%':>6}")
+    for r in rows:
+        print(f"{str(r['source_id']):48} {str(r['status'])[:18]:18} {r['wall_s']:>8} {100 * float(r['bach_share']):6.1f}")  # type: ignore[arg-type]
+    print(f"summary: {path} ({len(rows)} sources, {wall_s:.0f}s wall)")
+
+
 def main(argv: Optional[Sequence[str]] = None) -> int:
     ap = argparse.ArgumentParser()
-    ap.add_argument("--source-id", action="append", required=True)
+    ap.add_argument("--source-id", action="append", default=[])
+    ap.add_argument(
+        "--all-multi-speaker",
+        action="store_true",
+        help="Diarize every likely multi-speaker source (sources.csv) with media and no up-to-date speaker file",
+    )
+    ap.add_argument("--jobs", type=int, default=0, help="Worker processes (0 = one per CPU)")
     ap.add_argument("--num-speakers", type=int, default=0, help="Override speaker count (0 = auto)")
     ap.add_argument("--chunk-seconds", type=float, default=8.0, help="Chunk length for clustering")
     ap.add_argument("--min-chunk-seconds", type=float, default=2.0, help="Skip chunks shorter than this")
+    ap.add_argument("--kmeans-restarts", type=int, default=4, help="k-means++ restarts; the lowest-inertia run is kept")
+    ap.add_argument(
+        "--stream",
+        action="store_true",
+        help="Decode, VAD and extract features in fixed windows (peak memory independent of recording length)",
+    )
+    ap.add_argument(
+        "--add-bach-ref",
+        action="append",
+        default=[],
+        metavar="SOURCE_ID:START_S:END_S[:CONDITION]",
+        help="Add a confirmed-Bach segment to the reference bank (condition default: conference for ccc, else podcast)",
+    )
+    ap.add_argument(
+        "--relabel",
+        action="store_true",
+        help="Re-pick Bach clusters of the selected sources against the current bank from cached clusters (no decoding)",
+    )
     ap.add_argument("--force", action="store_true", help="Overwrite existing speaker files")
     args = ap.parse_args(list(argv) if argv is not None else None)
-
+    if not args.source_id and not args.all_multi_speaker and not args.add_bach_ref:
+        ap.error("pass --source-id, --all-multi-speaker and/or --add-bach-ref")
+    try:
+        refs = [parse_ref_spec(spec) for spec in args.add_bach_ref]
+    except ValueError as exc:
+        ap.error(str(exc))
+
+    opts = DiarizeOptions(args.num_speakers, args.chunk_seconds, args.min_chunk_seconds, args.kmeans_restarts, args.stream)
     sources = load_sources()
     index = load_index()
-    bach_ref = load_or_build_bach_reference(index)
 
     OUT_DIR.mkdir(parents=True, exist_ok=True)
 
+    if refs:
+        bank = load_or_build_bank(index)
+        added = 0
+        for sid, start_s, end_s, condition in refs:
+            condition = condition or guess_condition(sources.get(sid, {}))
+            if add_bach_segment(bank, sid, start_s, end_s, condition, index):
+                added += 1
+                print(f"bank: added {sid} {start_s:.1f}-{end_s:.1f}s to {condition}")
+            else:
+                print(f"bank: skipped {sid} {start_s:.1f}-{end_s:.1f}s (already in bank or no audio)")
+        if added:
+            bank.save(BANK_PATH, updated_at=now_iso())
+        print("bank: " + ", ".join(f"{p.name} ({p.count} chunks)" for p in bank.profiles))
+
+    if args.relabel:
+        todo = list(args.source_id)
+        if args.all_multi_speaker:
+            todo += [
+                sid
+                for sid, meta in sorted(sources.items())
+                if sid not in todo and is_likely_multi_speaker(meta) and clusters_path(sid).exists()
+            ]
+        if not todo:
+            return 0
+        bank = load_or_build_bank(index)
+        t0 = time.perf_counter()
+        rows = [relabel_job(sid, sources.get(sid, {}), bank) for sid in todo]
+        if args.all_multi_speaker:
+            write_batch_summary(OUT_DIR / "_batch_summary.json", rows, jobs=1, wall_s=time.perf_counter() - t0)
+        return 0
+
+    work: List[Tuple[str, Dict[str, str], Path]] = []
     for sid in args.source_id:
         out_path = OUT_DIR / f"{sid}.speakers.json"
         if out_path.exists() and not args.force:
             print(f"skip (exists): {out_path}")
             continue
-
-        meta = sources.get(sid, {})
         media = find_media_path(sid, index)
         if media is None:
             print(f"missing media for {sid} (download audio to transcripts/_media first)")
             continue
-
-        print(f"decode: {sid} ({media.name})")
-        y = fw_audio.decode_audio(str(media), sampling_rate=SR)
-        media_duration_s = float(len(y)) / float(SR)
-
-        print(f"vad: {sid}")
-        speech = fw_vad.get_speech_timestamps(y, sampling_rate=SR)
-        if not speech:
-            print(f"no speech detected: {sid}")
-            continue
-
-        # Build analysis chunks within speech regions.
-        chunk_s = float(args.chunk_seconds)
-        min_chunk_s = float(args.min_chunk_seconds)
-        chunks: List[Tuple[float, float]] = []
-        feats: List[np.ndarray] = []
-
-        for seg in speech:
-            s0 = float(seg["start"]) / SR
-            s1 = float(seg["end"]) / SR
-            t = s0
-            while t < s1:
-                t2 = min(t + chunk_s, s1)
-                if t2 - t >= min_chunk_s:
-                    a0 = int(t * SR)
-                    a1 = int(t2 * SR)
-                    f = logmel_mean(y[a0:a1])
-                    if f is not None:
-                        chunks.append((t, t2))
-                        feats.append(f)
-                t = t2
-
-        if not feats:
-            print(f"no usable chunks: {sid}")
-            continue
-
-        x = np.stack(feats, axis=0).astype(np.float32)
-        # Standardize for k-means.
-        mu = x.mean(axis=0)
-        sd = x.std(axis=0) + 1e-6
-        xz = (x - mu) / sd
-
-        k = args.num_speakers if args.num_speakers > 0 else guess_num_speakers(meta)
-        labels, centroids, inertia = kmeans(xz, k=k, seed=0)
-
-        # Find which cluster is most similar to the Bach reference.
-        ref_z = (bach_ref - mu) / sd
-        sims: List[Tuple[str, float, int]] = []
-        for j in range(centroids.shape[0]):
-            sim = cosine_sim(centroids[j], ref_z)
-            sims.append((f"spk{j}", sim, int((labels == j).sum())))
-        sims.sort(key=lambda t: t[1], reverse=True)
-        multi = is_likely_multi_speaker(meta)
-        if not multi:
-            # For solo talks/lectures, the dominant speaker is overwhelmingly likely to be Bach.
-            bach_label = max(sims, key=lambda t: t[2])[0]
-        else:
-            bach_label = sims[0][0]
-
-        # Merge chunk labels into contiguous time segments.
-        segs: List[Tuple[float, float, str]] = []
-        for (t0, t1), lab in zip(chunks, labels, strict=True):
-            segs.append((t0, t1, f"spk{int(lab)}"))
-        segs = merge_segments(segs, gap_s=0.25)
-
-        bach_intervals = merge_intervals([(s, e) for s, e, l in segs if l == bach_label], gap_s=0.25)
-
-        out = {
-            "source_id": sid,
-            "generated_at": now_iso(),
-            "audio_path": str(media.relative_to(ROOT)),
-            "media_duration_s": media_duration_s,
-            "feature": "logmel_mean",
-            "sample_rate_hz": SR,
-            "chunk_seconds": chunk_s,
-            "min_chunk_seconds": min_chunk_s,
-            "num_speakers": int(centroids.shape[0]),
-            "kmeans_inertia": inertia,
-            "multi_speaker_heuristic": bool(multi),
-            "bach_label": bach_label,
-            "clusters": [{"label": l, "similarity_to_bach": float(sim), "chunk_count": n} for l, sim, n in sims],
-            "segments": [{"start_s": float(s), "end_s": float(e), "label": l} for s, e, l in segs],
-            "bach_segments": [{"start_s": float(s), "end_s": float(e)} for s, e in bach_intervals],
-        }
-        out_path.write_text(json.dumps(out, indent=2, sort_keys=True) + "\n", encoding="utf-8")
-        print(f"ok: {sid} -> {out_path}")
-
+        work.append((sid, sources.get(sid, {}), media))
+    if args.all_multi_speaker:
+        chosen = {sid for sid, _m, _p in work} | set(args.source_id)
+        for sid, meta in sorted(sources.items()):
+            if sid in chosen or not is_likely_multi_speaker(meta):
+                continue
+            media = find_media_path(sid, index)
+            if media is None:
+                continue
+            if not args.force and is_up_to_date(OUT_DIR / f"{sid}.speakers.json", media, opts):
+                continue
+            work.append((sid, meta, media))
+        print(f"batch: {len(work)} sources to diarize")
+    if not work:
+        return 0
+
+    bank = load_or_build_bank(index)
+    jobs = min(len(work), args.jobs if args.jobs > 0 else (os.cpu_count() or 1))
+    t0 = time.perf_counter()
+    rows: List[Dict[str, object]] = []
+    if jobs == 1:
+        init_worker(bank)
+        rows = [diarize_job(sid, meta, str(media), opts) for sid, meta, media in work]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=(bank,)) as pool:
+            futs = [pool.submit(diarize_job, sid, meta, str(media), opts) for sid, meta, media in work]
+            for fut in as_completed(futs):
+                rows.append(fut.result())
+
+    if args.all_multi_speaker:
+        write_batch_summary(OUT_DIR / "_batch_summary.json", rows, jobs=jobs, wall_s=time.perf_counter() - t0)
     return 0
 
 
@@ -16,6 +16,8 @@ from __future__ import annotations
 import re
 from pathlib import Path
 
+from _core import corpus
+
 
 ROOT = Path(__file__).resolve().parents[1]
 CHAPTERS_DIR = ROOT / "manuscript" / "chapters"
@@ -88,14 +90,14 @@ def transform(text: str) -> str:
 def main() -> int:
     OUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    chapters = sorted(CHAPTERS_DIR.glob("ch*.md"))
+    chapters = corpus.chapter_paths(CHAPTERS_DIR)
     if not chapters:
         raise SystemExit(f"no chapters found under {CHAPTERS_DIR}")
 
     index_lines = ["# Chapter Series", "", "Standalone exports of the manuscript chapters.", ""]
 
     for ch in chapters:
-        src = ch.read_text(encoding="utf-8", errors="replace")
+        src = corpus.read_text(ch)
         title = chapter_title(src, ch.stem)
 
         body = transform(src)
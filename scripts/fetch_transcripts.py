@@ -3,9 +3,13 @@
 Fetch local-only transcripts for sources in sources/sources.csv.
 
 Design goals:
-- Deterministic, restartable: writes progress to transcripts/_index.csv after each source.
+- Deterministic, restartable: journals each finished source (transcripts/_index.journal.jsonl)
+  and compacts the journal into transcripts/_index.csv periodically and at exit.
 - Prefers English captions when available; falls back to German; else one arbitrary language.
+  YouTube tracks are picked from one yt-dlp metadata call, then exactly one is downloaded.
 - Never downloads full video (captions only). If no captions exist, marks needs_asr.
+- Polite in parallel: sources run as asyncio tasks, and every request is gated per host
+  (concurrency + token-bucket rate, slowed down on HTTP 429) with a bounded yt-dlp pool.
 
 Note: transcripts/ is gitignored by design.
 """
@@ -13,26 +17,32 @@ Note: transcripts/ is gitignored by design.
 from __future__ import annotations
 
 import argparse
+import asyncio
 import csv
 import datetime as dt
+import json
 import os
 import re
 import shutil
 import subprocess
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
-from urllib.request import Request, urlopen
+from urllib.error import HTTPError
 from http.client import IncompleteRead
 
+from _core.hostlimit import HostPolicy, HostScheduler, run_subprocess
+from _core.httpclient import HttpClient
+from _core.journal import IndexJournal
+
 
 ROOT = Path(__file__).resolve().parents[1]
 SOURCES_CSV = ROOT / "sources" / "sources.csv"
 TRANSCRIPTS_DIR = ROOT / "transcripts"
 INDEX_CSV = TRANSCRIPTS_DIR / "_index.csv"
+INDEX_JOURNAL = TRANSCRIPTS_DIR / "_index.journal.jsonl"
 
 def _resolve_bin(env_key: str, fallback: str) -> str:
     override = (os.environ.get(env_key) or "").strip()
@@ -48,6 +58,14 @@ YTDLP_SLEEP_REQUESTS = os.environ.get("YTDLP_SLEEP_REQUESTS", "1")
 YTDLP_COOKIES_FROM_BROWSER = os.environ.get("YTDLP_COOKIES_FROM_BROWSER", "")
 YTDLP_COOKIES = os.environ.get("YTDLP_COOKIES", "")
 
+# Per-host request limits; any other host gets DEFAULT_HOST_POLICY (each host separately).
+YOUTUBE_HOST = "youtube.com"
+HOST_POLICIES = {
+    YOUTUBE_HOST: HostPolicy(concurrency=2, rate=0.5),
+    "media.ccc.de": HostPolicy(concurrency=4, rate=2.0),
+}
+DEFAULT_HOST_POLICY = HostPolicy(concurrency=4, rate=4.0)
+
 
 INDEX_FIELDS = [
     "source_id",
@@ -117,51 +135,60 @@ def write_index(path: Path, index: Dict[str, Dict[str, str]]) -> None:
             # Ensure stable columns.
             out_row = {k: row.get(k, "") for k in INDEX_FIELDS}
             writer.writerow(out_row)
+        f.flush()
+        os.fsync(f.fileno())
     tmp.replace(path)
 
 
-def run(cmd: List[str], timeout_s: int = 180) -> subprocess.CompletedProcess[str]:
-    try:
-        return subprocess.run(
-            cmd,
-            check=False,
-            capture_output=True,
-            text=True,
-            timeout=timeout_s,
-        )
-    except subprocess.TimeoutExpired as exc:
-        # Keep the corpus run moving; treat timeouts as retriable errors.
-        stdout = exc.stdout if isinstance(exc.stdout, str) or exc.stdout is None else exc.stdout.decode("utf-8", errors="replace")
-        stderr = exc.stderr if isinstance(exc.stderr, str) or exc.stderr is None else exc.stderr.decode("utf-8", errors="replace")
-        msg = f"timeout after {timeout_s}s"
-        if stderr:
-            msg = msg + "\n" + str(stderr)
-        return subprocess.CompletedProcess(cmd, returncode=124, stdout=stdout or "", stderr=msg)
+def is_rate_limited(cp: subprocess.CompletedProcess[str]) -> bool:
+    combined = (cp.stderr or "") + "\n" + (cp.stdout or "")
+    return "HTTP Error 429" in combined or "Too Many Requests" in combined
 
 
-def run_ytdlp_with_backoff(cmd: List[str], timeout_s: int = 300, max_attempts: int = 2) -> subprocess.CompletedProcess[str]:
+class Fetcher:
     """
+    Network side of `fetch_source`: yt-dlp runs and HTTP GETs, each gated by its host's limiter.
+
     yt-dlp against YouTube will occasionally hit transient failures (notably HTTP 429).
-    We retry with exponential backoff to make a full corpus pull possible in one session.
+    Those slow the host down for every task (not just the one that hit it) and are retried.
     """
-    last: Optional[subprocess.CompletedProcess[str]] = None
-    for attempt in range(1, max_attempts + 1):
-        cp = run(cmd, timeout_s=timeout_s)
-        last = cp
-        if cp.returncode == 0:
-            return cp
 
-        combined = (cp.stderr or "") + "\n" + (cp.stdout or "")
-        if "HTTP Error 429" in combined or "Too Many Requests" in combined:
+    def __init__(self, hosts: HostScheduler, *, ytdlp_procs: int = 2) -> None:
+        self.hosts = hosts
+        self.ytdlp_pool = asyncio.Semaphore(max(1, ytdlp_procs))
+
+    async def ytdlp(self, cmd: List[str], timeout_s: int = 300, max_attempts: int = 3) -> subprocess.CompletedProcess[str]:
+        lim = self.hosts.limiter(YOUTUBE_HOST)
+        cp: Optional[subprocess.CompletedProcess[str]] = None
+        for attempt in range(1, max_attempts + 1):
+            async with lim.slot():
+                cp = await run_subprocess(cmd, timeout_s, pool=self.ytdlp_pool)
+            if cp.returncode == 0:
+                lim.relax()
+                return cp
+            if not is_rate_limited(cp):
+                return cp
             # Keep this short: we want the full run to make progress, then rerun later.
-            sleep_s = min(5 * attempt, 30)
-            eprint(f"yt-dlp hit HTTP 429; backing off for {sleep_s}s (attempt {attempt}/{max_attempts})")
-            time.sleep(sleep_s)
-            continue
-
+            pause_s = min(5 * attempt, 30)
+            eprint(f"yt-dlp hit HTTP 429; slowing {YOUTUBE_HOST} down, pause {pause_s}s (attempt {attempt}/{max_attempts})")
+            lim.throttle(pause_s)
+        assert cp is not None
         return cp
 
-    return last or run(cmd, timeout_s=timeout_s)
+    async def http_get(self, url: str, timeout_s: int = 60, max_attempts: int = 3) -> Tuple[Optional[bytes], Optional[str]]:
+        lim = self.hosts.limiter(url)
+        last_err: Optional[str] = None
+        for attempt in range(1, max_attempts + 1):
+            async with lim.slot():
+                body, last_err, status = await asyncio.to_thread(http_get_once, url, timeout_s)
+            if body is not None:
+                lim.relax()
+                return body, None
+            if status == 429:
+                lim.throttle(min(5 * attempt, 30))
+            elif attempt < max_attempts:
+                await asyncio.sleep(min(2 * attempt, 10))
+        return None, last_err or "unknown error"
 
 
 def classify_ytdlp_failure(err_text: str) -> str:
@@ -231,14 +258,7 @@ def _extract_lang_from_caption_filename(source_id: str, path: Path) -> str:
     return rest.rsplit(".", 1)[0]
 
 
-def yt_download_try(url: str, source_id: str, lang_expr: str) -> Tuple[Optional[Path], Optional[str]]:
-    """
-    Attempt to download captions for the requested language expression.
-    Returns (best_path, error).
-    """
-    outtmpl = str(TRANSCRIPTS_DIR / source_id)
-    before = set(TRANSCRIPTS_DIR.glob(f"{source_id}.*"))
-
+def ytdlp_cmd(*args: str) -> List[str]:
     cmd = [
         YT_DLP,
         "--skip-download",
@@ -249,6 +269,30 @@ def yt_download_try(url: str, source_id: str, lang_expr: str) -> Tuple[Optional[
         YT_DLP_REMOTE_COMPONENTS,
         "--sleep-requests",
         YTDLP_SLEEP_REQUESTS,
+        *args,
+    ]
+    if YTDLP_COOKIES_FROM_BROWSER:
+        cmd.extend(["--cookies-from-browser", YTDLP_COOKIES_FROM_BROWSER])
+    elif YTDLP_COOKIES:
+        cmd.extend(["--cookies", YTDLP_COOKIES])
+    return cmd
+
+
+def ytdlp_error(cp: subprocess.CompletedProcess[str]) -> str:
+    err = (cp.stderr or cp.stdout or "").strip()
+    err = re.sub(r"\s+", " ", err)[:500]
+    return err or f"yt-dlp exited with {cp.returncode}"
+
+
+async def yt_download_try(fetcher: Fetcher, url: str, source_id: str, lang_expr: str) -> Tuple[Optional[Path], Optional[str]]:
+    """
+    Attempt to download captions for the requested language expression.
+    Returns (best_path, error).
+    """
+    outtmpl = str(TRANSCRIPTS_DIR / source_id)
+    before = set(TRANSCRIPTS_DIR.glob(f"{source_id}.*"))
+
+    cmd = ytdlp_cmd(
         "--write-subs",
         "--write-auto-subs",
         "--sub-format",
@@ -258,16 +302,10 @@ def yt_download_try(url: str, source_id: str, lang_expr: str) -> Tuple[Optional[
         "-o",
         outtmpl,
         url,
-    ]
-    if YTDLP_COOKIES_FROM_BROWSER:
-        cmd.extend(["--cookies-from-browser", YTDLP_COOKIES_FROM_BROWSER])
-    elif YTDLP_COOKIES:
-        cmd.extend(["--cookies", YTDLP_COOKIES])
-    cp = run_ytdlp_with_backoff(cmd, timeout_s=300, max_attempts=2)
+    )
+    cp = await fetcher.ytdlp(cmd, timeout_s=300)
     if cp.returncode != 0:
-        err = (cp.stderr or cp.stdout or "").strip()
-        err = re.sub(r"\s+", " ", err)[:500]
-        return None, err or f"yt-dlp exited with {cp.returncode}"
+        return None, ytdlp_error(cp)
 
     after = set(TRANSCRIPTS_DIR.glob(f"{source_id}.*"))
     new_files = [p for p in (after - before) if p.suffix.lower() in {".vtt", ".srt"}]
@@ -312,18 +350,39 @@ def yt_download_try(url: str, source_id: str, lang_expr: str) -> Tuple[Optional[
     return best, None
 
 
+USER_AGENT = "the-mind-transcript-fetcher/1.0"
+_HTTP_CLIENTS: Dict[int, HttpClient] = {}
+
+
+def http_client(timeout_s: int) -> HttpClient:
+    # Shared per timeout so keep-alive connections and the response cache are reused.
+    c = _HTTP_CLIENTS.get(timeout_s)
+    if c is None:
+        c = _HTTP_CLIENTS.setdefault(timeout_s, HttpClient(user_agent=USER_AGENT, timeout_s=timeout_s))
+    return c
+
+
+def http_get_once(url: str, timeout_s: int = 60) -> Tuple[Optional[bytes], Optional[str], int]:
+    """
+    One GET attempt: (body, error, HTTP status or 0).
+    """
+    try:
+        return http_client(timeout_s).get(url).body, None, 200
+    except IncompleteRead as exc:
+        # Retry rather than accepting truncated HTML/subtitles.
+        return None, f"IncompleteRead({len(exc.partial)} bytes read, {exc.expected} more expected)", 0
+    except HTTPError as exc:
+        return None, str(exc), exc.code
+    except Exception as exc:  # noqa: BLE001 - pragmatic tool script
+        return None, str(exc), 0
+
+
 def http_get(url: str, timeout_s: int = 60, max_attempts: int = 3) -> Tuple[Optional[bytes], Optional[str]]:
-    req = Request(url, headers={"User-Agent": "the-mind-transcript-fetcher/1.0"})
     last_err: Optional[str] = None
     for attempt in range(1, max_attempts + 1):
-        try:
-            with urlopen(req, timeout=timeout_s) as resp:
-                return resp.read(), None
-        except IncompleteRead as exc:
-            # Retry rather than accepting truncated HTML/subtitles.
-            last_err = f"IncompleteRead({len(exc.partial)} bytes read, {exc.expected} more expected)"
-        except Exception as exc:  # noqa: BLE001 - pragmatic tool script
-            last_err = str(exc)
+        body, last_err, _status = http_get_once(url, timeout_s)
+        if body is not None:
+            return body, None
         if attempt < max_attempts:
             time.sleep(min(2 * attempt, 10))
     return None, last_err or "unknown error"
@@ -377,7 +436,92 @@ def write_bytes(path: Path, data: bytes) -> None:
     tmp.replace(path)
 
 
-def fetch_for_row(row: Dict[str, str]) -> Dict[str, str]:
+@dataclass(frozen=True)
+class CaptionTrack:
+    group: str  # en|de|other
+    lang: str
+    auto: bool  # from automatic_captions rather than subtitles
+    ext: str  # vtt|srt
+
+
+# Same language groups, in the same order, as the per-language yt-dlp tries.
+CAPTION_GROUPS: List[Tuple[str, Tuple[str, ...]]] = [
+    ("en", ("en", "eng")),
+    ("de", ("de", "deu", "ger")),
+]
+
+
+def pick_caption_track(info: Dict[str, Any]) -> Optional[CaptionTrack]:
+    """
+    Choose one caption track from yt-dlp's video metadata.
+
+    Mirrors the per-language tries: English, then German, then anything but live_chat.
+    Within a group, manual subtitles win over auto captions, and the language code is
+    chosen by `_best_lang_for_prefix` (as for CCC tracks), trying the group's aliases in order.
+    """
+    tracks: Dict[str, Tuple[bool, str]] = {}
+    for auto, key in ((True, "automatic_captions"), (False, "subtitles")):
+        for lang, fmts in (info.get(key) or {}).items():
+            exts = {str(f.get("ext") or "") for f in (fmts or []) if isinstance(f, dict)}
+            ext = "vtt" if "vtt" in exts else ("srt" if "srt" in exts else "")
+            if ext:
+                tracks[lang] = (auto, ext)  # manual subtitles override auto captions
+    langs = _filter_lang_keys(tracks)
+    if not langs:
+        return None
+
+    for group, aliases in CAPTION_GROUPS:
+        for auto in (False, True):
+            pool = [l for l in langs if tracks[l][0] == auto]
+            best = next((b for b in (_best_lang_for_prefix(pool, a) for a in aliases) if b), None)
+            if best:
+                return CaptionTrack(group, best, *tracks[best])
+    best = min(langs, key=lambda l: (tracks[l][0], len(l), l.lower()))
+    return CaptionTrack("other", best, *tracks[best])
+
+
+async def yt_fetch_single(fetcher: Fetcher, url: str, source_id: str) -> Tuple[Optional[CaptionTrack], Optional[Path], Optional[str]]:
+    """
+    One metadata call, then exactly one caption download (reusing the metadata).
+    Returns (track, path, error); (None, None, None) means the video has no captions.
+    """
+    cp = await fetcher.ytdlp(ytdlp_cmd("--dump-json", url), timeout_s=300)
+    if cp.returncode != 0:
+        return None, None, ytdlp_error(cp)
+    try:
+        info = json.loads(cp.stdout.strip().splitlines()[-1])
+    except (ValueError, IndexError):
+        return None, None, "yt-dlp --dump-json returned no metadata"
+    track = pick_caption_track(info)
+    if track is None:
+        return None, None, None
+
+    out = TRANSCRIPTS_DIR / f"{source_id}.{track.lang}.{track.ext}"
+    info_path = TRANSCRIPTS_DIR / f".{source_id}.info.json"
+    write_bytes(info_path, json.dumps(info).encode("utf-8"))
+    try:
+        cmd = ytdlp_cmd(
+            "--write-auto-subs" if track.auto else "--write-subs",
+            "--sub-format",
+            track.ext,
+            "--sub-langs",
+            re.escape(track.lang),
+            "-o",
+            str(TRANSCRIPTS_DIR / source_id),
+            "--load-info-json",
+            str(info_path),
+        )
+        cp = await fetcher.ytdlp(cmd, timeout_s=300)
+    finally:
+        info_path.unlink(missing_ok=True)
+    if cp.returncode != 0:
+        return track, None, ytdlp_error(cp)
+    if not out.exists():
+        return track, None, f"yt-dlp did not write {out.name}"
+    return track, out, None
+
+
+async def fetch_source(row: Dict[str, str], fetcher: Fetcher, *, caption_probe: str = "metadata") -> Dict[str, str]:
     sid = row["source_id"].strip()
     kind = row["kind"].strip()
     url = row["url"].strip()
@@ -397,6 +541,22 @@ def fetch_for_row(row: Dict[str, str]) -> Dict[str, str]:
         "updated_at": now_iso(),
     }
 
+    if kind == "youtube" and caption_probe == "metadata":
+        track, fp, err = await yt_fetch_single(fetcher, url, sid)
+        if err:
+            # A hard failure usually means the video is unavailable or we got blocked.
+            base.update(status=classify_ytdlp_failure(err), error=err)
+            return base
+        if track is None or fp is None:
+            base.update(status="needs_asr", preferred_lang="en", selected_kind="none")
+            return base
+        base["preferred_lang"] = track.group
+        base["selected_lang"] = track.lang
+        base["selected_kind"] = "youtube"
+        base["transcript_path"] = str(fp.relative_to(ROOT))
+        base["status"] = "ok"
+        return base
+
     if kind == "youtube":
         # Fast path: try English, then German, else "all" (and keep one).
         tries = [
@@ -406,7 +566,7 @@ def fetch_for_row(row: Dict[str, str]) -> Dict[str, str]:
         ]
         last_err: Optional[str] = None
         for group, lang_expr in tries:
-            fp, err = yt_download_try(url, sid, lang_expr)
+            fp, err = await yt_download_try(fetcher, url, sid, lang_expr)
             if err:
                 last_err = err
                 # A hard failure usually means the video is unavailable or we got blocked.
@@ -428,7 +588,7 @@ def fetch_for_row(row: Dict[str, str]) -> Dict[str, str]:
         return base
 
     if kind == "ccc":
-        body, err = http_get(url, timeout_s=60)
+        body, err = await fetcher.http_get(url, timeout_s=60)
         if body is None:
             base.update(status="error", error=err or "failed to fetch CCC page")
             return base
@@ -444,7 +604,7 @@ def fetch_for_row(row: Dict[str, str]) -> Dict[str, str]:
         # Infer extension from URL.
         ext = ".vtt" if track_url.lower().endswith(".vtt") else ".srt"
         out = TRANSCRIPTS_DIR / f"{sid}{ext}"
-        data, derr = http_get(track_url, timeout_s=60)
+        data, derr = await fetcher.http_get(track_url, timeout_s=60)
         if data is None:
             # Treat missing subtitle files as "needs_asr" rather than a hard error.
             base.update(
@@ -461,7 +621,7 @@ def fetch_for_row(row: Dict[str, str]) -> Dict[str, str]:
         return base
 
     if kind == "web":
-        body, err = http_get(url, timeout_s=60)
+        body, err = await fetcher.http_get(url, timeout_s=60)
         if body is None:
             base.update(status="error", error=err or "failed to fetch web page")
             return base
@@ -476,15 +636,96 @@ def fetch_for_row(row: Dict[str, str]) -> Dict[str, str]:
     return base
 
 
+def fetch_for_row(row: Dict[str, str]) -> Dict[str, str]:
+    """
+    Fetch a single source outside of a corpus run (default host limits).
+    """
+
+    async def go() -> Dict[str, str]:
+        return await fetch_source(row, Fetcher(HostScheduler(HOST_POLICIES, DEFAULT_HOST_POLICY)))
+
+    return asyncio.run(go())
+
+
+def error_result(row: Dict[str, str], exc: BaseException) -> Dict[str, str]:
+    return {
+        "source_id": row["source_id"].strip(),
+        "kind": row.get("kind", ""),
+        "url": row.get("url", ""),
+        "published_date": row.get("published_date", ""),
+        "preferred_lang": "",
+        "selected_lang": "",
+        "selected_kind": "",
+        "transcript_path": "",
+        "status": "error",
+        "error": f"exception: {exc}",
+        "updated_at": now_iso(),
+    }
+
+
+async def fetch_all(
+    work: List[Tuple[int, Dict[str, str]]],
+    journal: IndexJournal,
+    *,
+    total: int,
+    jobs: int,
+    sleep_s: float,
+    ytdlp_procs: int,
+    caption_probe: str = "metadata",
+) -> Tuple[int, HostScheduler]:
+    """
+    Fetch `work` with up to `jobs` sources in flight, journaling each result as it lands.
+    """
+    hosts = HostScheduler(HOST_POLICIES, DEFAULT_HOST_POLICY)
+    fetcher = Fetcher(hosts, ytdlp_procs=ytdlp_procs)
+    processed = 0
+
+    if jobs <= 1:
+        for i, row in work:
+            sid = row["source_id"].strip()
+            eprint(f"[{i}/{total}] {sid} ({row.get('kind','')})")
+            journal.record(await fetch_source(row, fetcher, caption_probe=caption_probe))
+            processed += 1
+            if sleep_s:
+                await asyncio.sleep(sleep_s)
+        return processed, hosts
+
+    gate = asyncio.Semaphore(jobs)
+
+    async def one(i: int, row: Dict[str, str]) -> Tuple[int, Dict[str, str], Dict[str, str]]:
+        async with gate:
+            try:
+                result = await fetch_source(row, fetcher, caption_probe=caption_probe)
+            except Exception as exc:  # noqa: BLE001 - tool script
+                result = error_result(row, exc)
+        return i, row, result
+
+    for fut in asyncio.as_completed([one(i, row) for i, row in work]):
+        i, row, result = await fut
+        sid = row["source_id"].strip()
+        eprint(f"[{i}/{total}] {sid} ({row.get('kind','')}) -> {result.get('status')}")
+        journal.record(result)
+        processed += 1
+    return processed, hosts
+
+
 def main(argv: Optional[List[str]] = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--sources", default=str(SOURCES_CSV), help="Path to sources.csv")
     ap.add_argument("--kinds", default="", help="Comma-separated kinds to process (youtube,ccc,web)")
     ap.add_argument("--limit", type=int, default=0, help="Max sources to process (0 = all)")
     ap.add_argument("--sleep", type=float, default=0.0, help="Sleep seconds between sources")
-    ap.add_argument("--jobs", type=int, default=1, help="Number of parallel workers (default: 1)")
+    ap.add_argument("--jobs", type=int, default=1, help="Max sources in flight; per-host limits still apply (default: 1)")
+    ap.add_argument(
+        "--caption-probe",
+        choices=["metadata", "tries"],
+        default="metadata",
+        help="YouTube: one metadata call + one caption download (metadata), or per-language yt-dlp tries",
+    )
+    ap.add_argument("--ytdlp-procs", type=int, default=2, help="Max concurrent yt-dlp processes (default: 2)")
     ap.add_argument("--only-new", action="store_true", help="Only process sources not yet in transcripts/_index.csv")
     ap.add_argument("--retry-errors", action="store_true", help="Only process sources with status=error in transcripts/_index.csv")
+    ap.add_argument("--compact-every", type=int, default=25, help="Rewrite transcripts/_index.csv every N finished sources")
     args = ap.parse_args(argv)
 
     sources_path = Path(args.sources)
@@ -497,6 +738,15 @@ def main(argv: Optional[List[str]] = None) -> int:
     TRANSCRIPTS_DIR.mkdir(parents=True, exist_ok=True)
 
     index = load_index(INDEX_CSV)
+    journal = IndexJournal(
+        INDEX_JOURNAL,
+        index,
+        lambda idx: write_index(INDEX_CSV, idx),
+        compact_every=args.compact_every,
+    )
+    replayed = journal.replay()
+    if replayed:
+        eprint(f"replayed {replayed} journaled sources from {INDEX_JOURNAL.name}")
 
     # Build worklist with stable numbering for logs.
     work: List[Tuple[int, Dict[str, str]]] = []
@@ -516,44 +766,21 @@ def main(argv: Optional[List[str]] = None) -> int:
         if args.limit and len(work) >= args.limit:
             break
 
-    processed = 0
-    if args.jobs <= 1:
-        for i, row in work:
-            sid = row["source_id"].strip()
-            eprint(f"[{i}/{total}] {sid} ({row.get('kind','')})")
-            result = fetch_for_row(row)
-            index[sid] = result
-            write_index(INDEX_CSV, index)
-            processed += 1
-            if args.sleep:
-                time.sleep(args.sleep)
-    else:
-        with ThreadPoolExecutor(max_workers=args.jobs) as ex:
-            futs = {ex.submit(fetch_for_row, row): (i, row) for i, row in work}
-            for fut in as_completed(futs):
-                i, row = futs[fut]
-                sid = row["source_id"].strip()
-                try:
-                    result = fut.result()
-                except Exception as exc:  # noqa: BLE001 - tool script
-                    result = {
-                        "source_id": sid,
-                        "kind": row.get("kind", ""),
-                        "url": row.get("url", ""),
-                        "published_date": row.get("published_date", ""),
-                        "preferred_lang": "",
-                        "selected_lang": "",
-                        "selected_kind": "",
-                        "transcript_path": "",
-                        "status": "error",
-                        "error": f"exception: {exc}",
-                        "updated_at": now_iso(),
-                    }
-                eprint(f"[{i}/{total}] {sid} ({row.get('kind','')}) -> {result.get('status')}")
-                index[sid] = result
-                write_index(INDEX_CSV, index)
-                processed += 1
+    with journal:
+        processed, hosts = asyncio.run(
+            fetch_all(
+                work,
+                journal,
+                total=total,
+                jobs=args.jobs,
+                sleep_s=args.sleep,
+                ytdlp_procs=args.ytdlp_procs,
+                caption_probe=args.caption_probe,
+            )
+        )
 
+    for host, st in hosts.stats().items():
+        eprint(f"host {host}: {st['requests']} requests, {st['throttled']} throttled, final rate {st['rate']}/s")
     eprint(f"done: updated {INDEX_CSV} (processed {processed} new sources)")
     return 0
 
@@ -28,7 +28,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
-from urllib.request import Request, urlopen
+
+from _core.httpclient import client_for
 
 
 CSV_FIELDS = [
@@ -47,10 +48,7 @@ SITEMAP_URL = "http://bach.ai/sitemap.xml"
 
 
 def fetch_text(url: str) -> str:
-    req = Request(url, headers={"User-Agent": USER_AGENT})
-    with urlopen(req, timeout=60) as resp:
-        raw = resp.read()
-    return raw.decode("utf-8", errors="replace")
+    return client_for(USER_AGENT).get_text(url)
 
 
 def sanitize_id_component(s: str) -> str:
@@ -26,7 +26,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
-from urllib.request import Request, urlopen
+
+from _core.httpclient import client_for
 
 
 CSV_FIELDS = [
@@ -46,10 +47,7 @@ CCC_SEARCH = "https://media.ccc.de/search?p=Joscha"
 
 
 def fetch_text(url: str) -> str:
-    req = Request(url, headers={"User-Agent": USER_AGENT})
-    with urlopen(req, timeout=60) as resp:
-        raw = resp.read()
-    return raw.decode("utf-8", errors="replace")
+    return client_for(USER_AGENT).get_text(url)
 
 
 def sanitize_id_component(s: str) -> str:
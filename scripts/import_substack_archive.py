@@ -19,8 +19,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
-from urllib.request import Request, urlopen
 
+from _core.httpclient import client_for
 from _core.sources import source_id_for_url
 
 
@@ -55,10 +55,7 @@ def norm_title(s: str) -> str:
 
 
 def fetch_json(url: str) -> object:
-    req = Request(url, headers={"User-Agent": USER_AGENT})
-    with urlopen(req, timeout=60) as resp:
-        raw = resp.read()
-    return json.loads(raw.decode("utf-8", errors="replace") or "null")
+    return json.loads(client_for(USER_AGENT).get_text(url) or "null")
 
 
 @dataclass(frozen=True)
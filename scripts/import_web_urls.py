@@ -24,8 +24,8 @@ import re
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from urllib.request import Request, urlopen
 
+from _core.httpclient import client_for
 from _core.sources import source_id_for_url
 
 
@@ -44,10 +44,7 @@ USER_AGENT = os.environ.get("THE_MIND_USER_AGENT", "the-mind-source-importer/0.1
 
 
 def fetch_text(url: str) -> str:
-    req = Request(url, headers={"User-Agent": USER_AGENT})
-    with urlopen(req, timeout=60) as resp:
-        raw = resp.read()
-    return raw.decode("utf-8", errors="replace")
+    return client_for(USER_AGENT).get_text(url)
 
 def ymd_from_isoish(s: str) -> str:
     m = re.search(r"(\d{4}-\d{2}-\d{2})", s or "")
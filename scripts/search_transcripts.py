@@ -5,23 +5,39 @@ Quick grep-like search across local transcripts (transcripts/_index.csv).
 This is intentionally simple and local-only:
 - It reads VTT/SRT cues and prints matching segments with timecodes.
 - It can also search downloaded HTML for web sources (no timecodes).
+
+Plain queries go through an inverted index (transcripts/_search/, updated
+incrementally on each run) and are ranked by BM25. They match whole words, not
+substrings: a cue must hold every word (--any: at least one), a word the query
+ends on also matches as a prefix ("conscious" finds "consciousness", but not
+"unconscious"), "quoted words" match as a phrase, and --near N requires all
+terms within N words of each other (across cues). Punctuation only separates
+words, so "what is AI?" is a plain word query. --regex or --case-sensitive select
+the original cue-by-cue regex scan; a query without any words is scanned for as
+literal text.
 """
 
 from __future__ import annotations
 
 import argparse
 import csv
-import json
 import re
 import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Set
+
+from _core.captions import is_timed, parse_offset_seconds
+from _core.cuestore import CueTable, open_cues
+from _core.intervals import bach_intervals
+from _core.transcript_index import IndexedSource, TranscriptIndex, parse_query
 
 
 ROOT = Path(__file__).resolve().parents[1]
 INDEX_CSV = ROOT / "transcripts" / "_index.csv"
 SPEAKERS_DIR = ROOT / "transcripts" / "_speakers"
+CUES_DIR = ROOT / "transcripts" / "_cues"
+SEARCH_DIR = ROOT / "transcripts" / "_search"
 
 
 @dataclass(frozen=True)
@@ -37,104 +53,6 @@ def eprint(*args: object) -> None:
     print(*args, file=sys.stderr)
 
 
-def iter_vtt(path: Path) -> Iterator[tuple[str, str]]:
-    # Minimal WebVTT parser: cue lines contain "-->".
-    lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        if "-->" not in line:
-            i += 1
-            continue
-        start = line.split("-->", 1)[0].strip()
-        # Collect cue text until blank line.
-        i += 1
-        txt_lines: list[str] = []
-        while i < len(lines) and lines[i].strip() != "":
-            l = lines[i].strip()
-            if l and not l.startswith(("NOTE", "WEBVTT")):
-                txt_lines.append(l)
-            i += 1
-        text = " ".join(txt_lines).strip()
-        # yt-dlp WebVTT often contains inline timestamps and <c> spans; strip tags.
-        text = re.sub(r"<[^>]+>", "", text)
-        text = re.sub(r"\s+", " ", text).strip()
-        yield start, text
-        i += 1
-
-
-def iter_srt(path: Path) -> Iterator[tuple[str, str]]:
-    # Minimal SRT parser.
-    lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
-    i = 0
-    while i < len(lines):
-        # Skip cue number.
-        if lines[i].strip().isdigit():
-            i += 1
-        if i >= len(lines):
-            break
-        time_line = lines[i].strip()
-        if "-->" not in time_line:
-            i += 1
-            continue
-        start = time_line.split("-->", 1)[0].strip()
-        i += 1
-        txt_lines: list[str] = []
-        while i < len(lines) and lines[i].strip() != "":
-            txt_lines.append(lines[i].strip())
-            i += 1
-        yield start, " ".join(txt_lines).strip()
-        i += 1
-
-
-def iter_html(path: Path) -> Iterator[tuple[str, str]]:
-    # No timecodes; just return chunks of visible-ish text.
-    html = path.read_text(encoding="utf-8", errors="replace")
-    # Strip tags crudely.
-    text = re.sub(r"<script\b.*?</script>", " ", html, flags=re.IGNORECASE | re.DOTALL)
-    text = re.sub(r"<style\b.*?</style>", " ", text, flags=re.IGNORECASE | re.DOTALL)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    # Chunk to keep output readable.
-    for m in re.finditer(r".{1,240}", text):
-        yield "", m.group(0).strip()
-
-
-def iter_segments(path: Path) -> Iterator[tuple[str, str]]:
-    suf = path.suffix.lower()
-    if suf == ".vtt":
-        yield from iter_vtt(path)
-    elif suf == ".srt":
-        yield from iter_srt(path)
-    elif suf == ".html":
-        yield from iter_html(path)
-    else:
-        return
-
-
-def parse_timecode_start(tc: str) -> Optional[float]:
-    # VTT: "HH:MM:SS.mmm" or "HH:MM:SS"
-    # SRT: "HH:MM:SS,mmm"
-    if not tc:
-        return None
-    t = tc.strip().split()[0].replace(",", ".")
-    m = re.match(r"^(\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,3}))?$", t)
-    if not m:
-        return None
-    h, mm, ss, ms = m.groups()
-    out = int(h) * 3600 + int(mm) * 60 + int(ss)
-    if ms:
-        out += int(ms.ljust(3, "0")) / 1000.0
-    return float(out)
-
-
-def parse_offset_seconds(v: str) -> float:
-    try:
-        return float((v or "").strip() or "0")
-    except Exception:
-        return 0.0
-
-
 def format_timecode(seconds: float) -> str:
     if seconds < 0:
         seconds = 0.0
@@ -147,46 +65,127 @@ def format_timecode(seconds: float) -> str:
     return f"{h:02}:{m:02}:{s:02}"
 
 
-def load_bach_intervals(source_id: str) -> List[Tuple[float, float]]:
-    path = SPEAKERS_DIR / f"{source_id}.speakers.json"
-    if not path.exists():
-        return []
+@dataclass(frozen=True)
+class IndexRow:
+    source_id: str
+    kind: str
+    path: Path
+    offset_s: float
+
+
+def load_index_rows(index_path: Path, wanted: Sequence[str] = ()) -> List[IndexRow]:
+    rows: List[IndexRow] = []
+    with index_path.open("r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            if row.get("status") != "ok":
+                continue
+            kind = row.get("kind", "")
+            if wanted and kind not in wanted:
+                continue
+            sid = row.get("source_id", "")
+            rel = row.get("transcript_path", "")
+            if not sid or not rel:
+                continue
+            path = ROOT / rel
+            if not path.exists():
+                continue
+            rows.append(IndexRow(sid, kind, path, parse_offset_seconds(row.get("time_offset_seconds", ""))))
+    return rows
+
+
+def print_hit(sid: str, tc_out: str, text: str) -> None:
+    snippet = text
+    if len(snippet) > 240:
+        snippet = snippet[:237] + "..."
+    print(f"{sid}\t{tc_out}\t{snippet}")
+
+
+def regex_search(rows: List[IndexRow], rx: re.Pattern, *, bach_only: bool, max_hits: int) -> int:
+    hits = 0
+    for r in rows:
+        bach = bach_intervals(r.source_id, SPEAKERS_DIR) if bach_only else None
+        timed = is_timed(r.path)
+        with open_cues(r.source_id, r.path, cache_dir=CUES_DIR, offset_s=r.offset_s) as cues:
+            for start, _end, text in cues:
+                tc_out = format_timecode(start) if timed else ""
+                if bach and timed:
+                    if not bach.contains(start):
+                        continue
+                if rx.search(text):
+                    print_hit(r.source_id, tc_out, text)
+                    hits += 1
+                    if hits >= max_hits:
+                        return hits
+    return hits
+
+
+def index_search(
+    rows: List[IndexRow],
+    query: str,
+    *,
+    all_rows: List[IndexRow],
+    kinds: Set[str],
+    bach_only: bool,
+    near: int,
+    match_any: bool,
+    max_hits: int,
+) -> int:
+    index = TranscriptIndex(SEARCH_DIR)
+    # All rows, not just the --kinds in scope: the index is shared across queries and
+    # would drop (then later re-tokenize) whatever is left out. Unchanged rows cost one
+    # stat() each.
+    index.update((IndexedSource(r.source_id, r.kind, r.path) for r in all_rows), cues_dir=CUES_DIR)
+    by_sid = {r.source_id: r for r in rows}
+
+    def bach_cues(sid: str) -> Optional[List[int]]:
+        # Cue ordinals whose (offset) start lies in a Bach segment; None = no filtering.
+        r = by_sid[sid]
+        bach = bach_intervals(sid, SPEAKERS_DIR)
+        if not bach or not is_timed(r.path):
+            return None
+        with open_cues(sid, r.path, cache_dir=CUES_DIR, offset_s=r.offset_s) as cues:
+            inside = bach.contains_many([cues.start_at(i) for i in range(len(cues))])
+        return [i for i, ok in enumerate(inside) if ok]
+
+    matches = index.search(
+        parse_query(query),
+        kinds=kinds or None,
+        near=near,
+        match_all=not match_any,
+        # Only a word the query ends on is open-ended: not a "phrase", nor "AI?".
+        prefix_last=bool(re.search(r"\w\Z", query.rstrip())),
+        cue_filter=bach_cues if bach_only else None,
+        limit=max_hits,
+    )
+    tables: Dict[str, CueTable] = {}
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        return []
-    segs = data.get("bach_segments") or []
-    out: List[Tuple[float, float]] = []
-    for s in segs:
-        try:
-            out.append((float(s.get("start_s", 0.0)), float(s.get("end_s", 0.0))))
-        except Exception:
-            continue
-    out.sort(key=lambda t: t[0])
-    return out
-
-
-def in_intervals(t: float, intervals: List[Tuple[float, float]]) -> bool:
-    lo, hi = 0, len(intervals) - 1
-    while lo <= hi:
-        mid = (lo + hi) // 2
-        s, e = intervals[mid]
-        if t < s:
-            hi = mid - 1
-        elif t > e:
-            lo = mid + 1
-        else:
-            return True
-    return False
+        for m in matches:
+            r = by_sid[m.source_id]
+            cues = tables.get(m.source_id)
+            if cues is None:
+                cues = tables[m.source_id] = open_cues(m.source_id, r.path, cache_dir=CUES_DIR, offset_s=r.offset_s)
+            tc_out = format_timecode(cues.start_at(m.cue)) if is_timed(r.path) else ""
+            print_hit(m.source_id, tc_out, cues.text(m.cue))
+    finally:
+        for cues in tables.values():
+            cues.close()
+    return len(matches)
 
 
 def main(argv: Optional[list[str]] = None) -> int:
     ap = argparse.ArgumentParser()
-    ap.add_argument("query", help="Regex (case-insensitive by default)")
+    ap.add_argument(
+        "query",
+        help="Words and \"quoted phrases\" (whole words, all required, last word also as a prefix; ranked), "
+        "or with --regex a regex (substring, case-insensitive by default)",
+    )
     ap.add_argument("--index", default=str(INDEX_CSV), help="Path to transcripts/_index.csv")
     ap.add_argument("--kinds", default="", help="Comma-separated kinds to search (youtube,ccc,web)")
     ap.add_argument("--max-hits", type=int, default=200, help="Stop after N hits")
-    ap.add_argument("--case-sensitive", action="store_true", help="Use case-sensitive regex")
+    ap.add_argument("--case-sensitive", action="store_true", help="Use case-sensitive regex (implies --regex)")
+    ap.add_argument("--regex", action="store_true", help="Treat the query as a regex and scan cues in index order")
+    ap.add_argument("--near", type=int, default=0, help="Ranked search: require all terms within N words")
+    ap.add_argument("--any", action="store_true", help="Ranked search: match cues holding any of the terms")
     ap.add_argument(
         "--bach-only",
         action="store_true",
@@ -199,54 +198,26 @@ def main(argv: Optional[list[str]] = None) -> int:
         eprint(f"missing index: {index_path}")
         return 2
 
-    flags = 0 if args.case_sensitive else re.IGNORECASE
-    rx = re.compile(args.query, flags)
-
     wanted = {k.strip() for k in args.kinds.split(",") if k.strip()}
-    hits = 0
-    bach_cache: Dict[str, List[Tuple[float, float]]] = {}
-
-    with index_path.open("r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row.get("status") != "ok":
-                continue
-            kind = row.get("kind", "")
-            if wanted and kind not in wanted:
-                continue
-            sid = row.get("source_id", "")
-            rel = row.get("transcript_path", "")
-            offset_s = parse_offset_seconds(row.get("time_offset_seconds", ""))
-            if not sid or not rel:
-                continue
-            path = ROOT / rel
-            if not path.exists():
-                continue
-            intervals: List[Tuple[float, float]] = []
-            if args.bach_only:
-                intervals = bach_cache.get(sid)
-                if intervals is None:
-                    intervals = []
-                if sid not in bach_cache:
-                    intervals = load_bach_intervals(sid)
-                    bach_cache[sid] = intervals
-            for tc, text in iter_segments(path):
-                if not text:
-                    continue
-                t0 = parse_timecode_start(tc)
-                tc_out = format_timecode((t0 or 0.0) + offset_s) if t0 is not None else tc
-                if args.bach_only and intervals and t0 is not None:
-                    if not in_intervals(t0 + offset_s, intervals):
-                        continue
-                if rx.search(text):
-                    snippet = text
-                    if len(snippet) > 240:
-                        snippet = snippet[:237] + "..."
-                    print(f"{sid}\t{tc_out}\t{snippet}")
-                    hits += 1
-                    if hits >= args.max_hits:
-                        return 0
-
+    all_rows = load_index_rows(index_path)
+    rows = [r for r in all_rows if not wanted or r.kind in wanted]
+
+    if args.regex or args.case_sensitive or not parse_query(args.query):
+        flags = 0 if args.case_sensitive else re.IGNORECASE
+        pattern = args.query if args.regex or args.case_sensitive else re.escape(args.query)
+        regex_search(rows, re.compile(pattern, flags), bach_only=bool(args.bach_only), max_hits=args.max_hits)
+        return 0
+
+    index_search(
+        rows,
+        args.query,
+        all_rows=all_rows,
+        kinds=wanted,
+        bach_only=bool(args.bach_only),
+        near=max(0, args.near),
+        match_any=bool(args.any),
+        max_hits=args.max_hits,
+    )
     return 0
 
 
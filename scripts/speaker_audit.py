@@ -16,12 +16,13 @@ It never reads or prints transcript text.
 from __future__ import annotations
 
 import argparse
-import json
 import re
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Tuple
 
+from _core.intervals import load_speakers
+
 
 ROOT = Path(__file__).resolve().parents[1]
 SPEAKERS_DIR = ROOT / "transcripts" / "_speakers"
@@ -87,53 +88,6 @@ def iter_refs_from_chapters(dir_path: Path) -> Iterable[Ref]:
             yield Ref(sid, t, tc.replace(",", "."), f"{path.name}:{i}")
 
 
-def load_speaker_meta(source_id: str) -> Optional[dict]:
-    path = SPEAKERS_DIR / f"{source_id}.speakers.json"
-    if not path.exists():
-        return None
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
-        return None
-
-
-def load_bach_intervals(meta: dict) -> List[Tuple[float, float]]:
-    segs = meta.get("bach_segments") or []
-    out: List[Tuple[float, float]] = []
-    for s in segs:
-        try:
-            out.append((float(s.get("start_s", 0.0)), float(s.get("end_s", 0.0))))
-        except Exception:
-            continue
-    out.sort(key=lambda t: t[0])
-    return out
-
-
-def approx_duration_s(meta: dict) -> Optional[float]:
-    segs = meta.get("segments") or []
-    mx = 0.0
-    for s in segs:
-        try:
-            mx = max(mx, float(s.get("end_s", 0.0)))
-        except Exception:
-            continue
-    return mx if mx > 0 else None
-
-
-def in_intervals(t: float, intervals: List[Tuple[float, float]]) -> bool:
-    lo, hi = 0, len(intervals) - 1
-    while lo <= hi:
-        mid = (lo + hi) // 2
-        s, e = intervals[mid]
-        if t < s:
-            hi = mid - 1
-        elif t > e:
-            lo = mid + 1
-        else:
-            return True
-    return False
-
-
 def main(argv: Optional[List[str]] = None) -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--include-solo", action="store_true", help="Also check sources where multi_speaker_heuristic is false")
@@ -154,20 +108,21 @@ def main(argv: Optional[List[str]] = None) -> int:
     risks: List[Tuple[str, Ref, str]] = []
 
     for sid, items in sorted(refs_by_source.items()):
-        meta = load_speaker_meta(sid)
-        if meta is None:
+        sp = load_speakers(sid, SPEAKERS_DIR)
+        if sp is None:
             missing += 1
             missing_sources.append((sid, len(items)))
             continue
-        multi = bool(meta.get("multi_speaker_heuristic"))
+        multi = sp.multi_speaker
         if (not multi) and (not args.include_solo):
             skipped += 1
             continue
-        intervals = load_bach_intervals(meta)
-        dur_s = approx_duration_s(meta)
+        intervals = sp.bach
+        dur_s = sp.duration_s
         if not intervals:
             continue
-        for r in items:
+        inside = intervals.contains_many([r.time_s for r in items])
+        for r, ok in zip(items, inside):
             total += 1
             if multi:
                 labels: List[str] = []
@@ -177,7 +132,7 @@ def main(argv: Optional[List[str]] = None) -> int:
                     labels.append("outro")
                 if labels:
                     risks.append((sid, r, "+".join(labels)))
-            if not in_intervals(r.time_s, intervals):
+            if not ok:
                 bad.append((sid, r))
 
     print("speaker_audit")
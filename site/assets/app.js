@@ -1,40 +1,126 @@
 /* Minimal client-side helpers:
- * - search across a prebuilt index
+ * - search across a prebuilt, sharded inverted index
  * - toggle showing internal annotation tags
  *
  * No external deps; keeps the site static.
  */
 
-async function loadSearchIndex(root) {
-  const res = await fetch(root + "search_index.json", { cache: "no-store" });
-  if (!res.ok) return [];
-  return await res.json();
-}
+/* Search index layout (written by scripts/build_site.py):
+ * - search/manifest.json: pages + {term prefix: shard hash}; small, revalidated
+ * - search/shards/<hash>.json: term -> [[pageId, titleCount, offsetDeltas], ...]
+ * - search/text/<hash>.json: fixed-size page text chunks, only fetched for snippets
+ * Offsets, lengths and chunk sizes are in code points.
+ * Shards and chunks are content-addressed, so the browser may cache them freely.
+ */
+const SEARCH_TERM_RX = /[\p{L}\p{N}_]+/gu;
 
 function normalize(s) {
   return (s || "").toLowerCase().replace(/\s+/g, " ").trim();
 }
 
-function countOccurrences(hay, needle) {
-  if (!hay || !needle) return 0;
-  let n = 0;
-  let i = 0;
-  while (true) {
-    const j = hay.indexOf(needle, i);
-    if (j < 0) break;
-    n += 1;
-    i = j + Math.max(1, needle.length);
-  }
-  return n;
+function searchTerms(s) {
+  return (s || "").toLowerCase().match(SEARCH_TERM_RX) || [];
 }
 
-function snippet(text, q) {
-  const t = text || "";
-  const i = t.toLowerCase().indexOf(q);
-  if (i < 0) return t.slice(0, 140);
-  const start = Math.max(0, i - 60);
-  const end = Math.min(t.length, i + 120);
-  return (start > 0 ? "…" : "") + t.slice(start, end) + (end < t.length ? "…" : "");
+function createSearchIndex(root) {
+  const base = root + "search/";
+  const cache = new Map(); // url -> Promise<json|null>
+  let manifest = null;
+
+  function fetchJson(url, mode) {
+    if (!cache.has(url)) {
+      cache.set(
+        url,
+        fetch(url, { cache: mode })
+          .then((res) => (res.ok ? res.json() : null))
+          .catch(() => null)
+      );
+    }
+    return cache.get(url);
+  }
+
+  function loadManifest() {
+    if (!manifest) manifest = fetchJson(base + "manifest.json", "no-cache");
+    return manifest;
+  }
+
+  async function postingLists(m, term, isPrefix) {
+    const hash = m.shards[term.slice(0, m.prefix_len)];
+    if (!hash) return [];
+    const shard = await fetchJson(`${base}shards/${hash}.json`, "force-cache");
+    if (!shard) return [];
+    // Exact lookup; the term still being typed also matches every indexed term it
+    // prefixes (those all live in the same shard once it is prefix_len chars long).
+    if (!isPrefix || term.length < m.prefix_len) return shard[term] ? [shard[term]] : [];
+    const out = [];
+    for (const t in shard) {
+      if (t.startsWith(term)) out.push(shard[t]);
+    }
+    return out;
+  }
+
+  async function query(q) {
+    const m = await loadManifest();
+    const terms = searchTerms(q);
+    if (!m || !terms.length) return [];
+
+    // All terms must match (in title or text). Ranking per term:
+    // - title hits dominate
+    // - more occurrences rank higher
+    let acc = null; // pageId -> {score, first}
+    for (let i = 0; i < terms.length; i++) {
+      const perPage = new Map();
+      for (const list of await postingLists(m, terms[i], i === terms.length - 1)) {
+        for (const [pid, titleCount, deltas] of list) {
+          let e = perPage.get(pid);
+          if (!e) {
+            e = { title: 0, text: 0, first: -1 };
+            perPage.set(pid, e);
+          }
+          e.title += titleCount;
+          e.text += deltas.length;
+          if (deltas.length && (e.first < 0 || deltas[0] < e.first)) e.first = deltas[0];
+        }
+      }
+      const next = new Map();
+      for (const [pid, e] of perPage) {
+        const prev = acc ? acc.get(pid) : { score: 0, first: -1 };
+        if (!prev) continue;
+        next.set(pid, {
+          score: prev.score + (e.title ? 100 : 0) + 10 * e.title + e.text,
+          first: prev.first >= 0 ? prev.first : e.first,
+        });
+      }
+      acc = next;
+      if (!acc.size) break;
+    }
+
+    return Array.from(acc || [], ([pid, e]) => ({ pid, page: m.pages[pid], score: e.score, first: e.first })).sort(
+      (a, b) => b.score - a.score || a.pid - b.pid
+    );
+  }
+
+  async function snippet(hit) {
+    const m = await loadManifest();
+    const page = hit.page;
+    const i = hit.first;
+    const start = i < 0 ? 0 : Math.max(0, i - 60);
+    const end = i < 0 ? Math.min(page.len, 140) : Math.min(page.len, i + 120);
+    const first = Math.floor(start / m.chunk);
+    const last = Math.floor(Math.max(start, end - 1) / m.chunk);
+    const parts = [];
+    for (let c = first; c <= last && c < page.chunks.length; c++) {
+      parts.push(fetchJson(`${base}text/${page.chunks[c]}.json`, "force-cache"));
+    }
+    // Offsets, page lengths and chunk sizes count code points (Python str indices), not
+    // UTF-16 units, so slice the code point array rather than the string.
+    const text = Array.from((await Promise.all(parts)).map((t) => t || "").join(""));
+    const t = text.slice(start - first * m.chunk, end - first * m.chunk).join("");
+    if (i < 0) return t;
+    return (start > 0 ? "…" : "") + t + (end < page.len ? "…" : "");
+  }
+
+  return { loadManifest, query, snippet };
 }
 
 function renderHits(container, hits) {
@@ -63,7 +149,7 @@ function setupSearch(root) {
   const results = document.getElementById("searchResults");
   if (!input || !results) return;
 
-  let index = null;
+  const index = createSearchIndex(root);
   let lastQ = "";
 
   function hide() {
@@ -80,13 +166,12 @@ function setupSearch(root) {
     hide();
   });
 
-  input.addEventListener("focus", async () => {
-    if (!index) index = await loadSearchIndex(root);
+  input.addEventListener("focus", () => {
+    index.loadManifest();
   });
 
   input.addEventListener("input", async () => {
     const q = normalize(input.value);
-    if (!index) index = await loadSearchIndex(root);
     if (!q) {
       hide();
       lastQ = "";
@@ -94,26 +179,11 @@ function setupSearch(root) {
     }
     if (q === lastQ) return;
     lastQ = q;
-    const hits = [];
-    for (const item of index || []) {
-      const titleNorm = normalize(item.title);
-      const textNorm = normalize(item.text);
-      const inTitle = titleNorm.includes(q);
-      const inText = textNorm.includes(q);
-      if (inTitle || inText) {
-        // Basic ranking:
-        // - title hits dominate
-        // - more occurrences rank higher
-        const score = (inTitle ? 100 : 0) + 10 * countOccurrences(titleNorm, q) + countOccurrences(textNorm, q);
-        hits.push({
-          href: item.href,
-          title: item.title,
-          snippet: snippet(item.text, q),
-          score,
-        });
-      }
-    }
-    hits.sort((a, b) => (b.score || 0) - (a.score || 0));
+    const ranked = (await index.query(q)).slice(0, 20);
+    const hits = await Promise.all(
+      ranked.map(async (h) => ({ href: h.page.href, title: h.page.title, snippet: await index.snippet(h) }))
+    );
+    if (q !== lastQ) return; // a newer query superseded this one
     show();
     renderHits(results, hits);
   });
@@ -0,0 +1,111 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+
+import add_bach_anchors as aba  # noqa: E402
+from _core import corpus  # noqa: E402
+
+
+CHAPTER = """# Chapter 1
+
+[BACH] A self model is the model the mind builds of itself, for control of attention.
+
+[BACH] Valence and motivation shape what the agent wants to learn.
+
+[BACH] Nothing in here overlaps with anything.
+
+[BACH] Already anchored. <!-- src: yt_b @ 00:10:00 -->
+
+## Anchors (sources + timecodes)
+- yt_a @ 00:01:00 (keywords: self model, consciousness, attention)
+- yt_b @ 00:10:00 (keywords: motivation, valence, reward)
+- yt_c @ 00:20:00 (keywords: model, world model, prediction)
+"""
+
+NOTE_C = """# yt_c — Talk
+
+## Key segments (timecodes)
+- [00:19:30-00:19:40] keywords: simulation, game engine
+- [00:45:00-00:45:10] keywords: ethics
+"""
+
+
+class TestAnchorIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.notes = self.dir / "notes"
+        self.notes.mkdir()
+        (self.notes / "yt_c.md").write_text(NOTE_C, encoding="utf-8")
+        self.anchors = aba.load_chapter_anchors(CHAPTER.splitlines())
+        corpus.clear()
+
+    def tearDown(self) -> None:
+        corpus.clear()
+        self.tmp.cleanup()
+
+    def test_note_tags_near_locator(self) -> None:
+        self.assertEqual(aba.note_tags(self.anchors[2], self.notes), ["simulation", "game engine"])
+        self.assertEqual(aba.note_tags(self.anchors[0], self.notes), [])
+
+    def test_ranking_and_ambiguity_meta(self) -> None:
+        index = aba.AnchorIndex.build(self.anchors, self.notes)
+
+        a, meta = aba.choose_anchor_with_confidence("The self model drives attention.", self.anchors, index)
+        self.assertEqual((a.source_id, meta), ("yt_a", {}))
+
+        # Note tags count: only yt_c's note mentions simulations.
+        a, meta = aba.choose_anchor_with_confidence("The mind runs simulations, like a game engine.", self.anchors, index)
+        self.assertEqual((a.source_id, meta), ("yt_c", {}))
+
+        a, meta = aba.choose_anchor_with_confidence("Nothing in here overlaps.", self.anchors, index)
+        self.assertEqual(a.source_id, "yt_a")  # first anchor on a tie
+        self.assertEqual(meta, {"auto": "needs_review", "score": "0.000", "margin": "0.000", "tie": "1"})
+
+    def test_scores_are_deterministic(self) -> None:
+        ctx = "models of models: a world model predicts, a self model attends"
+        first = aba.AnchorIndex.build(self.anchors, self.notes).scores(ctx)
+        reordered = aba.AnchorIndex.build(self.anchors, self.notes)
+        reordered.idf = dict(reversed(list(reordered.idf.items())))
+        self.assertEqual(reordered.scores(ctx), first)
+        self.assertEqual(aba.AnchorIndex.from_json(aba.AnchorIndex.build(self.anchors, self.notes).to_json()).scores(ctx), first)
+
+    def test_cache_round_trip_and_invalidation(self) -> None:
+        cache = self.dir / "cache" / "ch01.json"
+        built = aba.load_anchor_index(self.anchors, cache, self.notes)
+        self.assertTrue(cache.exists())
+        key = aba.index_key(self.anchors, self.notes)
+        self.assertIn(key, cache.read_text(encoding="utf-8"))
+
+        cached = aba.load_anchor_index(self.anchors, cache, self.notes)
+        self.assertEqual((cached.idf, cached.vectors), (built.idf, built.vectors))
+
+        (self.notes / "yt_c.md").write_text(NOTE_C.replace("simulation", "simulation, dream"), encoding="utf-8")
+        self.assertNotEqual(aba.index_key(self.anchors, self.notes), key)
+        key = aba.index_key(self.anchors, self.notes)
+        with mock.patch.object(aba, "code_fingerprint", return_value="edited"):
+            self.assertNotEqual(aba.index_key(self.anchors, self.notes), key)
+        rebuilt = aba.load_anchor_index(self.anchors, cache, self.notes)
+        self.assertIn("dream", rebuilt.idf)
+
+    def test_process_chapter_only_fills_missing_anchors(self) -> None:
+        chapter = self.dir / "ch01.md"
+        chapter.write_text(CHAPTER, encoding="utf-8")
+        changed, total, anchored = aba.process_chapter(chapter, cache_dir=None)
+        self.assertEqual((changed, total, anchored), (True, 4, 4))
+        lines = [ln for ln in chapter.read_text(encoding="utf-8").splitlines() if ln.startswith("[BACH]")]
+        self.assertTrue(lines[0].endswith("<!-- src: yt_a @ 00:01:00 -->"), lines[0])
+        self.assertIn("yt_b @ 00:10:00", lines[1])
+        self.assertIn("auto=needs_review", lines[2])
+        self.assertEqual(lines[3], "[BACH] Already anchored. <!-- src: yt_b @ 00:10:00 -->")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import csv
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+
+import asr_faster_whisper as asr  # noqa: E402
+
+
+class FakePcm:
+    """Stands in for the memory-mapped samples of one media file."""
+
+    def __init__(self, name: str, n: int) -> None:
+        self.name = name
+        self.n = n
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, sl: slice) -> "FakePcm":
+        return FakePcm(self.name, len(range(self.n)[sl]))
+
+
+def fake_pcm_module(seconds: float) -> types.ModuleType:
+    mod = types.ModuleType("_core.pcm")
+    mod.load_pcm = lambda media, cache_dir=None, **kw: FakePcm(Path(media).name, int(seconds * asr.SR))  # type: ignore[attr-defined]
+    return mod
+
+
+class FakeWhisperModel:
+    def __init__(self, name: str, **kwargs: object) -> None:
+        self.kwargs = kwargs
+
+    def transcribe(self, audio: FakePcm, **kwargs: object):
+        if "broken" in audio.name:
+            raise RuntimeError("decode failed")
+        return [SimpleNamespace(start=0.0, end=1.5, text=" hello")], SimpleNamespace(language="en")
+
+
+class TestAsrPipeline(unittest.TestCase):
+    def test_pipeline_records_each_source_once_through_the_journal(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            tdir = root / "transcripts"
+            (root / "sources").mkdir()
+            with (root / "sources" / "sources.csv").open("w", encoding="utf-8", newline="") as f:
+                w = csv.DictWriter(f, fieldnames=["source_id", "kind", "url", "published_date"])
+                w.writeheader()
+                for sid in ("yt_a", "yt_broken", "yt_gone"):
+                    w.writerow({"source_id": sid, "kind": "youtube", "url": f"https://youtu.be/{sid}", "published_date": ""})
+
+            def fake_download(url: str, sid: str, out_dir: Path, **kwargs: object):
+                if sid == "yt_gone":
+                    return None, "video unavailable"
+                out_dir.mkdir(parents=True, exist_ok=True)
+                p = out_dir / f"{sid}.m4a"
+                p.write_bytes(b"audio")
+                return p, ""
+
+            fake_fw = types.ModuleType("faster_whisper")
+            fake_fw.WhisperModel = FakeWhisperModel  # type: ignore[attr-defined]
+            with mock.patch.multiple(
+                asr,
+                ROOT=root,
+                SOURCES_CSV=root / "sources" / "sources.csv",
+                TRANSCRIPTS_DIR=tdir,
+                INDEX_CSV=tdir / "_index.csv",
+                INDEX_JOURNAL=tdir / "_index.asr.journal.jsonl",
+                download_audio=fake_download,
+            ), mock.patch.dict(sys.modules, {"faster_whisper": fake_fw, "_core.pcm": fake_pcm_module(2.0)}):
+                tdir.mkdir()
+                rc = asr.main(
+                    ["--source-id", "yt_a", "--source-id", "yt_broken", "--source-id", "yt_gone", "--media-dir", str(tdir / "_media")]
+                )
+
+            self.assertEqual(rc, 0)
+            self.assertFalse((tdir / "_index.asr.journal.jsonl").exists())
+            with (tdir / "_index.csv").open(encoding="utf-8", newline="") as f:
+                rows = {r["source_id"]: r for r in csv.DictReader(f)}
+            self.assertEqual(rows["yt_a"]["status"], "ok")
+            self.assertEqual(rows["yt_a"]["transcript_path"], "transcripts/yt_a.en.asr.vtt")
+            self.assertEqual(rows["yt_a"]["media_path"], "transcripts/_media/yt_a.m4a")
+            self.assertIn("hello", (tdir / "yt_a.en.asr.vtt").read_text(encoding="utf-8"))
+            self.assertEqual(rows["yt_broken"]["status"], "error")
+            self.assertIn("decode failed", rows["yt_broken"]["error"])
+            self.assertEqual(rows["yt_gone"]["media_status"], "error")
+
+
+class SeamModel:
+    """Emits fixed absolute cues, shifted into the window it was asked to decode."""
+
+    CUES = [(0.0, 4.0, "one"), (4.0, 9.0, "two"), (9.0, 14.0, "three"), (14.0, 20.0, "four")]
+
+    def __init__(self) -> None:
+        self.calls: list = []
+
+    def transcribe(self, audio, **kwargs: object):
+        offset = 20.0 - len(audio) / asr.SR
+        self.calls.append(offset)
+        segs = [SimpleNamespace(start=s - offset, end=e - offset, text=t) for s, e, t in self.CUES if e > offset]
+        return iter(segs), SimpleNamespace(language="en")
+
+
+class TestChunkedAsr(unittest.TestCase):
+    def test_split_on_silences_prefers_gaps(self) -> None:
+        sr = asr.SR
+        speech = [{"start": 0, "end": 58 * sr}, {"start": 62 * sr, "end": 130 * sr}, {"start": 131 * sr, "end": 200 * sr}]
+        self.assertEqual(asr.split_on_silences(speech, 200.0, 60.0), [(0.0, 60.0), (60.0, 130.5), (130.5, None)])
+        # No silence at all: hard cuts at the target length.
+        self.assertEqual(asr.split_on_silences([{"start": 0, "end": 200 * sr}], 200.0, 60.0)[:2], [(0.0, 60.0), (60.0, 120.0)])
+        self.assertEqual(asr.split_on_silences(speech, 80.0, 60.0), [(0.0, None)])
+
+    def test_resume_truncates_torn_cue_and_dedupes_seam(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            part = Path(td) / "yt_a.en.asr.vtt.part"
+            w = asr.PartWriter(part, resume=True)
+            w.add(0.0, 4.0, "one")
+            w.add(4.0, 9.0, "two")
+            w.close()
+            with part.open("ab") as f:
+                f.write(b"00:00:09.000 --> 00:00:1")  # crash mid-cue
+
+            model = SeamModel()
+            with mock.patch.object(asr, "_WORKER_MODEL", model), mock.patch.dict(sys.modules, {"_core.pcm": fake_pcm_module(20.0)}):
+                lang = asr.transcribe_chunk("a.m4a", str(part), "en", 0.0, None, True, td)
+                # A finished chunk is not decoded again.
+                asr.transcribe_chunk("a.m4a", str(part), "en", 0.0, None, True, td)
+
+            self.assertEqual(lang, "en")
+            self.assertEqual(model.calls, [9.0 - asr.RESUME_OVERLAP_S])
+            out = Path(td) / "yt_a.en.asr.vtt"
+            asr.assemble_parts(out, 1)
+            text = out.read_text(encoding="utf-8")
+            self.assertEqual([ln for ln in text.splitlines() if ln and "-->" not in ln], ["WEBVTT", "one", "two", "three", "four"])
+            self.assertFalse(part.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
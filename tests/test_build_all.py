@@ -0,0 +1,29 @@
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+
+import build_all  # noqa: E402
+
+
+class TestBuildAll(unittest.TestCase):
+    def test_steps_wait_only_for_writers_of_their_inputs(self) -> None:
+        deps = build_all.step_dependencies(build_all.STEPS)
+        self.assertEqual(deps["build_readme"], [])
+        self.assertEqual(deps["build_references"], ["add_bach_anchors"])
+        self.assertIn("build_references", deps["build_book_md"])
+        self.assertNotIn("build_book_md", deps["build_book_public_md"])
+        self.assertEqual(deps["build_site"], ["add_bach_anchors"])
+
+    def test_site_output_does_not_depend_on_cwd(self) -> None:
+        step = next(s for s in build_all.STEPS if s.name == "build_site")
+        out = step.args[step.args.index("--out") + 1]
+        self.assertEqual(Path(out), ROOT / "dist")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import csv
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+
+import build_source_notes as bsn  # noqa: E402
+from bench_source_notes import build_note_reference, keyword_hits_reference, top_segments_reference  # noqa: E402
+
+
+TRICKY = [
+    "",
+    "Nothing to see here.",
+    "The World Model and the world-model of a SELF-MODEL",
+    "prediction error signals drive the controller's control system",
+    "a predictor predicts; predictions err",
+    "self modelling, remodel, modelled",
+    "global workspace vs. working memory vs workspace",
+    "Normative contracts: norms, agency and agents",
+    "coordinationsocialculturelanguage",
+    "error signalerror signal",
+    "İNTELLİGENCE and ΑΣ valence",
+    "controlsystem control  system control system",
+]
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        self.matcher = bsn.KeywordMatcher(bsn.KEYWORDS)
+
+    def test_matches_substring_reference(self) -> None:
+        for text in TRICKY:
+            self.assertEqual(self.matcher.hits(text), keyword_hits_reference(text, bsn.KEYWORDS), msg=text)
+
+    def test_matches_reference_on_random_text(self) -> None:
+        rng = random.Random(11)
+        pieces = bsn.KEYWORDS + ["the", "self", "-", " ", "s", "ion", "al", "er", "Model", "CONTROL"]
+        for _ in range(2000):
+            text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+            self.assertEqual(self.matcher.hits(text), keyword_hits_reference(text, bsn.KEYWORDS), msg=text)
+
+    def test_notes_are_byte_identical(self) -> None:
+        rng = random.Random(5)
+        words = ["we", "think", "about", "how", "it", "works", "and", "why"] * 6 + bsn.KEYWORDS
+        segments = []
+        for i in range(3000):
+            text = " ".join(rng.choice(words) for _ in range(rng.randint(1, 12)))
+            segments.append((i * 2.5, i * 2.5 + 2.5, text.upper() if i % 7 == 0 else text))
+        segments += [(9000.0 + i, 9001.0 + i, t) for i, t in enumerate(TRICKY)]
+        meta = {"title": "Test", "kind": "podcast", "url": "https://example.org/x"}
+        for max_segments, min_gap in ((8, 60), (20, 5), (0, 60)):
+            new = bsn.build_note("yt_x", meta, segments, self.matcher, max_segments=max_segments, min_gap_s=min_gap)
+            old = build_note_reference("yt_x", meta, segments, bsn.KEYWORDS, max_segments=max_segments, min_gap_s=min_gap)
+            self.assertEqual(new.encode("utf-8"), old.encode("utf-8"))
+        self.assertIn("dominant terms include", new)
+
+
+class TestTopSegments(unittest.TestCase):
+    def test_matches_reference(self) -> None:
+        rng = random.Random(2)
+        paths = [("heap", 1 << 62)] + ([("numpy", 0)] if bsn.np is not None else [])
+        for trial in range(60):
+            n = rng.randint(0, 400)
+            # Coarse starts and few distinct scores make ties and gap conflicts common.
+            starts = sorted(rng.choice([rng.randint(0, 300) * 1.0, rng.random() * 600]) for _ in range(n))
+            segments = [(st, st + 2.0, "") for st in starts]
+            hits = [[rng.choice(bsn.KEYWORDS) for _ in range(rng.choice([0, 0, 1, 1, 2]))] for _ in range(n)]
+            max_segments = rng.choice([0, 1, 8, 50])
+            min_gap = rng.choice([0, 5, 60])
+            ref = top_segments_reference(segments, hits, max_segments, min_gap)
+            for label, numpy_min in paths:
+                with mock.patch.object(bsn, "NUMPY_MIN_SEGMENTS", numpy_min):
+                    self.assertEqual(bsn.top_segments(segments, hits, max_segments, min_gap), ref, msg=f"{label} trial {trial}")
+
+
+def _vtt(lines):
+    cues = [f"00:00:{i * 5:02}.000 --> 00:00:{i * 5 + 4:02}.000\n{text}\n" for i, text in enumerate(lines)]
+    return "WEBVTT\n\n" + "\n".join(cues)
+
+
+class TestIncrementalNotes(unittest.TestCase):
+    def test_skips_unchanged_sources(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            (root / "transcripts").mkdir()
+            sids = ["yt_a", "yt_b", "yt_c"]
+            with (root / "sources.csv").open("w", encoding="utf-8", newline="") as f:
+                w = csv.DictWriter(f, fieldnames=["source_id", "title", "kind"])
+                w.writeheader()
+                for sid in sids:
+                    w.writerow({"source_id": sid, "title": f"Talk {sid}", "kind": "youtube"})
+            with (root / "_index.csv").open("w", encoding="utf-8", newline="") as f:
+                w = csv.DictWriter(f, fieldnames=["source_id", "status", "transcript_path", "time_offset_seconds"])
+                w.writeheader()
+                for sid in sids:
+                    (root / "transcripts" / f"{sid}.vtt").write_text(_vtt(["the world model", f"agency in {sid}"]), encoding="utf-8")
+                    w.writerow({"source_id": sid, "status": "ok", "transcript_path": f"transcripts/{sid}.vtt", "time_offset_seconds": ""})
+            out = root / "notes"
+            argv = ["--sources", str(root / "sources.csv"), "--index", str(root / "_index.csv"), "--out-dir", str(out), "--force", "--jobs", "1"]
+
+            built = []
+            real_build = bsn.build_source
+
+            def build_source(sid, *a, **kw):
+                built.append(sid)
+                return real_build(sid, *a, **kw)
+
+            with mock.patch.object(bsn, "ROOT", root), mock.patch.object(bsn, "CUES_DIR", root / "_cues"), mock.patch.object(
+                bsn, "SPEAKERS_DIR", root / "_speakers"
+            ), mock.patch.object(bsn, "FINGERPRINTS_PATH", root / "_fp.json"), mock.patch.object(bsn, "build_source", build_source):
+                bsn.main(argv)
+                self.assertEqual(sorted(built), sids)
+                first = (out / "yt_a.md").read_text(encoding="utf-8")
+                self.assertIn("world model", first)
+
+                built.clear()
+                bsn.main(argv)
+                self.assertEqual(built, [])
+
+                # A changed transcript, a hand-edited note and a new option each force a rebuild.
+                (root / "transcripts" / "yt_b.vtt").write_text(_vtt(["consciousness"]), encoding="utf-8")
+                (out / "yt_c.md").write_text("edited\n", encoding="utf-8")
+                bsn.main(argv)
+                self.assertEqual(sorted(built), ["yt_b", "yt_c"])
+                self.assertIn("consciousness", (out / "yt_b.md").read_text(encoding="utf-8"))
+
+                built.clear()
+                bsn.main(argv + ["--max-segments", "3"])
+                self.assertEqual(sorted(built), sids)
+                self.assertEqual((out / "yt_a.md").read_text(encoding="utf-8"), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
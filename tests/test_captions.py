@@ -0,0 +1,81 @@
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+
+from _core.captions import Cue, iter_cues, iter_html_cues, iter_timed_cues, parse_cue_time  # noqa: E402
+
+
+VTT = "\n".join(
+    [
+        "WEBVTT",
+        "Kind: captions",
+        "",
+        "NOTE this is a comment",
+        "",
+        "cue-1",
+        "00:00:01.500 --> 00:00:03.000 align:start position:0%",
+        "hello<00:00:02.000><c> world</c>",
+        "00:00:03.000 --> 00:00:04.000",
+        "no blank line &amp; before",
+        "",
+        "00:05.000 --> 00:06.000",
+        "",
+        "",
+    ]
+)
+
+SRT = "\n".join(
+    [
+        "1",
+        "00:00:01,000 --> 00:00:02,500",
+        "first   line",
+        "second",
+        "",
+        "2",
+        "00:00:03,000 --> 00:00:04,000",
+        "<i>third</i>",
+        "",
+    ]
+)
+
+
+class TestCaptions(unittest.TestCase):
+    def test_parse_cue_time(self) -> None:
+        self.assertEqual(parse_cue_time("00:01:02.5"), 62.5)
+        self.assertEqual(parse_cue_time("01:02,050"), 62.05)
+        self.assertEqual(parse_cue_time("00:01:02"), 62.0)
+        self.assertIsNone(parse_cue_time("1:2"))
+
+    def test_vtt_cues(self) -> None:
+        cues = list(iter_timed_cues(io.StringIO(VTT)))
+        self.assertEqual(
+            cues,
+            [Cue(1.5, 3.0, "hello world"), Cue(3.0, 4.0, "no blank line & before")],
+        )
+
+    def test_srt_cues(self) -> None:
+        cues = list(iter_timed_cues(io.StringIO(SRT)))
+        self.assertEqual(cues, [Cue(1.0, 2.5, "first line second"), Cue(3.0, 4.0, "third")])
+
+    def test_html_chunks_skip_scripts(self) -> None:
+        doc = "<html><script>var x = 1;</script><p>one\n two</p><style>p{}</style>three</html>"
+        self.assertEqual([c.text for c in iter_html_cues(io.StringIO(doc), chunk_chars=None)], ["one two three"])
+        self.assertEqual([c.text for c in iter_html_cues(io.StringIO(doc), chunk_chars=4)], ["one", "two", "thre", "e"])
+
+    def test_offset_is_applied_and_clamped(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            p = Path(td) / "x.srt"
+            p.write_text(SRT, encoding="utf-8")
+            cues = list(iter_cues(p, offset_s=-1.5))
+        self.assertEqual([(c.start, c.end) for c in cues], [(0.0, 1.0), (1.5, 2.5)])
+
+
+if __name__ == "__main__":
+    unittest.main()
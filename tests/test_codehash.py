@@ -0,0 +1,49 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+
+from _core import codehash  # noqa: E402
+
+
+class TestCodeFingerprint(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.core = Path(self.tmp.name) / "_core"
+        self.core.mkdir()
+        (self.core / "a.py").write_text("from _core.b import x\n", encoding="utf-8")
+        (self.core / "b.py").write_text("x = 1\n", encoding="utf-8")
+        (self.core / "c.py").write_text("y = 1\n", encoding="utf-8")
+        self.script = Path(self.tmp.name) / "tool.py"
+        self.script.write_text("import json\nfrom _core import a\n\ndef f():\n    import _core.missing\n", encoding="utf-8")
+        patcher = mock.patch.object(codehash, "CORE_DIR", self.core.resolve())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_follows_core_imports_transitively(self) -> None:
+        self.assertEqual([p.name for p in codehash.core_imports(self.script)], ["a.py"])
+        before = codehash.code_fingerprint(self.script)
+        (self.core / "c.py").write_text("y = 2\n", encoding="utf-8")  # not imported
+        self.assertEqual(codehash.code_fingerprint(self.script), before)
+        (self.core / "b.py").write_text("x = 2\n", encoding="utf-8")  # imported through a.py
+        self.assertNotEqual(codehash.code_fingerprint(self.script), before)
+
+    def test_builders_cover_their_helpers(self) -> None:
+        patcher = mock.patch.object(codehash, "CORE_DIR", (ROOT / "scripts" / "_core").resolve())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        names = {p.name for p in codehash.core_imports(ROOT / "scripts" / "build_site.py")}
+        self.assertTrue({"corpus.py", "intervals.py"} <= names)
+        names = {p.name for p in codehash.core_imports(ROOT / "scripts" / "build_source_notes.py")}
+        self.assertTrue({"captions.py", "cuestore.py", "intervals.py"} <= names)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+
+from _core.captions import iter_cues  # noqa: E402
+from _core.cuestore import cue_store_path, open_cues  # noqa: E402
+
+
+VTT = "\n".join(
+    [
+        "WEBVTT",
+        "",
+        "00:00:01.500 --> 00:00:03.000",
+        "hello <c>world</c>",
+        "",
+        "00:00:03.000 --> 00:00:04.000",
+        "café — naïve",
+        "",
+    ]
+)
+
+
+class TestCueStore(unittest.TestCase):
+    def test_matches_parser_and_applies_offset(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            tmp = Path(td)
+            vtt = tmp / "a.vtt"
+            vtt.write_text(VTT, encoding="utf-8")
+            cache = tmp / "_cues"
+            with open_cues("a", vtt, cache_dir=cache) as cues:
+                self.assertEqual(list(cues), list(iter_cues(vtt)))
+                self.assertEqual(len(cues), 2)
+                self.assertEqual(cues.text(1), "café — naïve")
+            self.assertTrue(cue_store_path(cache, "a").exists())
+            with open_cues("a", vtt, cache_dir=cache, offset_s=-2.0) as cues:
+                self.assertEqual(list(cues), list(iter_cues(vtt, offset_s=-2.0)))
+
+    def test_rebuilds_only_when_transcript_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            tmp = Path(td)
+            vtt = tmp / "a.vtt"
+            vtt.write_text(VTT, encoding="utf-8")
+            cache = tmp / "_cues"
+            open_cues("a", vtt, cache_dir=cache).close()
+            store = cue_store_path(cache, "a")
+            built = store.stat().st_mtime_ns
+            open_cues("a", vtt, cache_dir=cache).close()
+            self.assertEqual(store.stat().st_mtime_ns, built)
+
+            vtt.write_text(VTT + "\n00:00:05.000 --> 00:00:06.000\nmore\n", encoding="utf-8")
+            st = vtt.stat()
+            os.utime(vtt, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+            with open_cues("a", vtt, cache_dir=cache) as cues:
+                self.assertEqual([c.text for c in cues][-1], "more")
+
+    def test_html_chunk_modes_use_separate_files(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            tmp = Path(td)
+            page = tmp / "p.html"
+            page.write_text("<p>" + "word " * 100 + "</p>", encoding="utf-8")
+            cache = tmp / "_cues"
+            with open_cues("p", page, cache_dir=cache, offset_s=5.0) as cues:
+                self.assertEqual(list(cues), list(iter_cues(page)))
+            with open_cues("p", page, cache_dir=cache, html_chunk_chars=None) as cues:
+                self.assertEqual(len(cues), 1)
+            self.assertNotEqual(cue_store_path(cache, "p"), cue_store_path(cache, "p", html_chunk_chars=None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,247 @@
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+HAVE_DEPS = all(importlib.util.find_spec(m) is not None for m in ("numpy", "faster_whisper"))
+
+
+@unittest.skipUnless(HAVE_DEPS, "numpy/faster-whisper not installed")
+class TestLogmelMeans(unittest.TestCase):
+    def test_matches_per_chunk_features(self) -> None:
+        import numpy as np
+
+        import diarize_bach as d
+
+        rng = np.random.default_rng(3)
+        y = rng.standard_normal(d.SR * 60).astype(np.float32)
+        speech = [{"start": 1234, "end": 20 * d.SR + 77}, {"start": 21 * d.SR, "end": 21 * d.SR + 300}, {"start": 30 * d.SR, "end": 65 * d.SR}]
+        chunks = d.speech_chunks(speech, 8.0, 0.01)
+        self.assertEqual(chunks[0], (1234 / d.SR, 1234 / d.SR + 8.0))
+        self.assertEqual(len(chunks), 3 + 1 + 5)
+        spans = [(int(t * d.SR), int(t2 * d.SR)) for t, t2 in chunks]
+
+        for block in (d.FRAME_BLOCK, 97):
+            got = d.logmel_means(y, spans, block_frames=block)
+            for (a0, a1), f in zip(spans, got):
+                ref = d.logmel_mean(y[a0:a1])
+                if ref is None:
+                    self.assertIsNone(f)
+                else:
+                    np.testing.assert_allclose(f, ref, rtol=0, atol=1e-4)
+        # The 300-sample region is shorter than one window; the last region runs past the end.
+        self.assertIsNone(got[[i for i, (t, _e) in enumerate(chunks) if t == 21.0][0]])
+        self.assertIsNotNone(got[-2])  # 54-62 s, clipped at 60 s
+        self.assertIsNone(got[-1])  # 62-65 s
+
+
+@unittest.skipUnless(HAVE_DEPS, "numpy/faster-whisper not installed")
+class TestBatchSelection(unittest.TestCase):
+    def test_is_up_to_date(self) -> None:
+        import diarize_bach as d
+
+        with tempfile.TemporaryDirectory() as td, mock.patch.object(d, "ROOT", Path(td)):
+            media = Path(td) / "transcripts" / "_media" / "yt_a.m4a"
+            media.parent.mkdir(parents=True)
+            media.write_bytes(b"audio")
+            out = Path(td) / "yt_a.speakers.json"
+            opts = d.DiarizeOptions()
+            self.assertFalse(d.is_up_to_date(out, media, opts))
+            doc = {"audio_path": "transcripts/_media/yt_a.m4a", "chunk_seconds": 8.0, "min_chunk_seconds": 2.0}
+            out.write_text(json.dumps(doc), encoding="utf-8")
+            self.assertTrue(d.is_up_to_date(out, media, opts))
+            self.assertFalse(d.is_up_to_date(out, media, d.DiarizeOptions(chunk_seconds=4.0)))
+            st = out.stat()
+            os.utime(media, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            self.assertFalse(d.is_up_to_date(out, media, opts))
+
+    def test_cluster_cache_round_trip(self) -> None:
+        import numpy as np
+
+        import diarize_bach as d
+
+        sc = d.SourceClusters(
+            np.array([[0.0, 8.0], [8.0, 16.0]]),
+            np.array([0, 1], dtype=np.int32),
+            np.eye(2, 40, dtype=np.float32),
+            np.zeros(40, dtype=np.float32),
+            np.ones(40, dtype=np.float32),
+            12.5,
+            "transcripts/_media/yt_a.m4a",
+            16.0,
+            8.0,
+            2.0,
+        )
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "yt_a.clusters.npz"
+            sc.save(path)
+            got = d.SourceClusters.load(path)
+        assert got is not None
+        np.testing.assert_array_equal(got.centroids, sc.centroids)
+        self.assertEqual((got.inertia, got.audio_path, got.chunk_seconds), (12.5, sc.audio_path, 8.0))
+
+
+@unittest.skipUnless(HAVE_DEPS, "numpy/faster-whisper not installed")
+class TestPcmSharedWithAsr(unittest.TestCase):
+    def test_fresh_download_is_decoded_once_for_asr_and_diarization(self) -> None:
+        import types
+        from types import SimpleNamespace
+
+        import numpy as np
+
+        import asr_faster_whisper as asr
+        import diarize_bach as d
+        from _core.refbank import ReferenceBank
+
+        decoded = []
+
+        def decode_audio(path: str, sampling_rate: int):
+            decoded.append(Path(path).parent.name)
+            return np.random.default_rng(0).standard_normal(sampling_rate * 10).astype(np.float32)
+
+        class Model:
+            def transcribe(self, audio, **kwargs):
+                return [SimpleNamespace(start=0.0, end=1.0, text=" hi")], SimpleNamespace(language="en")
+
+        fake_audio = types.ModuleType("faster_whisper.audio")
+        fake_audio.decode_audio = decode_audio  # type: ignore[attr-defined]
+        with tempfile.TemporaryDirectory() as td, mock.patch.dict(sys.modules, {"faster_whisper.audio": fake_audio}):
+            root = Path(td)
+            pcm_dir = root / "transcripts" / "_pcm"
+            tmp_audio = root / "transcripts" / "_tmp_audio" / "yt_a.m4a"
+            media_dir = root / "transcripts" / "_media"
+            for p in (tmp_audio.parent, media_dir):
+                p.mkdir(parents=True)
+            tmp_audio.write_bytes(b"audio")
+            job = asr.AsrJob("yt_a", {"source_id": "yt_a"}, root / "yt_a.en.asr.vtt", tmp_audio, tmp_audio)
+
+            with mock.patch.object(asr, "ROOT", root), mock.patch.object(asr, "_WORKER_MODEL", Model()):
+                asr.transcribe_chunk(str(tmp_audio), str(root / "yt_a.part"), "en", 0.0, None, False, str(pcm_dir))
+                asr.retain_audio(job, media_dir)
+            self.assertEqual(job.row["media_status"], "ok")
+
+            with mock.patch.object(d, "ROOT", root), mock.patch.object(d, "MEDIA_DIR", media_dir), mock.patch.object(d, "PCM_DIR", pcm_dir):
+                bank = ReferenceBank.empty(d.N_MELS, feature=d.FEATURE)
+                self.assertTrue(d.add_bach_segment(bank, "yt_a", 1.0, 6.0, "podcast", {"yt_a": job.row}))
+
+            self.assertEqual(decoded, ["_tmp_audio"])
+            self.assertEqual(len(list(pcm_dir.glob("*.npy"))), 1)
+
+    def test_delete_audio_drops_the_decoded_copy(self) -> None:
+        import types
+        from types import SimpleNamespace
+
+        import numpy as np
+
+        import asr_faster_whisper as asr
+        from _core.pcm import load_pcm
+
+        fake_audio = types.ModuleType("faster_whisper.audio")
+        fake_audio.decode_audio = lambda path, sampling_rate: np.zeros(160, dtype=np.float32)  # type: ignore[attr-defined]
+        with tempfile.TemporaryDirectory() as td, mock.patch.dict(sys.modules, {"faster_whisper.audio": fake_audio}):
+            root = Path(td)
+            audio = root / "yt_a.m4a"
+            audio.write_bytes(b"audio")
+            load_pcm(audio, root / "_pcm")
+            job = asr.AsrJob("yt_a", {}, root / "yt_a.en.asr.vtt", audio, audio)
+            args = SimpleNamespace(language="en", delete_audio=True)
+            with mock.patch.object(asr, "ROOT", root), mock.patch.object(asr, "PCM_DIR", root / "_pcm"):
+                asr.finish_transcription(job, detected_lang="en", error="", args=args, media_dir=root / "_media")
+            self.assertFalse(audio.exists())
+            self.assertEqual(list((root / "_pcm").iterdir()), [])
+
+
+class _FakeSession:
+    # Stands in for the Silero ONNX session: "speech" wherever a 512-sample window is loud.
+    def run(self, _names, feeds):
+        import numpy as np
+
+        x = feeds["input"][:, 64:]
+        probs = np.where(np.abs(x).mean(axis=1) > 0.05, 0.9, 0.05).astype(np.float32)[:, None]
+        return [probs, feeds["h"], feeds["c"]]
+
+
+@unittest.skipUnless(HAVE_DEPS, "numpy/faster-whisper not installed")
+class TestStreaming(unittest.TestCase):
+    def test_windowed_features_match_whole_file(self) -> None:
+        import numpy as np
+
+        import diarize_bach as d
+
+        rng = np.random.default_rng(5)
+        y = rng.standard_normal(d.SR * 30 + 11).astype(np.float32)
+        speech = [{"start": 999, "end": 9 * d.SR}, {"start": 12 * d.SR, "end": 12 * d.SR + 200}, {"start": 20 * d.SR + 3, "end": 33 * d.SR}]
+        spans = [(int(t * d.SR), int(t2 * d.SR)) for t, t2 in d.speech_chunks(speech, 4.0, 0.01)]
+        ref = d.logmel_means(y, spans)
+        for window in (d.SR * 7 + 13, 4000, len(y)):
+            got = d.logmel_means_windowed((y[a : a + window] for a in range(0, len(y), window)), spans)
+            self.assertEqual([g is None for g in got], [r is None for r in ref])
+            for g, r in zip(got, ref):
+                if r is not None:
+                    np.testing.assert_allclose(g, r, rtol=0, atol=1e-5)
+
+    def test_stream_matches_in_memory(self) -> None:
+        import wave
+
+        import numpy as np
+        from faster_whisper import vad as fw_vad
+
+        import diarize_bach as d
+        from _core.refbank import ReferenceBank
+
+        # Two alternating "speakers" with pauses, written as a 16 kHz WAV.
+        rng = np.random.default_rng(7)
+        parts = []
+        for turn in range(8):
+            n = int(rng.uniform(5.0, 12.0) * d.SR)
+            f0 = 140.0 if turn % 2 else 260.0
+            parts.append(0.4 * np.sin(np.arange(n) * (2 * np.pi * f0 / d.SR)) + 0.02 * rng.standard_normal(n))
+            parts.append(0.001 * rng.standard_normal(int(2.5 * d.SR)))
+        pcm = (np.concatenate(parts) * 32767).astype("<i2")
+
+        model = fw_vad.SileroVADModel.__new__(fw_vad.SileroVADModel)
+        model.session = _FakeSession()
+        with tempfile.TemporaryDirectory() as td, mock.patch.object(d, "ROOT", Path(td)), mock.patch.object(
+            d, "PCM_DIR", Path(td) / "_pcm"
+        ), mock.patch.object(fw_vad, "get_vad_model", return_value=model), mock.patch.object(d, "STREAM_WINDOW", d.SR * 9 + 5):
+            media = Path(td) / "yt_a.wav"
+            with wave.open(str(media), "wb") as w:
+                w.setnchannels(1)
+                w.setsampwidth(2)
+                w.setframerate(d.SR)
+                w.writeframes(pcm.tobytes())
+
+            results = []
+            for stream in (True, False):  # streaming first: it also fills the PCM cache
+                status, sc = d.cluster_source("yt_a", {}, media, d.DiarizeOptions(num_speakers=2, stream=stream))
+                self.assertEqual(status, "ok")
+                assert sc is not None
+                results.append(sc)
+            streamed, in_memory = results
+            np.testing.assert_array_equal(streamed.chunks, in_memory.chunks)
+            np.testing.assert_array_equal(streamed.labels, in_memory.labels)
+            np.testing.assert_allclose(streamed.centroids, in_memory.centroids, rtol=0, atol=1e-5)
+            self.assertEqual(streamed.media_duration_s, in_memory.media_duration_s)
+
+            bank = ReferenceBank.empty(d.N_MELS, feature=d.FEATURE)
+            bank.add("podcast", in_memory.mu[None, :], {"source_id": "x", "start_s": 0.0, "end_s": 8.0})
+            docs = [d.label_source("yt_a", {}, sc, bank) for sc in results]
+            for doc in docs:
+                doc.pop("generated_at")
+                doc.pop("kmeans_inertia")
+                for c in doc["clusters"]:
+                    c["similarity_to_bach"] = round(c["similarity_to_bach"], 4)
+            self.assertEqual(docs[0], docs[1])
+            self.assertGreater(len(docs[0]["segments"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+
+from fetch_transcripts import CaptionTrack, pick_caption_track  # noqa: E402
+
+
+VTT = [{"ext": "json3"}, {"ext": "vtt"}]
+
+
+class TestPickCaptionTrack(unittest.TestCase):
+    def test_group_order_and_preferences(self) -> None:
+        info = {
+            "subtitles": {"en-US": VTT, "live_chat": [{"ext": "json"}]},
+            "automatic_captions": {"en-orig": VTT, "en": VTT, "de": VTT},
+        }
+        self.assertEqual(pick_caption_track(info), CaptionTrack("en", "en-US", False, "vtt"))
+        info["subtitles"].pop("en-US")
+        self.assertEqual(pick_caption_track(info), CaptionTrack("en", "en", True, "vtt"))
+        info["automatic_captions"].pop("en")
+        self.assertEqual(pick_caption_track(info), CaptionTrack("en", "en-orig", True, "vtt"))
+
+    def test_fallbacks(self) -> None:
+        self.assertEqual(
+            pick_caption_track({"automatic_captions": {"fr": VTT, "deu": [{"ext": "srt"}]}}),
+            CaptionTrack("de", "deu", True, "srt"),
+        )
+        self.assertEqual(
+            pick_caption_track({"automatic_captions": {"de-DE": VTT, "ger": VTT}}),
+            CaptionTrack("de", "de-DE", True, "vtt"),
+        )
+        self.assertEqual(pick_caption_track({"subtitles": {"ger": VTT}}), CaptionTrack("de", "ger", False, "vtt"))
+        self.assertEqual(pick_caption_track({"subtitles": {"fr": VTT, "es": VTT}}), CaptionTrack("other", "es", False, "vtt"))
+        self.assertIsNone(pick_caption_track({"subtitles": {"live_chat": VTT}, "automatic_captions": {"fr": [{"ext": "json3"}]}}))
+
+
+if __name__ == "__main__":
+    unittest.main()
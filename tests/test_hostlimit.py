@@ -0,0 +1,66 @@
+import asyncio
+import sys
+import time
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+
+from _core.hostlimit import HostPolicy, HostScheduler, run_subprocess  # noqa: E402
+
+
+class TestHostLimit(unittest.TestCase):
+    def test_hosts_share_limiters_by_policy_suffix(self) -> None:
+        async def go() -> None:
+            hosts = HostScheduler({"media.ccc.de": HostPolicy(2, 1.0)}, HostPolicy(4, 4.0))
+            self.assertIs(hosts.limiter("https://cdn.media.ccc.de/x.vtt"), hosts.limiter("https://media.ccc.de/v/talk"))
+            self.assertIs(hosts.limiter("https://www.example.org/a"), hosts.limiter("http://example.org/b"))
+            self.assertIsNot(hosts.limiter("https://example.org/"), hosts.limiter("https://example.com/"))
+
+        asyncio.run(go())
+
+    def test_rate_concurrency_and_throttle(self) -> None:
+        async def go() -> None:
+            hosts = HostScheduler({"h": HostPolicy(concurrency=1, rate=50.0)}, HostPolicy(4, 4.0))
+            active = peak = 0
+
+            async def request() -> None:
+                nonlocal active, peak
+                async with hosts.slot("h"):
+                    active += 1
+                    peak = max(peak, active)
+                    await asyncio.sleep(0)
+                    active -= 1
+
+            t0 = time.monotonic()
+            await asyncio.gather(*(request() for _ in range(6)))
+            self.assertEqual(peak, 1)
+            self.assertGreaterEqual(time.monotonic() - t0, 5 / 50.0 * 0.9)
+
+            lim = hosts.limiter("h")
+            lim.throttle(0.05)
+            self.assertEqual(lim.bucket.rate, 25.0)
+            t0 = time.monotonic()
+            await request()
+            self.assertGreaterEqual(time.monotonic() - t0, 0.04)
+            lim.relax()
+            self.assertEqual(lim.bucket.rate, 30.0)
+
+        asyncio.run(go())
+
+    def test_run_subprocess_timeout(self) -> None:
+        async def go() -> None:
+            ok = await run_subprocess([sys.executable, "-c", "print('hi')"], 10)
+            self.assertEqual((ok.returncode, ok.stdout.strip()), (0, "hi"))
+            slow = await run_subprocess([sys.executable, "-c", "import time; time.sleep(5)"], 0.2, pool=asyncio.Semaphore(1))
+            self.assertEqual(slow.returncode, 124)
+            self.assertIn("timeout", slow.stderr)
+
+        asyncio.run(go())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import gzip
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.error import HTTPError
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+
+from _core.httpclient import HttpClient  # noqa: E402
+
+
+BODY = b"<urlset>" + b"<url>x</url>" * 200 + b"</urlset>"
+ETAG = '"v1"'
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    log: list = []
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+    def send_body(self, status: int, body: bytes, headers: dict) -> None:
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        type(self).log.append((self.path, self.client_address[1], self.headers.get("If-None-Match")))
+        if self.path == "/old":
+            self.send_body(301, b"", {"Location": "/sitemap.xml"})
+        elif self.path == "/sitemap.xml":
+            if self.headers.get("If-None-Match") == ETAG:
+                self.send_body(304, b"", {"ETag": ETAG})
+            elif "gzip" in (self.headers.get("Accept-Encoding") or ""):
+                self.send_body(200, gzip.compress(BODY), {"ETag": ETAG, "Content-Encoding": "gzip"})
+            else:
+                self.send_body(200, BODY, {"ETag": ETAG})
+        elif self.path == "/plain":
+            self.send_body(200, b"no validators", {})
+        else:
+            self.send_body(404, b"missing", {})
+
+
+class TestHttpClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self) -> None:
+        Handler.log = []
+
+    def test_conditional_requests_gzip_and_keepalive(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            client = HttpClient(user_agent="test", cache_dir=Path(td))
+            first = client.get(self.base + "/old")
+            self.assertEqual((first.status, first.body, first.from_cache), (200, BODY, False))
+            self.assertEqual(first.url, self.base + "/sitemap.xml")
+
+            again = client.get(self.base + "/sitemap.xml")
+            self.assertTrue(again.from_cache)
+            self.assertEqual(again.body, BODY)
+            self.assertEqual(Handler.log[-1][2], ETAG)
+            # All three requests reused one connection.
+            self.assertEqual(len({port for _p, port, _e in Handler.log}), 1)
+
+            fresh = HttpClient(user_agent="test", cache_dir=Path(td))
+            self.assertTrue(fresh.get(self.base + "/sitemap.xml").from_cache)
+            self.assertEqual(client.get_text(self.base + "/plain"), "no validators")
+            self.assertFalse(client.get(self.base + "/plain").from_cache)
+
+    def test_errors_raise_http_error(self) -> None:
+        client = HttpClient(user_agent="test", cache_dir=None)
+        with self.assertRaises(HTTPError) as cm:
+            client.get(self.base + "/nope")
+        self.assertEqual(cm.exception.code, 404)
+        # The connection stays usable after an error response.
+        self.assertEqual(client.get(self.base + "/plain").body, b"no validators")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import random
+import re
+import sys
+import unittest
+from typing import List
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+
+import build_site  # noqa: E402
+
+
+def inline_format_reference(s: str, *, root: str) -> str:
+    """
+    The original `inline_format`: every pass runs on every line and fragments are restored
+    by one str.replace per placeholder. build_site.inline_format must match it exactly.
+    """
+    s = build_site.escape(s)
+    protected: List[str] = []
+
+    def stash(fragment: str) -> str:
+        token = f"@@FMT{len(protected)}@@"
+        protected.append(fragment)
+        return token
+
+    # ![alt](src)
+    def make_image(alt: str, src: str) -> str:
+        norm_src = build_site.normalize_site_href(src, root=root)
+        src_attr = norm_src.replace('"', "&quot;").replace("'", "&#x27;")
+        alt_attr = alt.replace('"', "&quot;").replace("'", "&#x27;")
+        return f'<img class="mdimg" src="{src_attr}" alt="{alt_attr}" loading="lazy" />'
+
+    s = re.sub(r"!\[([^\]]*)\]\(([^)]+)\)", lambda m: stash(make_image(m.group(1), m.group(2))), s)
+
+    # `code`
+    s = re.sub(r"`([^`]+)`", lambda m: stash(f"<code>{m.group(1)}</code>"), s)
+
+    # [text](url)
+    def make_anchor(label: str, href: str) -> str:
+        norm_href = build_site.normalize_site_href(href, root=root)
+        # `href` is already escaped except for quotes (escape() uses quote=False).
+        href_attr = norm_href.replace('"', "&quot;").replace("'", "&#x27;")
+        if norm_href.startswith(("http://", "https://")):
+            return f'<a href="{href_attr}" target="_blank" rel="noopener noreferrer">{label}</a>'
+        return f'<a href="{href_attr}">{label}</a>'
+
+    s = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", lambda m: stash(make_anchor(m.group(1), m.group(2))), s)
+
+    # Bare URLs
+    s = re.sub(
+        r"(?<![\"'=])(https?://[^\s<>()]+)",
+        lambda m: stash(make_anchor(m.group(1), m.group(1))),
+        s,
+    )
+
+    # Cross-link stable knowledge-base IDs.
+    s = re.sub(
+        build_site.CLM_ID_RX,
+        lambda m: stash(make_anchor(m.group(0), f"{root}claims/index.html#clm-{m.group(1)}")),
+        s,
+    )
+    s = re.sub(
+        build_site.TERM_ID_RX,
+        lambda m: stash(make_anchor(m.group(0), f"{root}glossary/index.html#term-{m.group(1)}")),
+        s,
+    )
+
+    # **bold**
+    s = re.sub(r"\*\*([^*]+)\*\*", lambda m: f"<strong>{m.group(1)}</strong>", s)
+    # *italics* and _italics_ (keep conservative boundaries)
+    s = re.sub(r"(?<!\w)\*([^*\n]+?)\*(?!\w)", lambda m: f"<em>{m.group(1)}</em>", s)
+    s = re.sub(r"(?<!\w)_([^_\n]+?)_(?!\w)", lambda m: f"<em>{m.group(1)}</em>", s)
+
+    # Restore protected fragments (code/links) after emphasis processing.
+    for idx in range(len(protected) - 1, -1, -1):
+        s = s.replace(f"@@FMT{idx}@@", protected[idx])
+    return s
+
+
+def corpus_inline_strings():
+    for d in ("content", "manuscript", "notes"):
+        for p in sorted((ROOT / d).rglob("*.md")):
+            md = p.read_text(encoding="utf-8", errors="replace")
+            yield from md.splitlines()
+            for b in build_site.parse_blocks(md):
+                yield b.text
+                for it in b.items or []:
+                    yield from it.split("\n")
+
+
+class TestInlineFormat(unittest.TestCase):
+    def test_matches_multipass_reference_on_corpus(self) -> None:
+        checked = 0
+        for s in corpus_inline_strings():
+            for root in ("./", "../../"):
+                self.assertEqual(
+                    build_site.inline_format(s, root=root),
+                    inline_format_reference(s, root=root),
+                    msg=s[:200],
+                )
+                checked += 1
+        self.assertGreater(checked, 0)
+
+    def test_matches_reference_on_nested_constructs(self) -> None:
+        cases = [
+            "**bold `code` tail** and *em* and _em_",
+            "[`code` label](/guide/) then https://example.com/a?b=1&c=2.",
+            "![alt 'x'](/assets/a.svg) CLM-0001 term-0002 snake_case_name",
+            "*a **b** c* and __not__ and 2*3*4",
+            "see (https://example.com) and \"https://quoted.example\"",
+            # Found by fuzzing an earlier single-scan tokenizer.
+            "TERM-0002https://example.com/x and CLM-0001http://a.b",
+            "https://example.com/x`code` and https://a.b/![i](/a.png)",
+            "https://a.b/[x](y) then [![img](/a.png)](/guide/)",
+            "[label](`code`) and `a`TERM-0003",
+            "nul \x00 byte, \x00*em*\x00 and _x_\x00",
+            "literal @@FMT0@@ token `c`",
+        ]
+        for s in cases:
+            self.assertEqual(build_site.inline_format(s, root="../"), inline_format_reference(s, root="../"), msg=s)
+
+    def test_matches_reference_on_fuzzed_strings(self) -> None:
+        pieces = ["a", " ", "`", "*", "**", "_", "[", "]", "(", ")", "!", "![", "](", "https://x.y/p",
+                  "TERM-0002", "CLM-0001", "\x00", "-", '"', "=", "&", "<", "@@FMT0@@",
+                  "@@FMT1@@", "@@", "@", "@@FMT", "1", "0@@"]
+        rng = random.Random(0)
+        for _ in range(5000):
+            s = "".join(rng.choice(pieces) for _ in range(rng.randint(1, 12)))
+            self.assertEqual(build_site.inline_format(s, root="../"), inline_format_reference(s, root="../"), msg=repr(s))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+
+from _core import intervals  # noqa: E402
+from _core.intervals import IntervalSet, load_speakers  # noqa: E402
+
+
+SPEAKERS = {
+    "multi_speaker_heuristic": True,
+    "segments": [
+        {"start_s": 0.0, "end_s": 10.0, "label": "spk0"},
+        {"start_s": 10.0, "end_s": 30.0, "label": "spk1"},
+        {"start_s": 30.0, "end_s": 42.5, "label": "spk0"},
+    ],
+    "bach_segments": [{"start_s": 30.0, "end_s": 42.5}, {"start_s": 0.0, "end_s": 10.0}, {"start_s": "x", "end_s": 1}],
+}
+
+
+class TestIntervals(unittest.TestCase):
+    def test_interval_queries(self) -> None:
+        iv = IntervalSet.from_pairs([(5.0, 8.0), (0.0, 2.0), (1.0, 3.0), (9.0, 4.0)])
+        self.assertEqual(iv.pairs(), [(0.0, 3.0), (5.0, 8.0)])
+        self.assertEqual([iv.contains(t) for t in (0.0, 3.0, 4.0, 8.0, 8.5)], [True, True, False, True, False])
+        times = [8.5, 0.0, 4.0, 6.0, 3.0]
+        self.assertEqual(iv.contains_many(times), [iv.contains(t) for t in times])
+        self.assertEqual(iv.contains_many(sorted(times)), [iv.contains(t) for t in sorted(times)])
+        self.assertTrue(iv.overlaps(3.5, 5.0))
+        self.assertFalse(iv.overlaps(3.5, 4.5))
+        self.assertEqual(iv.overlap_seconds(2.0, 6.0), 2.0)
+        self.assertEqual(iv.total(), 6.0)
+
+    def test_load_speakers_compiles_and_invalidates(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            d = Path(td) / "_speakers"
+            d.mkdir()
+            idx_dir = Path(td) / "_idx"
+            p = d / "s1.speakers.json"
+            p.write_text(json.dumps(SPEAKERS), encoding="utf-8")
+            sp = load_speakers("s1", d, compiled_dir=idx_dir)
+            self.assertIsNotNone(sp)
+            self.assertEqual(sp.bach.pairs(), [(0.0, 10.0), (30.0, 42.5)])
+            self.assertEqual(sp.label("spk1").pairs(), [(10.0, 30.0)])
+            self.assertEqual(sp.duration_s, 42.5)
+            self.assertTrue(sp.multi_speaker)
+            # Compiled into the cache dir; the speakers dir (a build input) is left alone.
+            self.assertTrue(intervals.compiled_path("s1", d, idx_dir).exists())
+            self.assertEqual([c.name for c in d.iterdir()], ["s1.speakers.json"])
+
+            # A fresh process reads the compiled form.
+            intervals._LOADED.clear()
+            again = load_speakers("s1", d, compiled_dir=idx_dir)
+            self.assertEqual(again.bach.pairs(), sp.bach.pairs())
+            self.assertEqual(again.label("spk0").pairs(), sp.label("spk0").pairs())
+
+            p.write_text(json.dumps({"bach_segments": [{"start_s": 1, "end_s": 2}]}), encoding="utf-8")
+            changed = load_speakers("s1", d, compiled_dir=idx_dir)
+            self.assertEqual(changed.bach.pairs(), [(1.0, 2.0)])
+            self.assertIsNone(changed.duration_s)
+            self.assertIsNone(load_speakers("missing", d, compiled_dir=idx_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+
+from _core.journal import IndexJournal  # noqa: E402
+
+
+class TestIndexJournal(unittest.TestCase):
+    def test_compacts_periodically_and_replays_after_crash(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "_index.journal.jsonl"
+            snapshots = []
+
+            journal = IndexJournal(path, {}, lambda idx: snapshots.append(dict(idx)), compact_every=2)
+            journal.record({"source_id": "a", "status": "ok"})
+            self.assertEqual(snapshots, [])
+            journal.record({"source_id": "b", "status": "error"})
+            self.assertEqual(len(snapshots), 1)
+            self.assertFalse(path.exists())
+            journal.record({"source_id": "b", "status": "ok"})
+            # Simulated crash: no close(), plus a torn trailing line.
+            journal._f.write('{"source_id": "c", "sta')
+            journal._f.flush()
+            journal._f.close()
+
+            index = dict(snapshots[-1])
+            restarted = IndexJournal(path, index, lambda idx: snapshots.append(dict(idx)), compact_every=10)
+            self.assertEqual(restarted.replay(), 1)
+            self.assertEqual(index["b"]["status"], "ok")
+            with restarted:
+                restarted.record({"source_id": "d", "status": "needs_asr"})
+            self.assertEqual(sorted(snapshots[-1]), ["a", "b", "d"])
+            self.assertFalse(path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+try:
+    import numpy as np
+except ImportError:  # optional (only the audio scripts need it)
+    np = None
+
+
+@unittest.skipUnless(np is not None, "numpy not installed")
+class TestKMeans(unittest.TestCase):
+    def blobs(self, n: int) -> "np.ndarray":
+        rng = np.random.default_rng(7)
+        centers = np.array([[0.0] * 8, [6.0] * 8, [-12.0] + [0.0] * 7], dtype=np.float32)
+        truth = rng.integers(0, 3, n)
+        return (centers[truth] + rng.standard_normal((n, 8)).astype(np.float32)), truth
+
+    def assert_same_partition(self, a: "np.ndarray", b: "np.ndarray") -> None:
+        pairs = set(zip(a.tolist(), b.tolist()))
+        self.assertEqual(len(pairs), len(set(a.tolist())))
+
+    def test_recovers_blobs_reproducibly(self) -> None:
+        from _core.kmeans import kmeans
+
+        x, truth = self.blobs(600)
+        r1 = kmeans(x, 3, seed=1)
+        r2 = kmeans(x, 3, seed=1)
+        self.assert_same_partition(r1.labels, truth)
+        np.testing.assert_array_equal(r1.labels, r2.labels)
+        self.assertEqual(r1.labels[0], 0)  # numbered by first appearance
+        self.assertEqual(r1.centroids.shape, (3, 8))
+        naive = float(((x - r1.centroids[r1.labels]) ** 2).sum())
+        self.assertAlmostEqual(r1.inertia, naive, delta=naive * 1e-4)
+
+    def test_minibatch_path_and_small_inputs(self) -> None:
+        from _core.kmeans import kmeans
+
+        x, truth = self.blobs(5000)
+        r = kmeans(x, 3, seed=0, minibatch_threshold=1000, batch_size=256)
+        self.assert_same_partition(r.labels, truth)
+        self.assertEqual(kmeans(x[:2], 5).centroids.shape[0], 2)
+        with self.assertRaises(ValueError):
+            kmeans(x[:0], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+try:
+    import numpy as np
+except ImportError:  # optional (only the audio scripts need it)
+    np = None
+
+
+@unittest.skipUnless(np is not None, "numpy not installed")
+class TestPcmCache(unittest.TestCase):
+    def test_decodes_once_and_invalidates_on_change(self) -> None:
+        from _core.pcm import load_pcm
+
+        calls = []
+
+        def decode_audio(path: str, sampling_rate: int):
+            calls.append(path)
+            return np.arange(sampling_rate * 2, dtype=np.float32) * len(calls)
+
+        fake = types.ModuleType("faster_whisper.audio")
+        fake.decode_audio = decode_audio  # type: ignore[attr-defined]
+        with tempfile.TemporaryDirectory() as td, mock.patch.dict(sys.modules, {"faster_whisper.audio": fake}):
+            media = Path(td) / "yt_a.m4a"
+            media.write_bytes(b"audio")
+            cache = Path(td) / "_pcm"
+
+            first = load_pcm(media, cache)
+            again = load_pcm(media, cache)
+            self.assertEqual(len(calls), 1)
+            self.assertIsInstance(again, np.memmap)
+            self.assertFalse(again.flags.writeable)
+            self.assertEqual(float(again[16000 + 5]), float(first[16000 + 5]))
+
+            st = media.stat()
+            os.utime(media, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            changed = load_pcm(media, cache)
+            self.assertEqual(len(calls), 2)
+            self.assertEqual(float(changed[3]), 6.0)
+            self.assertEqual(len(list(cache.glob("*.npy"))), 1)
+
+    def test_stale_entries_with_glob_characters_in_the_name(self) -> None:
+        from _core.pcm import load_pcm
+
+        fake = types.ModuleType("faster_whisper.audio")
+        fake.decode_audio = lambda path, sampling_rate: np.zeros(160, dtype=np.float32)  # type: ignore[attr-defined]
+        with tempfile.TemporaryDirectory() as td, mock.patch.dict(sys.modules, {"faster_whisper.audio": fake}):
+            tricky = Path(td) / "Talk [Part 1] *live*?.m4a"
+            other = Path(td) / "Talk P.m4a"
+            for media in (tricky, other):
+                media.write_bytes(b"audio")
+            cache = Path(td) / "_pcm"
+            load_pcm(other, cache)
+            load_pcm(tricky, cache)
+            st = tricky.stat()
+            os.utime(tricky, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            load_pcm(tricky, cache)
+            names = sorted(p.name.split(".")[0] for p in cache.glob("*.npy"))
+            self.assertEqual(names, ["Talk P", "Talk [Part 1] *live*?"])
+
+    def test_entries_match_the_exact_media_name(self) -> None:
+        from _core.pcm import drop_pcm, load_pcm
+
+        fake = types.ModuleType("faster_whisper.audio")
+        fake.decode_audio = lambda path, sampling_rate: np.zeros(160, dtype=np.float32)  # type: ignore[attr-defined]
+        with tempfile.TemporaryDirectory() as td, mock.patch.dict(sys.modules, {"faster_whisper.audio": fake}):
+            foo, foobar = Path(td) / "foo.m4a", Path(td) / "foo.bar.m4a"
+            for media in (foo, foobar):
+                media.write_bytes(b"audio")
+            cache = Path(td) / "_pcm"
+            load_pcm(foobar, cache)
+            load_pcm(foo, cache)
+            st = foo.stat()
+            os.utime(foo, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            load_pcm(foo, cache)  # drops foo's stale entry only
+            self.assertEqual(len(list(cache.glob("*.npy"))), 2)
+
+            self.assertEqual(drop_pcm(foo, cache), 1)
+            self.assertEqual([p.name.startswith("foo.bar.") for p in cache.glob("*.npy")], [True])
+
+    def test_iter_pcm_streams_and_fills_cache(self) -> None:
+        from _core import pcm
+
+        audio = np.arange(10007, dtype=np.float32) / 10007
+        calls = []
+
+        def decode_frames(media, sampling_rate):
+            calls.append(media)
+            for a in range(0, len(audio), 3001):
+                yield audio[a : a + 3001]
+
+        with tempfile.TemporaryDirectory() as td, mock.patch.object(pcm, "_decode_frames", decode_frames):
+            media = Path(td) / "yt_a.m4a"
+            media.write_bytes(b"audio")
+            cache = Path(td) / "_pcm"
+
+            # Stopping early leaves no cache entry (nor temp file) behind.
+            next(pcm.iter_pcm(media, cache, window=4096))
+            self.assertEqual(list(cache.iterdir()), [])
+
+            windows = list(pcm.iter_pcm(media, cache, window=4096))
+            self.assertEqual([len(w) for w in windows], [4096, 4096, 1815])
+            np.testing.assert_array_equal(np.concatenate(windows), audio)
+            self.assertEqual(len(calls), 2)
+
+            np.testing.assert_array_equal(pcm.load_pcm(media, cache), audio)
+            again = list(pcm.iter_pcm(media, cache, window=5000))
+            self.assertEqual(len(calls), 2)
+            self.assertEqual([len(w) for w in again], [5000, 5000, 7])
+            np.testing.assert_array_equal(np.concatenate(again), audio)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+try:
+    import numpy as np
+except ImportError:  # optional (only the audio scripts need it)
+    np = None
+
+
+@unittest.skipUnless(np is not None, "numpy not installed")
+class TestReferenceBank(unittest.TestCase):
+    def test_incremental_profiles_and_round_trip(self) -> None:
+        from _core.refbank import ReferenceBank
+
+        rng = np.random.default_rng(0)
+        a, b = rng.standard_normal((5, 4)), rng.standard_normal((3, 4))
+        bank = ReferenceBank.empty(4, feature="logmel_mean")
+        seg_a = {"source_id": "ccc_x", "start_s": 10.0, "end_s": 50.0}
+        seg_b = {"source_id": "ccc_y", "start_s": 0.0, "end_s": 24.0}
+        self.assertTrue(bank.add("conference", a, seg_a))
+        self.assertTrue(bank.add("conference", b, seg_b))
+        self.assertFalse(bank.add("conference", b, seg_b))  # already counted
+        self.assertTrue(bank.add("podcast", b[:1] + 5.0, {"source_id": "yt_z", "start_s": 1.0, "end_s": 9.0}))
+        self.assertEqual(bank.names, ["conference", "podcast"])
+        np.testing.assert_allclose(bank.vectors[0], np.vstack([a, b]).mean(axis=0), rtol=1e-5)
+        self.assertEqual(bank.profiles[0].count, 8)
+
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "_bach_bank.npy"
+            bank.save(path, updated_at="t1")
+            loaded = ReferenceBank.load(path)
+            assert loaded is not None
+            np.testing.assert_array_equal(loaded.vectors, bank.vectors)
+            self.assertEqual([(p.name, p.count, p.segments) for p in loaded.profiles], [(p.name, p.count, p.segments) for p in bank.profiles])
+            self.assertEqual(loaded.updated_at, "t1")
+            self.assertIsNone(ReferenceBank.load(Path(td) / "missing.npy"))
+
+    def test_scores_against_nearest_profile(self) -> None:
+        from _core.refbank import ReferenceBank
+
+        bank = ReferenceBank.empty(3, feature="f")
+        bank.add("conference", np.array([[1.0, 0.0, 0.0]]), {"source_id": "a", "start_s": 0.0, "end_s": 1.0})
+        bank.add("podcast", np.array([[0.0, 1.0, 0.0]]), {"source_id": "b", "start_s": 0.0, "end_s": 1.0})
+        mu, sd = np.zeros(3), np.ones(3)
+        scores = bank.score(np.array([[0.1, 2.0, 0.0], [3.0, 0.0, 0.1], [0.0, 0.0, -1.0]]), mu, sd)
+        self.assertEqual([name for _s, name in scores[:2]], ["podcast", "conference"])
+        self.assertGreater(scores[0][0], 0.9)
+        self.assertAlmostEqual(scores[2][0], 0.0, places=6)
+
+
+if __name__ == "__main__":
+    unittest.main()
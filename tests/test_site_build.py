@@ -0,0 +1,75 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+
+import build_site  # noqa: E402
+
+
+class TestSiteBuild(unittest.TestCase):
+    def test_incremental_rebuild_is_a_noop_and_prunes_orphans(self) -> None:
+        with tempfile.TemporaryDirectory() as td, mock.patch.object(build_site, "SITE_CACHE_DIR", Path(td) / "cache"):
+            out = Path(td) / "dist"
+            self.assertEqual(build_site.main(["--out", str(out)]), 0)
+            # Build state stays out of the deployed tree and holds hashes, not page text.
+            self.assertEqual([p for p in out.rglob("*manifest*") if "search" not in p.parts], [])
+            manifest = build_site.load_build_manifest(out)
+            self.assertTrue(all(isinstance(v, str) for v in manifest["pages"].values()))
+            page = out / "guide" / "index.html"
+            mtime = page.stat().st_mtime_ns
+            orphan = out / "stale" / "index.html"
+            orphan.parent.mkdir(parents=True)
+            orphan.write_text("old", encoding="utf-8")
+
+            manifest["outputs"] = list(manifest["outputs"]) + ["stale/index.html"]
+            build_site.write_build_manifest(out, manifest)
+
+            self.assertEqual(build_site.main(["--out", str(out), "--incremental"]), 0)
+            self.assertEqual(page.stat().st_mtime_ns, mtime)
+            self.assertFalse(orphan.exists())
+            self.assertFalse(orphan.parent.exists())
+
+            # The reader is indexed per chapter only, so no hit is listed twice.
+            hrefs = [pg["href"] for pg in json.loads((out / "search" / "manifest.json").read_text(encoding="utf-8"))["pages"]]
+            self.assertNotIn("reader/index.html", hrefs)
+            self.assertEqual(len(hrefs), len(set(hrefs)))
+
+    def test_search_postings_are_sharded_by_prefix_with_delta_offsets(self) -> None:
+        entries = [
+            {"href": "a/index.html", "title": "Self model", "text": "The self is a model. Self!"},
+            {"href": "b/index.html", "title": "Other", "text": "A model of a model."},
+        ]
+        shards = build_site.build_search_postings(entries)
+        self.assertEqual(shards["se"]["self"], [[0, 1, [4, 17]]])
+        self.assertEqual(shards["mo"]["model"], [[0, 1, [14]], [1, 0, [2, 11]]])
+        self.assertNotIn("mo", [t[:2] for t in shards["se"]])
+
+    def test_search_offsets_count_code_points(self) -> None:
+        # app.js slices page text by code point; an astral character is one, not two.
+        text = "\U0001F600 émoji then self"
+        shards = build_site.build_search_postings([{"href": "a/index.html", "title": "A", "text": text}])
+        [[_pid, _title, [off]]] = shards["se"]["self"]
+        self.assertEqual(text[off : off + 4], "self")
+        self.assertEqual(off, 13)  # 14 in UTF-16 units
+
+    def test_search_index_files_are_content_addressed(self) -> None:
+        entries = [{"href": "a/index.html", "title": "A", "text": "x" * (build_site.SEARCH_TEXT_CHUNK + 5)}]
+        with tempfile.TemporaryDirectory() as td:
+            out = Path(td)
+            paths = build_site.write_search_index(out, entries)
+            manifest = json.loads((out / "search" / "manifest.json").read_text(encoding="utf-8"))
+            self.assertEqual(len(manifest["pages"][0]["chunks"]), 2)
+            for h in manifest["shards"].values():
+                self.assertIn(f"search/shards/{h}.json", paths)
+            self.assertEqual(paths, build_site.write_search_index(out, entries))
+
+
+if __name__ == "__main__":
+    unittest.main()
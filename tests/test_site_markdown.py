@@ -161,6 +161,17 @@ class TestSiteMarkdown(unittest.TestCase):
         self.assertNotIn("flowchart", html_body)
         self.assertIn("After.", html_body)
 
+    def test_fragments_with_shared_heading_ids_match_concatenation(self) -> None:
+        a = "## Anchors\n\nOne.\n"
+        b = "## Anchors\n\nTwo.\n"
+        whole, whole_text = build_site.blocks_to_html(build_site.parse_blocks(a + "\n---\n\n" + b), sources={}, root="./")
+        seen: dict = {}
+        html_a, text_a = build_site.blocks_to_html(build_site.parse_blocks(a), sources={}, root="./", seen_ids=seen)
+        html_b, text_b = build_site.blocks_to_html(build_site.parse_blocks(b), sources={}, root="./", seen_ids=seen)
+        self.assertEqual("\n".join([html_a, "<hr />", html_b]), whole)
+        self.assertEqual(" ".join([text_a, text_b]), whole_text)
+        self.assertIn('id="anchors-2"', html_b)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,101 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+
+from _core.transcript_index import IndexedSource, TranscriptIndex, parse_query  # noqa: E402
+
+
+def vtt(*texts: str) -> str:
+    lines = ["WEBVTT", ""]
+    for i, text in enumerate(texts):
+        lines += [f"00:00:{i:02}.000 --> 00:00:{i + 1:02}.000", text, ""]
+    return "\n".join(lines)
+
+
+class TestTranscriptIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self._td = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._td.name)
+        self.cues_dir = self.tmp / "_cues"
+        self.index_dir = self.tmp / "_search"
+        self.write("a", vtt("the world model", "is a model of the", "world itself"))
+        self.write("b", vtt("models everywhere", "model model model"))
+
+    def tearDown(self) -> None:
+        self._td.cleanup()
+
+    def write(self, sid: str, text: str) -> Path:
+        p = self.tmp / f"{sid}.vtt"
+        p.write_text(text, encoding="utf-8")
+        return p
+
+    def sources(self, *sids: str, kind: str = "youtube"):
+        return [IndexedSource(sid, kind, self.tmp / f"{sid}.vtt") for sid in sids]
+
+    def index(self, *sids: str) -> TranscriptIndex:
+        idx = TranscriptIndex(self.index_dir)
+        idx.update(self.sources(*sids), cues_dir=self.cues_dir)
+        return idx
+
+    def hits(self, idx: TranscriptIndex, query: str, **kw):
+        return [(m.source_id, m.cue) for m in idx.search(parse_query(query), **kw)]
+
+    def test_parse_query(self) -> None:
+        self.assertEqual(parse_query('World "model of" x-y'), [("world",), ("model", "of"), ("x",), ("y",)])
+
+    def test_ranked_terms_phrases_and_proximity(self) -> None:
+        idx = self.index("a", "b")
+        self.assertEqual(self.hits(idx, "model")[0], ("b", 1))
+        self.assertEqual(set(self.hits(idx, "model")), {("a", 0), ("a", 1), ("b", 1)})
+        # Phrases may cross cue boundaries; the hit is the cue where the phrase starts.
+        self.assertEqual(self.hits(idx, '"of the world"'), [("a", 1)])
+        self.assertEqual(self.hits(idx, '"world model"'), [("a", 0)])
+        self.assertEqual(set(self.hits(idx, "world itself", near=1)), {("a", 2)})
+        self.assertEqual(self.hits(idx, "model", cue_filter=lambda sid: [1] if sid == "a" else []), [("a", 1)])
+        self.assertEqual(self.hits(idx, "model", kinds={"web"}), [])
+
+    def test_all_terms_and_last_term_prefix(self) -> None:
+        idx = self.index("a", "b")
+        self.assertEqual(set(self.hits(idx, "world model")), {("a", 0), ("a", 1), ("a", 2), ("b", 1)})
+        self.assertEqual(self.hits(idx, "world model", match_all=True), [("a", 0)])
+        self.assertEqual(self.hits(idx, "itself model", match_all=True), [])
+        # Only the last clause, and only with prefix_last, matches longer terms.
+        self.assertEqual(self.hits(idx, "everywhere mod", match_all=True), [])
+        self.assertEqual(self.hits(idx, "everywhere mod", match_all=True, prefix_last=True), [("b", 0)])
+        self.assertEqual(set(self.hits(idx, "mod", prefix_last=True)), {("a", 0), ("a", 1), ("b", 0), ("b", 1)})
+        self.assertEqual(self.hits(idx, "mod everywhere", match_all=True, prefix_last=True), [])
+
+    def test_idf_counts_every_cue_in_scope(self) -> None:
+        idx = self.index("a", "b")
+        # "model" also occurs in b, which cannot match "world model"; it still lowers the weight.
+        any_score = {(m.source_id, m.cue): m.score for m in idx.search(parse_query("world model"))}
+        [both] = idx.search(parse_query("world model"), match_all=True)
+        self.assertEqual(both.score, any_score[("a", 0)])
+        filtered = idx.search(parse_query("model"), cue_filter=lambda sid: None if sid == "a" else [])
+        unfiltered = {(m.source_id, m.cue): m.score for m in idx.search(parse_query("model"))}
+        self.assertEqual({(m.source_id, m.cue): m.score for m in filtered}, {k: v for k, v in unfiltered.items() if k[0] == "a"})
+
+    def test_incremental_update(self) -> None:
+        self.index("a", "b")
+        idx = TranscriptIndex(self.index_dir)
+        self.assertFalse(idx.update(self.sources("a", "b"), cues_dir=self.cues_dir))
+
+        self.write("b", vtt("completely different words"))
+        idx = TranscriptIndex(self.index_dir)
+        self.assertTrue(idx.update(self.sources("a", "b"), cues_dir=self.cues_dir))
+        self.assertEqual(set(self.hits(idx, "model")), {("a", 0), ("a", 1)})
+        self.assertEqual(self.hits(idx, "different"), [("b", 0)])
+
+        idx = self.index("a")
+        self.assertEqual(self.hits(idx, "different"), [])
+        self.assertEqual(sorted(idx.sources), ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import importlib.util
+import sys
+import tracemalloc
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+HAVE_DEPS = all(importlib.util.find_spec(m) is not None for m in ("numpy", "faster_whisper", "onnxruntime"))
+
+
+def _synthetic(seconds: float, seed: int):
+    import numpy as np
+
+    sr = 16000
+    rng = np.random.default_rng(seed)
+    y = (rng.standard_normal(int(seconds * sr)) * 0.01).astype(np.float32)
+    t = 0
+    while t < len(y):
+        end = min(len(y), t + int(rng.uniform(1.0, 20.0) * sr))
+        n = np.arange(end - t)
+        y[t:end] += 0.3 * np.sin(n * (2 * np.pi * rng.uniform(100, 300) / sr)) * (1 + 0.5 * np.sin(n * (2 * np.pi * 4 / sr)))
+        t = end + int(rng.uniform(0.3, 4.0) * sr)
+    return y
+
+
+@unittest.skipUnless(HAVE_DEPS, "numpy/faster-whisper/onnxruntime not installed")
+class TestSpeechStream(unittest.TestCase):
+    def test_matches_get_speech_timestamps(self) -> None:
+        import numpy as np
+        from faster_whisper import vad as fw_vad
+
+        from _core.vad import BATCH_SAMPLES, SpeechStream
+
+        y = _synthetic(BATCH_SAMPLES / 16000 + 10.0, seed=1)  # crosses one model batch
+        probs = fw_vad.get_vad_model()(np.pad(y, (0, 512 - len(y) % 512))).reshape(-1)
+        threshold = float(np.percentile(probs, 60))  # tones are not speech to Silero; use a relative threshold
+        for options, piece in (
+            (fw_vad.VadOptions(threshold=threshold, min_silence_duration_ms=300), 777777),
+            (fw_vad.VadOptions(threshold=threshold, min_silence_duration_ms=300, max_speech_duration_s=5), 100000),
+        ):
+            ref = fw_vad.get_speech_timestamps(y, options, sampling_rate=16000)
+            stream = SpeechStream(options)
+            for a in range(0, len(y), piece):
+                stream.feed(y[a : a + piece])
+            self.assertGreater(len(ref), 10)
+            self.assertEqual(stream.finish(), ref)
+
+    def test_memory_does_not_grow_with_length(self) -> None:
+        import numpy as np
+
+        from _core.vad import SpeechStream
+
+        def run(batch, h, c):
+            return (np.abs(batch).mean(axis=1) > 0.2).astype(np.float32), h, c
+
+        def peak(minutes: int) -> int:
+            tracemalloc.start()
+            try:
+                stream = SpeechStream(run=run)
+                rng = np.random.default_rng(0)
+                for _ in range(minutes):
+                    stream.feed((rng.standard_normal(16000 * 60) * 0.3).astype(np.float32))
+                stream.finish()
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        short, long = peak(6), peak(24)
+        self.assertLess(long, short * 1.2)
+
+
+class TestFasterWhisperPin(unittest.TestCase):
+    def test_pyproject_pins_the_supported_release(self) -> None:
+        from _core.fwcompat import SUPPORTED_VERSION
+
+        pyproject = (ROOT / "pyproject.toml").read_text(encoding="utf-8")
+        self.assertIn(f'"faster-whisper=={SUPPORTED_VERSION}"', pyproject)
+
+    @unittest.skipUnless(HAVE_DEPS, "numpy/faster-whisper/onnxruntime not installed")
+    def test_installed_release_is_supported(self) -> None:
+        from _core import fwcompat
+
+        fwcompat.require_supported()
+        self.assertEqual(fwcompat.installed_version(), fwcompat.SUPPORTED_VERSION)
+
+    @unittest.skipUnless(HAVE_DEPS, "numpy/faster-whisper/onnxruntime not installed")
+    def test_other_releases_are_refused(self) -> None:
+        from _core import fwcompat
+        from _core.pcm import _decode_frames
+        from _core.vad import SpeechStream
+
+        with mock.patch.object(fwcompat, "installed_version", return_value="9.9.9"):
+            with self.assertRaisesRegex(RuntimeError, "9.9.9"):
+                SpeechStream(run=lambda batch, h, c: (batch[:, 0], h, c))
+            with self.assertRaisesRegex(RuntimeError, "run without --stream"):
+                next(_decode_frames(ROOT / "missing.m4a", 16000))
+
+
+if __name__ == "__main__":
+    unittest.main()